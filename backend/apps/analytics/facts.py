@@ -0,0 +1,154 @@
+"""
+Analytics facts — incremental refresh of ProjectMonthlyFact and fact-table reads.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from core.cache import invalidate_tags
+from core.periods import add_months, aware_month_bounds, iter_months
+from apps.projects.models import Project
+from apps.payroll.models import PayrollRecord
+from apps.inventory.models import InventoryItem
+from apps.workforce.models import Attendance
+from apps.workforce.services import PRESENT_STATUSES
+from .models import ProjectMonthlyFact, RefreshWatermark
+
+WATERMARK = 'project_monthly_fact'
+CENT = Decimal('0.01')
+# A write stamped before a refresh starts may commit after the refresh has read:
+# each window reaches back this far so such writes are picked up next run.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def _months(values):
+    return {(v.year, v.month) for v in values if v is not None}
+
+
+def touched_months(since=None):
+    """(year, month) pairs whose facts may have changed after `since` (None = all)."""
+    def changed(model):
+        # all_objects so soft-deleted rows still mark their month as dirty.
+        qs = model.all_objects.order_by()
+        return qs.filter(updated_at__gt=since) if since else qs
+    months = _months(
+        changed(Project).annotate(m=TruncMonth('created_at')).values_list('m', flat=True).distinct()
+    )
+    months |= _months(
+        changed(InventoryItem).annotate(m=TruncMonth('created_at')).values_list('m', flat=True).distinct()
+    )
+    months |= _months(
+        changed(Attendance).annotate(m=TruncMonth('date')).values_list('m', flat=True).distinct()
+    )
+    months |= set(changed(PayrollRecord).values_list('year', 'month').distinct())
+    return months
+
+
+def compute_month(year, month):
+    """Fact rows for one month, keyed by project id (None = unassigned)."""
+    first = date(year, month, 1)
+    start, end = aware_month_bounds(first, first)
+    facts = defaultdict(lambda: defaultdict(Decimal))
+
+    for pid, budget, spent in Project.objects.filter(
+        created_at__gte=start, created_at__lt=end
+    ).values_list('id', 'budget', 'spent'):
+        facts[pid]['budget'] += budget
+        facts[pid]['spent'] += spent
+
+    for row in InventoryItem.objects.filter(
+        created_at__gte=start, created_at__lt=end
+    ).order_by().values('project').annotate(
+        value=Sum(F('quantity') * F('unit_price'), output_field=FloatField())
+    ):
+        facts[row['project']]['material_cost'] += Decimal(str(row['value'] or 0))
+
+    # Labor: each worker's net pay split across projects by attendance days.
+    net_by_worker = dict(
+        PayrollRecord.objects.filter(year=year, month=month).order_by().values('worker').annotate(
+            net=Sum('net_salary')
+        ).values_list('worker', 'net')
+    )
+    days = defaultdict(dict)
+    for row in Attendance.objects.filter(
+        date__gte=first, date__lt=add_months(first, 1), status__in=PRESENT_STATUSES,
+    ).order_by().values('worker', 'project').annotate(days=Count('id')):
+        days[row['worker']][row['project']] = row['days']
+    for worker_id, net in net_by_worker.items():
+        # Workers paid without project attendance stay unassigned.
+        split = days.get(worker_id) or {None: 1}
+        total_days = sum(split.values())
+        for pid, worker_days in split.items():
+            facts[pid]['payroll_cost'] += net * worker_days / total_days
+
+    return [
+        ProjectMonthlyFact(
+            project_id=pid, year=year, month=month,
+            **{field: value.quantize(CENT) for field, value in values.items()}
+        )
+        for pid, values in facts.items()
+    ]
+
+
+def rebuild_month(year, month):
+    ProjectMonthlyFact.objects.filter(year=year, month=month).delete()
+    rows = compute_month(year, month)
+    ProjectMonthlyFact.objects.bulk_create(rows)
+    return len(rows)
+
+
+@transaction.atomic
+def refresh_facts(full=False):
+    """
+    Recomputes the months touched since the stored watermark (or everything
+    when `full`), then advances the watermark to the refresh start time minus
+    REFRESH_OVERLAP. Consecutive windows overlap, so a write whose updated_at
+    predates the refresh but which commits after it has read is picked up by
+    the next run (its month is simply recomputed twice).
+    Returns (months refreshed, rows written).
+    """
+    started = timezone.now()
+    mark = RefreshWatermark.objects.select_for_update().filter(name=WATERMARK).first()
+    if full or mark is None:
+        ProjectMonthlyFact.objects.all().delete()
+        months = touched_months()
+    else:
+        months = touched_months(mark.value)
+    written = sum(rebuild_month(y, m) for y, m in sorted(months))
+    RefreshWatermark.objects.update_or_create(
+        name=WATERMARK, defaults={'value': started - REFRESH_OVERLAP}
+    )
+    transaction.on_commit(lambda: invalidate_tags('analytics_facts'))
+    return len(months), written
+
+
+def fact_series(first, last):
+    """Revenue (budget) and cost (spent) per month for [first, last], from the fact table."""
+    rows = ProjectMonthlyFact.objects.filter(
+        year__gte=first.year, year__lte=last.year
+    ).order_by().values('year', 'month').annotate(revenue=Sum('budget'), cost=Sum('spent'))
+    by_month = {(r['year'], r['month']): r for r in rows}
+    revenue, cost = [], []
+    for m in iter_months(first, last):
+        row = by_month.get((m.year, m.month), {})
+        revenue.append(float(row.get('revenue') or 0))
+        cost.append(float(row.get('cost') or 0))
+    return revenue, cost
+
+
+def fact_cost_totals(project=None):
+    qs = ProjectMonthlyFact.objects.all()
+    if project:
+        qs = qs.filter(project=project)
+    agg = qs.aggregate(labor=Sum('payroll_cost'), materials=Sum('material_cost'))
+    return {'labor': float(agg['labor'] or 0), 'materials': float(agg['materials'] or 0)}
+
+
+def facts_as_of():
+    mark = RefreshWatermark.objects.filter(name=WATERMARK).first()
+    return mark.value if mark else None
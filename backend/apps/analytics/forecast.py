@@ -0,0 +1,126 @@
+"""
+Analytics forecast — vectorized budget burn and completion projection.
+
+Project columns are pulled once with values_list into NumPy arrays and every
+metric is computed for all projects in a single array pass (no per-object
+Python loop), so tens of thousands of projects forecast in milliseconds.
+"""
+import numpy as np
+
+from apps.projects.models import Project, ProjectStatus
+
+COLUMNS = ('id', 'name', 'status', 'progress', 'budget', 'spent', 'start_date', 'due_date')
+OVERRUN_RISK_PCT = 10.0
+SLIPPAGE_RISK_DAYS = 14
+
+
+def load_columns(qs=None):
+    """One query → dict of column arrays (dates as datetime64[D], NaT when unset)."""
+    qs = Project.objects.all() if qs is None else qs
+    rows = list(qs.order_by().values_list(*COLUMNS))
+    cols = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+    return {
+        'id': np.array(cols[0], dtype=object),
+        'name': np.array(cols[1], dtype=object),
+        'status': np.array(cols[2], dtype=object),
+        'progress': np.array(cols[3], dtype=float),
+        'budget': np.array(cols[4], dtype=float),
+        'spent': np.array(cols[5], dtype=float),
+        'start_date': np.array(cols[6], dtype='datetime64[D]'),
+        'due_date': np.array(cols[7], dtype='datetime64[D]'),
+    }
+
+
+def forecast(cols, today):
+    """
+    Burn rate, projected final cost / overrun and completion slippage for
+    every project. Undefined values (no start date, zero progress, ...) are NaN / NaT.
+    """
+    today = np.datetime64(today, 'D')
+    start, due = cols['start_date'], cols['due_date']
+    budget, spent = cols['budget'], cols['spent']
+    done = np.clip(cols['progress'] / 100.0, 0.0, 1.0)
+    completed = cols['status'] == ProjectStatus.COMPLETED
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        elapsed = np.where(np.isnat(start), np.nan, (today - start).astype(float))
+        elapsed = np.where(elapsed < 1, 1.0, elapsed)    # started today / in future
+        burn_rate = spent / elapsed
+
+        projected_cost = np.where(done > 0, spent / done, np.nan)
+        projected_cost = np.where(completed, spent, projected_cost)
+        overrun = projected_cost - budget
+        overrun_pct = np.where(budget > 0, overrun / budget * 100.0, np.nan)
+
+        # Linear schedule projection: total duration = elapsed / fraction done.
+        duration = np.where((done > 0) & ~completed, elapsed / done, np.nan)
+        finish = start + np.where(np.isnan(duration), 0, np.ceil(duration)).astype('timedelta64[D]')
+        finish = np.where(np.isnan(duration), np.datetime64('NaT'), finish)
+        slippage = np.where(np.isnat(due) | np.isnat(finish), np.nan, (finish - due).astype(float))
+
+        remaining = np.where(burn_rate > 0, (budget - spent) / burn_rate, np.nan)
+
+    at_risk = (np.nan_to_num(overrun_pct) > OVERRUN_RISK_PCT) | (
+        np.nan_to_num(slippage) > SLIPPAGE_RISK_DAYS
+    )
+    return {
+        'burn_rate_per_day': burn_rate,
+        'projected_final_cost': projected_cost,
+        'projected_overrun': overrun,
+        'overrun_pct': overrun_pct,
+        'forecast_completion': finish,
+        'slippage_days': slippage,
+        'days_of_budget_left': remaining,
+        'at_risk': at_risk,
+    }
+
+
+def _json_floats(values, decimals=2):
+    rounded = np.round(values, decimals).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+def _json_dates(values):
+    out = values.astype(str).astype(object)
+    out[np.isnat(values)] = None
+    return out.tolist()
+
+
+def forecast_rows(cols, result, mask=None):
+    """Per-project JSON rows; `mask` selects a subset (e.g. at-risk only)."""
+    if mask is not None:
+        cols = {k: v[mask] for k, v in cols.items()}
+        result = {k: v[mask] for k, v in result.items()}
+    columns = {
+        'id': [str(pk) for pk in cols['id'].tolist()],
+        'name': cols['name'].tolist(),
+        'status': cols['status'].tolist(),
+        'progress': cols['progress'].tolist(),
+        'budget': cols['budget'].tolist(),
+        'spent': cols['spent'].tolist(),
+        'due_date': _json_dates(cols['due_date']),
+        'burn_rate_per_day': _json_floats(result['burn_rate_per_day']),
+        'projected_final_cost': _json_floats(result['projected_final_cost']),
+        'projected_overrun': _json_floats(result['projected_overrun']),
+        'overrun_pct': _json_floats(result['overrun_pct'], 1),
+        'forecast_completion': _json_dates(result['forecast_completion']),
+        'slippage_days': _json_floats(result['slippage_days'], 0),
+        'days_of_budget_left': _json_floats(result['days_of_budget_left'], 0),
+        'at_risk': result['at_risk'].tolist(),
+    }
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def forecast_summary(result):
+    overrun = result['projected_overrun']
+    slippage = result['slippage_days']
+    return {
+        'project_count': int(overrun.size),
+        'at_risk_count': int(result['at_risk'].sum()),
+        'total_projected_overrun': round(float(np.nansum(np.clip(overrun, 0, None))), 2),
+        'avg_slippage_days': (
+            round(float(np.nanmean(slippage)), 1) if np.any(~np.isnan(slippage)) else None
+        ),
+    }
@@ -0,0 +1,25 @@
+"""
+management/commands/refresh_analytics_facts.py
+Run: python manage.py refresh_analytics_facts [--full]
+Recomputes ProjectMonthlyFact for months touched since the last refresh.
+Schedule it (cron / systemd timer) every few minutes.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.analytics.facts import refresh_facts
+
+
+class Command(BaseCommand):
+    help = 'Incrementally refreshes the monthly project financial fact table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Ignore the watermark and rebuild every month',
+        )
+
+    def handle(self, *args, **options):
+        months, rows = refresh_facts(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Refreshed {months} month(s), {rows} fact row(s).'
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.13 on 2026-10-18 11:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0003_project_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectMonthlyFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('budget', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('spent', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('payroll_cost', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('material_cost', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_facts', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'indexes': [models.Index(fields=['year', 'month'], name='fact_period_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projectmonthlyfact',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', False)), fields=('project', 'year', 'month'), name='project_monthly_fact_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectmonthlyfact',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('year', 'month'), name='unassigned_monthly_fact_key'),
+        ),
+    ]
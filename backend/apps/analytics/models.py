@@ -1,5 +1,56 @@
 """
-Analytics app — No persistent models; pure DB aggregation views.
+Analytics app — Materialized fact tables refreshed from the transactional apps.
 """
-# Analytics derives its data from other apps using DB queries.
-# No additional models needed here.
+from django.db import models
+from apps.projects.models import Project
+
+
+class ProjectMonthlyFact(models.Model):
+    """
+    Per-project, per-month financials, recomputed by `refresh_analytics_facts`.
+    - budget / spent: projects created in the month (same basis as revenue/cost series)
+    - payroll_cost: month's net payroll allocated by each worker's attendance days per project
+    - material_cost: value of inventory items created in the month
+    project is NULL for costs not attributable to a project.
+    """
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='monthly_facts'
+    )
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()    # 1–12
+    budget = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    spent = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    payroll_cost = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    material_cost = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-year', '-month']
+        indexes = [
+            models.Index(fields=['year', 'month'], name='fact_period_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'year', 'month'],
+                condition=models.Q(project__isnull=False),
+                name='project_monthly_fact_key',
+            ),
+            models.UniqueConstraint(
+                fields=['year', 'month'],
+                condition=models.Q(project__isnull=True),
+                name='unassigned_monthly_fact_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.project_id or "—"} {self.month}/{self.year}'
+
+
+class RefreshWatermark(models.Model):
+    """Last successful refresh point per fact table, compared against source updated_at."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.name} @ {self.value:%Y-%m-%d %H:%M}'
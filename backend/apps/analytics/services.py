@@ -0,0 +1,174 @@
+"""
+Analytics services — revenue, cost, completion and efficiency aggregates.
+"""
+from datetime import date, timedelta
+from django.db.models import Count, Exists, F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, TruncMonth
+
+from core.concurrency import run_tasks
+from core.periods import add_months, aware_month_bounds, iter_months
+
+from apps.projects.models import Project, ProjectStatus
+from apps.payroll.models import PayrollRecord
+from apps.inventory.models import InventoryCategory, InventoryItem
+from apps.workforce.models import Attendance
+from apps.workforce.services import PRESENT_STATUSES, attendance_status_totals
+from .facts import fact_cost_totals, fact_series, facts_as_of
+
+
+def revenue_cost_series(first, last):
+    """
+    Monthly revenue (project budgets) and cost (project spend) for the months
+    [first, last], from one TruncMonth-grouped query over a half-open
+    created_at range so the created_at index stays usable. Months with no
+    projects are filled with 0.
+    """
+    start, end = aware_month_bounds(first, last)
+    rows = Project.objects.filter(
+        created_at__gte=start, created_at__lt=end
+    ).annotate(
+        period=TruncMonth('created_at')
+    ).order_by().values('period').annotate(
+        revenue=Sum('budget'), cost=Sum('spent')
+    )
+    by_month = {
+        (row['period'].year, row['period'].month): row for row in rows
+    }
+    revenue, cost = [], []
+    for month in iter_months(first, last):
+        row = by_month.get((month.year, month.month), {})
+        revenue.append(float(row.get('revenue') or 0))
+        cost.append(float(row.get('cost') or 0))
+    return revenue, cost
+
+
+def as_percentages(amounts):
+    total = sum(amounts.values()) or 1
+    return {name: round(float(value) / total * 100, 1) for name, value in amounts.items()}
+
+
+def project_labor_cost(project):
+    """
+    Net payroll allocated to `project`: each worker's monthly net pay split by
+    their present days per project (the rule ProjectMonthlyFact applies).
+    One aggregate over the payroll records of the (worker, month) pairs with
+    attendance on the project, the shares computed in SQL.
+    """
+    month_days = Attendance.objects.filter(
+        worker=OuterRef('worker'), date__year=OuterRef('year'), date__month=OuterRef('month'),
+        status__in=PRESENT_STATUSES,
+    ).order_by().values('worker')
+    on_project = month_days.filter(project=project)
+
+    def day_count(qs):
+        return Subquery(qs.annotate(n=Count('id')).values('n'))
+
+    agg = PayrollRecord.objects.filter(
+        Exists(on_project),
+        worker__in=Attendance.objects.filter(project=project).values('worker'),
+    ).aggregate(labor=Sum(
+        Cast('net_salary', FloatField()) * day_count(on_project) / day_count(month_days),
+        output_field=FloatField(),
+    ))
+    return agg['labor'] or 0.0
+
+
+def cost_category_breakdown(project=None):
+    """
+    Labor plus material value per InventoryCategory, as percentages of their sum.
+    Materials come from one grouped Sum(quantity * unit_price) query. Labor is
+    total net payroll, or the project's allocated payroll when filtering by
+    project; both are read from the live tables, so they describe the same
+    moment.
+    """
+    if project:
+        labor = project_labor_cost(project)
+    else:
+        labor = PayrollRecord.objects.aggregate(
+            t=Sum('net_salary')
+        )['t'] or 0
+
+    items = InventoryItem.objects.all()
+    if project:
+        items = items.filter(project=project)
+    materials = items.order_by().values('category').annotate(
+        value=Sum(F('quantity') * F('unit_price'), output_field=FloatField())
+    )
+    labels = dict(InventoryCategory.choices)
+    amounts = {'Labor': float(labor)}
+    for row in materials:
+        amounts[labels.get(row['category'], row['category'])] = row['value'] or 0
+    return as_percentages(amounts)
+
+
+def project_completion():
+    """Share of projects completed, from one conditional aggregate."""
+    agg = Project.objects.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status=ProjectStatus.COMPLETED)),
+    )
+    return round(agg['completed'] / agg['total'] * 100, 1) if agg['total'] else 0
+
+
+def worker_efficiency(today):
+    """Present / total attendance over the last 30 days, from the daily rollup."""
+    att = attendance_status_totals(today - timedelta(days=30))
+    return round(att['present'] / att['total'] * 100, 1) if att['total'] else 0
+
+
+def facts_breakdown(project=None):
+    totals = fact_cost_totals(project)
+    return as_percentages({'Labor': totals['labor'], 'Materials': totals['materials']})
+
+
+def analytics_metric_tasks(today, first, last, source='live', project=None):
+    """
+    Independent units of work keyed by payload field; each runs its own queries.
+    source='facts' reads money figures from ProjectMonthlyFact only, so cost
+    stays flat as the transactional tables grow; completion and efficiency
+    come from one project aggregate and the attendance rollup either way.
+    """
+    if source == 'facts':
+        tasks = {
+            'series': lambda: fact_series(first, last),
+            'category_breakdown': lambda: facts_breakdown(project),
+            'facts_as_of': facts_as_of,
+        }
+    else:
+        tasks = {
+            'series': lambda: revenue_cost_series(first, last),
+            'category_breakdown': lambda: cost_category_breakdown(project),
+        }
+    tasks['project_completion'] = project_completion
+    tasks['worker_efficiency'] = lambda: worker_efficiency(today)
+    return tasks
+
+
+def assemble_analytics_metrics(parts):
+    """Shapes the independently computed parts into AnalyticsMetricsEntity."""
+    revenue_by_month, cost_by_month = parts.pop('series')
+    return {
+        'revenue_by_month': revenue_by_month,
+        'cost_by_month': cost_by_month,
+        **parts,
+    }
+
+
+def default_window(today):
+    """The last 6 months, ending with the current one."""
+    last = today.replace(day=1)
+    return add_months(last, -5), last
+
+
+def build_analytics_metrics(today=None, first=None, last=None, source='live', project=None):
+    """
+    Payload matching Flutter AnalyticsMetricsEntity.
+    Series cover the months [first, last] (default: last 6 months); `project`
+    scopes the category breakdown.
+    """
+    today = today or date.today()
+    if not (first and last):
+        first, last = default_window(today)
+    return assemble_analytics_metrics(
+        run_tasks(analytics_metric_tasks(today, first, last, source, project))
+    )
@@ -1,3 +1,185 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import Client, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.authentication.models import User, UserRole
+from apps.projects.models import Project
+from apps.payroll.models import PayrollRecord
+from apps.inventory.models import InventoryItem
+from apps.workforce.models import Attendance, Worker
+from .facts import refresh_facts
+from .forecast import forecast, load_columns
+from .models import ProjectMonthlyFact
+from .services import cost_category_breakdown, project_labor_cost, revenue_cost_series
+
+
+class RevenueCostSeriesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_series_is_one_query_with_gaps_filled(self):
+        Project.objects.create(name='A', location='Dhaka', budget=100, spent=40)
+        this_month = date.today().replace(day=1)
+        with self.assertNumQueries(1):
+            revenue, cost = revenue_cost_series(date(2000, 1, 1), this_month)
+        self.assertEqual(len(revenue), (this_month.year - 2000) * 12 + this_month.month)
+        self.assertEqual(revenue[-1], 100.0)
+        self.assertEqual(cost[-1], 40.0)
+        self.assertEqual(sum(revenue[:-1]), 0)
+
+    def test_month_range_params(self):
+        response = self.client.get('/api/analytics/metrics/?from=2024-01&to=2026-12')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']['revenue_by_month']), 36)
+
+        self.assertEqual(self.client.get('/api/analytics/metrics/?from=2024-13').status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/analytics/metrics/?from=2026-02&to=2026-01').status_code, 400
+        )
+
+
+class ProjectForecastTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_forecast_projects_overrun_and_slippage(self):
+        today = date.today()
+        Project.objects.create(
+            name='Late', location='Dhaka', status='in_progress', progress=25,
+            budget=1000, spent=500, start_date=today - timedelta(days=100),
+            due_date=today + timedelta(days=100),
+        )
+        Project.objects.create(name='Unstarted', location='Dhaka', budget=1000)
+        with self.assertNumQueries(1):
+            cols = load_columns()
+        result = forecast(cols, today)
+        late, unstarted = list(cols['name']).index('Late'), list(cols['name']).index('Unstarted')
+        self.assertEqual(result['projected_final_cost'][late], 2000.0)
+        self.assertEqual(result['slippage_days'][late], 200.0)
+        self.assertTrue(result['at_risk'][late])
+        self.assertFalse(result['at_risk'][unstarted])
+
+        response = self.client.get('/api/analytics/forecast/?at_risk=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['summary']['at_risk_count'], 1)
+        self.assertEqual([p['name'] for p in response.data['data']['projects']], ['Late'])
+        self.assertEqual(self.client.get('/api/analytics/forecast/?status=bogus').status_code, 400)
+
+
+class ProjectMonthlyFactRefreshTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(user=user, employee_id='E1', designation='Mason')
+
+    def test_refresh_recomputes_only_touched_months(self):
+        project = Project.objects.create(name='A', location='Dhaka', budget=100, spent=40)
+        PayrollRecord.objects.create(worker=self.worker, month=1, year=2020, base_salary=500)
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (Project, PayrollRecord, Worker):
+            model.all_objects.update(updated_at=an_hour_ago)
+        self.assertEqual(refresh_facts(), (2, 2))
+        self.assertEqual(refresh_facts(), (0, 0))
+
+        # A write stamped before that refresh started, committed after it had read.
+        record = PayrollRecord.objects.get()
+        record.bonus = 50
+        record.save()
+        PayrollRecord.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(refresh_facts(), (1, 1))
+        fact = ProjectMonthlyFact.objects.get(year=2020, month=1)
+        self.assertIsNone(fact.project_id)
+        self.assertEqual(float(fact.payroll_cost), 550.0)
+        self.assertEqual(float(ProjectMonthlyFact.objects.get(project=project).budget), 100.0)
+
+
+class CostCategoryBreakdownTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(user=user, employee_id='E1', designation='Mason')
+        self.project = Project.objects.create(name='A', location='Dhaka')
+        for day in range(1, 5):
+            Attendance.objects.create(
+                worker=self.worker, date=date(2026, 1, day),
+                project=self.project if day <= 2 else None,
+            )
+        PayrollRecord.objects.create(worker=self.worker, month=1, year=2026, base_salary=1000)
+        for category, quantity, price, project in [
+            ('Steel', 10, 30, self.project),
+            ('Cement', 20, 10, self.project),
+            ('Steel', 100, 10, None),
+        ]:
+            InventoryItem.objects.create(
+                name=category, category=category, quantity=quantity, unit_price=price,
+                project=project,
+            )
+
+    def test_project_labor_and_materials_come_from_live_rows(self):
+        # Labor is half the month's net pay (2 of 4 present days on the project);
+        # the fact table is never refreshed here.
+        self.assertEqual(
+            cost_category_breakdown(self.project.id),
+            {'Labor': 50.0, 'Steel': 30.0, 'Cement': 20.0},
+        )
+        self.assertEqual(
+            cost_category_breakdown(), {'Labor': 40.0, 'Steel': 52.0, 'Cement': 8.0}
+        )
+
+    def test_project_labor_is_one_query_over_the_projects_months(self):
+        # Another month off the project and another worker never on it add nothing.
+        Attendance.objects.create(worker=self.worker, date=date(2026, 2, 1))
+        PayrollRecord.objects.create(worker=self.worker, month=2, year=2026, base_salary=700)
+        other = Worker.objects.create(
+            user=User.objects.create_user(email='v@test.app', password='x', name='Other'),
+            employee_id='E2', designation='Mason',
+        )
+        Attendance.objects.create(worker=other, date=date(2026, 1, 1))
+        PayrollRecord.objects.create(worker=other, month=1, year=2026, base_salary=900)
+        with self.assertNumQueries(1):
+            self.assertAlmostEqual(project_labor_cost(self.project.id), 500.0)
+
+
+class ConcurrentAnalyticsTests(TransactionTestCase):
+    """The async endpoint fans out over pool threads, so the data must be committed."""
+
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(name='A', location='Dhaka', budget=100, spent=40)
+        self.url = '/api/analytics/metrics/concurrent/?from=2026-01&to=2026-12'
+
+    def _get(self, role, url=None):
+        user = User.objects.create_user(
+            email=f'{role}@test.app', password='x', name=role, role=role
+        )
+        token = RefreshToken.for_user(user).access_token
+        return Client().get(url or self.url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_roles_and_payload(self):
+        response = self._get(UserRole.WORKER)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'success': False, 'message': 'Permission denied.'})
+        self.assertEqual(Client().get(self.url).status_code, 401)
+
+        response = self._get(UserRole.ADMIN)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(len(data['revenue_by_month']), 12)
+        self.assertEqual(set(data), {
+            'revenue_by_month', 'cost_by_month', 'category_breakdown',
+            'project_completion', 'worker_efficiency',
+        })
+        bad = self._get(UserRole.SITE_MANAGER, '/api/analytics/metrics/concurrent/?from=2026-13')
+        self.assertEqual((bad.status_code, bad.json()['success']), (400, False))
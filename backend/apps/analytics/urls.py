@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import AnalyticsMetricsView
+from .views import AnalyticsMetricsView, ProjectForecastView, analytics_metrics_concurrent
 
 urlpatterns = [
     path('metrics/', AnalyticsMetricsView.as_view(), name='analytics-metrics'),
+    path('metrics/concurrent/', analytics_metrics_concurrent, name='analytics-metrics-concurrent'),
+    path('forecast/', ProjectForecastView.as_view(), name='analytics-forecast'),
 ]
@@ -1,20 +1,54 @@
 """
 Analytics views — Revenue & cost metrics aggregated from projects + payroll.
 """
-from datetime import date, timedelta
+import uuid
+from datetime import date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Avg, Count, F
 
+from core.async_views import async_api_view, json_response
+from core.cache import acached_payload, cached_payload
+from core.concurrency import gather_tasks
+from core.periods import month_window
 from apps.projects.models import Project, ProjectStatus
-from apps.payroll.models import PayrollRecord
-from apps.workforce.models import Attendance, AttendanceStatus
+from . import forecast as forecast_engine
+from .services import (
+    analytics_metric_tasks, assemble_analytics_metrics, build_analytics_metrics,
+)
+
+ANALYTICS_CACHE_TAGS = ('projects', 'attendance', 'payroll', 'inventory', 'analytics_facts')
+FACT_CACHE_TAGS = ('projects', 'attendance', 'analytics_facts')
+MAX_SERIES_MONTHS = 120
+
+
+def parse_metrics_params(params):
+    """Validated {first, last, source, project} from query params; ValueError on bad input."""
+    first, last = month_window(params, max_months=MAX_SERIES_MONTHS)
+    source = params.get('source', 'live')
+    if source not in ('live', 'facts'):
+        raise ValueError('source must be "live" or "facts".')
+    project = params.get('project')
+    if project:
+        try:
+            project = uuid.UUID(project)
+        except ValueError:
+            raise ValueError('Invalid project id.')
+    return {'first': first, 'last': last, 'source': source, 'project': project}
+
+
+def _cache_args(request, params, today):
+    scope = {
+        'date': today, 'from': params['first'], 'to': params['last'],
+        'source': params['source'], 'project': params['project'],
+    }
+    tags = FACT_CACHE_TAGS if params['source'] == 'facts' else ANALYTICS_CACHE_TAGS
+    return {'endpoint': 'analytics.metrics', 'role': request.user.role, 'scope': scope, 'tags': tags}
 
 
 class AnalyticsMetricsView(APIView):
     """
-    GET /api/analytics/metrics/
+    GET /api/analytics/metrics/?from=YYYY-MM&to=YYYY-MM[&source=facts][&project=<uuid>]
     Returns revenue, cost, project completion, worker efficiency, category breakdown.
     Matches Flutter AnalyticsMetricsEntity exactly.
     """
@@ -23,75 +57,78 @@ class AnalyticsMetricsView(APIView):
     def get(self, request):
         if request.user.role not in ('admin', 'site_manager'):
             return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        try:
+            params = parse_metrics_params(request.query_params)
+        except ValueError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=400)
 
         today = date.today()
-
-        # ── 6-month revenue & cost ──────────────────────────────────────
-        revenue_by_month = []
-        cost_by_month = []
-        m, y = today.month, today.year
-        for _ in range(6):
-            # Revenue = sum of project budgets billed this month (simplification)
-            rev = Project.objects.filter(
-                created_at__month=m, created_at__year=y
-            ).aggregate(t=Sum('budget'))['t'] or 0
-
-            # Cost = total payroll + operational spend (using spent as proxy)
-            cost = Project.objects.filter(
-                created_at__month=m, created_at__year=y
-            ).aggregate(t=Sum('spent'))['t'] or 0
-
-            revenue_by_month.insert(0, float(rev))
-            cost_by_month.insert(0, float(cost))
-
-            m -= 1
-            if m == 0:
-                m = 12
-                y -= 1
-
-        # ── Project completion ──────────────────────────────────────────
-        all_projects = Project.objects.all()
-        total_count = all_projects.count()
-        completed_count = all_projects.filter(status=ProjectStatus.COMPLETED).count()
-        project_completion = (
-            round(completed_count / total_count * 100, 1) if total_count > 0 else 0
+        data = cached_payload(
+            builder=lambda: build_analytics_metrics(
+                today, params['first'], params['last'], params['source'], params['project']
+            ),
+            **_cache_args(request, params, today),
         )
+        return Response({'success': True, 'data': data})
 
-        # ── Worker efficiency ───────────────────────────────────────────
-        # Attendance last 30 days: present / total records
-        thirty_days_ago = today - timedelta(days=30)
-        total_att = Attendance.objects.filter(date__gte=thirty_days_ago).count()
-        present_att = Attendance.objects.filter(
-            date__gte=thirty_days_ago,
-            status__in=[AttendanceStatus.PRESENT, AttendanceStatus.LATE]
-        ).count()
-        worker_efficiency = (
-            round(present_att / total_att * 100, 1) if total_att > 0 else 0
-        )
 
-        # ── Cost category breakdown ─────────────────────────────────────
-        # Computed from payroll vs project spend columns
-        total_payroll = PayrollRecord.objects.aggregate(
-            t=Sum(F('base_salary') + F('bonus') - F('deductions'))
-        )['t'] or 1
-        total_spent = Project.objects.aggregate(t=Sum('spent'))['t'] or 1
-        grand_total = float(total_payroll) + float(total_spent)
-
-        category_breakdown = {
-            'Labor': round(float(total_payroll) / grand_total * 100, 1),
-            'Materials': 30.0,    # would come from InventoryItem totals in real impl
-            'Equipment': 15.0,
-            'Overhead': 12.0,
-            'Safety': 5.0,
-        }
-
-        return Response({
-            'success': True,
-            'data': {
-                'revenue_by_month': revenue_by_month,
-                'cost_by_month': cost_by_month,
-                'project_completion': project_completion,
-                'worker_efficiency': worker_efficiency,
-                'category_breakdown': category_breakdown,
+@async_api_view(roles=('admin', 'site_manager'))
+async def analytics_metrics_concurrent(request):
+    """
+    GET /api/analytics/metrics/concurrent/ — same contract as AnalyticsMetricsView,
+    with the independent aggregates run concurrently. Serve under ASGI.
+    """
+    try:
+        params = parse_metrics_params(request.GET)
+    except ValueError as exc:
+        return json_response({'success': False, 'message': str(exc)}, status=400)
+
+    today = date.today()
+
+    async def build():
+        parts = await gather_tasks(analytics_metric_tasks(
+            today, params['first'], params['last'], params['source'], params['project']
+        ))
+        return assemble_analytics_metrics(parts)
+
+    data = await acached_payload(builder=build, **_cache_args(request, params, today))
+    return json_response({'success': True, 'data': data})
+
+
+class ProjectForecastView(APIView):
+    """
+    GET /api/analytics/forecast/?status=in_progress&at_risk=true
+    Burn rate, projected final cost / overrun and completion slippage for every
+    project, computed in one vectorized pass (see forecast.py).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role not in ('admin', 'site_manager'):
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+
+        project_status = request.query_params.get('status')
+        if project_status and project_status not in ProjectStatus.values:
+            return Response({'success': False, 'message': 'Invalid status.'}, status=400)
+        at_risk_only = request.query_params.get('at_risk') in ('1', 'true')
+
+        def build():
+            qs = Project.objects.all()
+            if project_status:
+                qs = qs.filter(status=project_status)
+            cols = forecast_engine.load_columns(qs)
+            result = forecast_engine.forecast(cols, today)
+            return {
+                'summary': forecast_engine.forecast_summary(result),
+                'projects': forecast_engine.forecast_rows(
+                    cols, result, mask=result['at_risk'] if at_risk_only else None
+                ),
             }
-        })
+
+        today = date.today()
+        data = cached_payload(
+            'analytics.forecast', request.user.role, build,
+            scope={'date': today, 'status': project_status, 'at_risk': at_risk_only},
+            tags=('projects',),
+        )
+        return Response({'success': True, 'data': data})
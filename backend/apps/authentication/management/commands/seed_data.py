@@ -12,7 +12,9 @@ from apps.authentication.models import User, UserRole
 from apps.projects.models import Project, ProjectStatus
 from apps.workforce.models import Worker, Attendance, AttendanceStatus
 from apps.inventory.models import InventoryItem, InventoryCategory
+from apps.inventory.services import record_opening_balance
 from apps.payroll.models import PayrollRecord, PayrollStatus
+from apps.workforce.services import rebuild_attendance_rollup
 
 
 class Command(BaseCommand):
@@ -146,6 +148,7 @@ class Command(BaseCommand):
                         'check_in': check_in,
                     }
                 )
+        rebuild_attendance_rollup(today - timedelta(days=6), today)
         self.stdout.write('  Attendance (7 days) created')
 
     def _create_inventory(self):
@@ -158,7 +161,7 @@ class Command(BaseCommand):
             ('PVC Pipes', InventoryCategory.PLUMBING, 200, 'pcs', 350, 60, 'Site B'),
         ]
         for name, cat, qty, unit, price, threshold, loc in items:
-            InventoryItem.objects.get_or_create(
+            item, created = InventoryItem.objects.get_or_create(
                 name=name,
                 defaults={
                     'category': cat,
@@ -169,6 +172,8 @@ class Command(BaseCommand):
                     'location': loc,
                 }
             )
+            if created:
+                record_opening_balance(item)
         self.stdout.write('  Inventory created')
 
     def _create_payroll(self):
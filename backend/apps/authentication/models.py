@@ -57,6 +57,10 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Directory listings sort by name.
+            models.Index(fields=['name', 'id'], name='user_name_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.role})'
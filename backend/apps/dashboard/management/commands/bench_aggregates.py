@@ -0,0 +1,68 @@
+"""
+management/commands/bench_aggregates.py
+Run: python manage.py bench_aggregates --settings=config.settings.production [--iterations 50]
+Compares the sequential (WSGI) and concurrent (ASGI) paths for the dashboard
+and analytics aggregates, bypassing the response cache. Meaningful numbers
+need Postgres; SQLite serialises connections and shows little gain.
+"""
+import statistics
+import time
+from datetime import date
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.concurrency import gather_tasks, run_tasks
+from apps.dashboard.services import dashboard_stat_tasks
+from apps.analytics.services import analytics_metric_tasks, default_window
+
+
+def _timed(fn, iterations):
+    fn()  # warm-up: connections, query plans
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks sequential vs concurrent dashboard/analytics aggregation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        today = date.today()
+        first, last = default_window(today)
+        suites = {
+            'dashboard': lambda: dashboard_stat_tasks(today),
+            'analytics': lambda: analytics_metric_tasks(today, first, last),
+        }
+        self.stdout.write(
+            f'DB vendor: {connection.vendor} · pool: {settings.AGGREGATE_FANOUT_WORKERS} '
+            f'threads · {iterations} iterations'
+        )
+        for name, tasks in suites.items():
+            async def fan_out():
+                return await gather_tasks(tasks())
+
+            sequential = _timed(lambda: run_tasks(tasks()), iterations)
+            concurrent = _timed(async_to_sync(fan_out), iterations)
+            self.stdout.write(f'\n{name} ({len(tasks())} tasks)')
+            for label, result in (('sequential', sequential), ('concurrent', concurrent)):
+                self.stdout.write(
+                    f'  {label:<11} mean {result["mean"]:7.2f} ms · '
+                    f'p50 {result["p50"]:7.2f} ms · p95 {result["p95"]:7.2f} ms'
+                )
+            speedup = sequential['mean'] / concurrent['mean'] if concurrent['mean'] else 0
+            self.stdout.write(self.style.SUCCESS(f'  speed-up   ×{speedup:.2f}'))
@@ -0,0 +1,102 @@
+"""
+Dashboard services — computes the DashboardStatsEntity payload with a fixed
+number of grouped / conditional-aggregate queries, independent of data size.
+"""
+from datetime import date, timedelta
+from django.db.models import Avg, Count, F, Q, Sum
+
+from core.concurrency import run_tasks
+from apps.projects.models import Project, ProjectStatus
+from apps.workforce.models import Worker
+from apps.workforce.services import attendance_trend
+from apps.inventory.models import InventoryItem
+from apps.payroll.models import PayrollRecord
+from apps.projects.serializers import ProjectSerializer
+
+TREND_DAYS = 7
+RECENT_PROJECTS = 5
+
+
+def worker_total():
+    return Worker.objects.count()
+
+
+def weekly_attendance(today):
+    """Present/late counts for the last TREND_DAYS days, read from the daily rollup."""
+    start = today - timedelta(days=TREND_DAYS - 1)
+    counts = attendance_trend(start, today)
+    return [
+        {'day': d.strftime('%a'), 'count': counts.get(d, 0)}
+        for d in (start + timedelta(days=i) for i in range(TREND_DAYS))
+    ]
+
+
+def project_totals():
+    """Active project count and average progress in a single aggregate."""
+    agg = Project.objects.aggregate(
+        active=Count('id', filter=Q(status=ProjectStatus.IN_PROGRESS)),
+        avg_progress=Avg('progress'),
+    )
+    return {
+        'active_projects': agg['active'],
+        'avg_project_progress': round(float(agg['avg_progress'] or 0), 1),
+    }
+
+
+def monthly_payroll(today):
+    total = PayrollRecord.objects.filter(
+        month=today.month, year=today.year
+    ).aggregate(
+        t=Sum('net_salary')
+    )['t'] or 0
+    return float(total)
+
+
+def low_stock_count():
+    return InventoryItem.objects.filter(
+        quantity__lte=F('low_stock_threshold')
+    ).count()
+
+
+def recent_projects():
+    # prefetch_related lets ProjectSerializer.worker_count read from cache
+    # instead of issuing one COUNT per project.
+    qs = Project.objects.select_related('site_manager').prefetch_related(
+        'workers'
+    ).order_by('-updated_at')[:RECENT_PROJECTS]
+    return ProjectSerializer(qs, many=True).data
+
+
+def assemble_dashboard_stats(parts):
+    """Shapes the independently computed parts into DashboardStatsEntity."""
+    weekly = parts['weekly_attendance']
+    total_workers = parts['total_workers']
+    present_today = weekly[-1]['count']
+    return {
+        'total_workers': total_workers,
+        'present_today': present_today,
+        'absent_today': total_workers - present_today,
+        'active_projects': parts['project_totals']['active_projects'],
+        'monthly_payroll': parts['monthly_payroll'],
+        'low_stock_count': parts['low_stock_count'],
+        'avg_project_progress': parts['project_totals']['avg_project_progress'],
+        'weekly_attendance': weekly,
+        'recent_projects': parts['recent_projects'],
+    }
+
+
+def dashboard_stat_tasks(today):
+    """Independent units of work keyed by part name; each runs its own queries."""
+    return {
+        'total_workers': worker_total,
+        'weekly_attendance': lambda: weekly_attendance(today),
+        'project_totals': project_totals,
+        'monthly_payroll': lambda: monthly_payroll(today),
+        'low_stock_count': low_stock_count,
+        'recent_projects': recent_projects,
+    }
+
+
+def build_dashboard_stats(today=None):
+    today = today or date.today()
+    return assemble_dashboard_stats(run_tasks(dashboard_stat_tasks(today)))
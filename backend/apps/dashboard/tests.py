@@ -1,3 +1,168 @@
-from django.test import TestCase
+import threading
+from datetime import date, timedelta
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import Client, TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.cache import cache_stats, flush_stats
+from core.concurrency import gather_tasks
+
+from apps.authentication.models import User, UserRole
+from apps.projects.models import Project, ProjectStatus
+from apps.workforce.models import Worker, Attendance, AttendanceStatus
+from apps.workforce.services import rebuild_attendance_rollup
+from apps.inventory.models import InventoryItem
+from apps.payroll.models import PayrollRecord
+from .services import build_dashboard_stats
+
+DASHBOARD_QUERIES = 7
+
+
+class DashboardStatsQueryCountTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self._seq = 0
+        cache.clear()
+
+    def _add_workers(self, n):
+        workers = []
+        for _ in range(n):
+            self._seq += 1
+            user = User.objects.create_user(
+                email=f'w{self._seq}@test.app', password='x', name=f'Worker {self._seq}'
+            )
+            workers.append(Worker.objects.create(
+                user=user, employee_id=f'E{self._seq}', designation='Mason', daily_rate=100
+            ))
+        return workers
+
+    def _add_data(self, projects, workers, days):
+        for i in range(projects):
+            project = Project.objects.create(
+                name=f'P{self._seq}-{i}', location='Dhaka',
+                status=ProjectStatus.IN_PROGRESS if i % 2 else ProjectStatus.PLANNING,
+                progress=10 * i,
+            )
+            project.workers.add(self.admin)
+            InventoryItem.objects.create(name=f'Item {i}', quantity=i, low_stock_threshold=5)
+        for worker in self._add_workers(workers):
+            PayrollRecord.objects.create(
+                worker=worker, month=self.today.month, year=self.today.year, base_salary=1000
+            )
+            for d in range(days):
+                Attendance.objects.create(
+                    worker=worker, date=self.today - timedelta(days=d),
+                    status=AttendanceStatus.LATE if d % 3 else AttendanceStatus.PRESENT,
+                )
+        rebuild_attendance_rollup()
+
+    def test_query_count_is_independent_of_data_volume(self):
+        self._add_data(projects=2, workers=2, days=2)
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            build_dashboard_stats(self.today)
+
+        self._add_data(projects=8, workers=6, days=7)
+        with self.assertNumQueries(DASHBOARD_QUERIES):
+            build_dashboard_stats(self.today)
+
+    def test_payload_matches_entity(self):
+        self._add_data(projects=3, workers=4, days=7)
+        stats = build_dashboard_stats(self.today)
+
+        self.assertEqual(stats['total_workers'], 4)
+        self.assertEqual(stats['present_today'], 4)
+        self.assertEqual(stats['absent_today'], 0)
+        self.assertEqual(stats['active_projects'], 1)
+        self.assertEqual(stats['monthly_payroll'], 4000.0)
+        self.assertEqual(stats['low_stock_count'], 3)
+        self.assertEqual(stats['avg_project_progress'], 10.0)
+        self.assertEqual([row['count'] for row in stats['weekly_attendance']], [4] * 7)
+        self.assertEqual(
+            stats['weekly_attendance'][-1]['day'], self.today.strftime('%a')
+        )
+        self.assertEqual(len(stats['recent_projects']), 3)
+        self.assertEqual(stats['recent_projects'][0]['worker_count'], 1)
+
+    def test_endpoint_returns_stats(self):
+        response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['success'])
+        self.assertEqual(len(response.data['data']['weekly_attendance']), 7)
+
+    def test_endpoint_is_cached_until_a_source_model_changes(self):
+        self._add_data(projects=1, workers=1, days=1)
+        self.client.get('/api/dashboard/stats/')
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(cached.data['data']['active_projects'], 0)
+
+        Project.objects.create(name='New', location='Dhaka', status=ProjectStatus.IN_PROGRESS)
+        fresh = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(fresh.data['data']['active_projects'], 1)
+
+        stats = self.client.get('/api/dashboard/cache-stats/').data['data']
+        self.assertEqual(stats['dashboard.stats'], {'hits': 1, 'misses': 2})
+
+
+class ConcurrentDashboardTests(TransactionTestCase):
+    """The async endpoint fans out over pool threads, so the data must be committed."""
+
+    def setUp(self):
+        flush_stats()    # drop other tests' buffered counts with the cache
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        Project.objects.create(name='P', location='Dhaka', status=ProjectStatus.IN_PROGRESS)
+        self.client = Client()
+        self.url = '/api/dashboard/stats/concurrent/'
+
+    def _bearer(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def test_gather_tasks_runs_tasks_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)    # both tasks must be running at once
+
+        def meet(value):
+            barrier.wait()
+            return value
+
+        results = async_to_sync(gather_tasks)({
+            'label': lambda: meet('a'),
+            'projects': lambda: meet(Project.objects.count()),
+        })
+        self.assertEqual(results, {'label': 'a', 'projects': 1})
+
+    def test_matches_sync_endpoint_and_shares_its_cache(self):
+        response = self.client.get(self.url, **self._bearer(self.admin))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['data']['active_projects'], 1)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.get('/api/dashboard/stats/').json(), body)
+        self.assertEqual(
+            cache_stats(['dashboard.stats'])['dashboard.stats'], {'hits': 1, 'misses': 1}
+        )
+
+    def test_auth_envelope(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {
+            'success': False, 'message': 'Authentication credentials were not provided.',
+        })
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.json()['success'])
+        response = self.client.post(self.url, **self._bearer(self.admin))
+        self.assertEqual(response.status_code, 405)
@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import DashboardStatsView
+from .views import DashboardStatsView, CacheStatsView, dashboard_stats_concurrent
 
 urlpatterns = [
     path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('stats/concurrent/', dashboard_stats_concurrent, name='dashboard-stats-concurrent'),
+    path('cache-stats/', CacheStatsView.as_view(), name='dashboard-cache-stats'),
 ]
@@ -2,86 +2,66 @@
 Dashboard view — single endpoint that aggregates KPIs for the Flutter DashboardPage.
 Matches DashboardStatsEntity + ProjectSummary exactly.
 """
-from datetime import date, timedelta
+from datetime import date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, F, Count
 
-from apps.projects.models import Project, ProjectStatus
-from apps.workforce.models import Attendance, Worker, AttendanceStatus
-from apps.inventory.models import InventoryItem
-from apps.payroll.models import PayrollRecord
-from apps.projects.serializers import ProjectSerializer
+from core.async_views import async_api_view, json_response
+from core.cache import acached_payload, cached_payload, cache_stats
+from core.concurrency import gather_tasks
+from .services import assemble_dashboard_stats, build_dashboard_stats, dashboard_stat_tasks
+
+DASHBOARD_CACHE_TAGS = ('projects', 'workers', 'attendance', 'payroll', 'inventory')
+CACHED_ENDPOINTS = (
+    'dashboard.stats', 'analytics.metrics', 'analytics.forecast', 'payroll.history',
+    'workforce.calendar', 'inventory.summary',
+)
 
 
 class DashboardStatsView(APIView):
     """
     GET /api/dashboard/stats/
     Single aggregated response matching Flutter's DashboardStatsEntity.
+    Query count is fixed regardless of data volume (see services.py), and the
+    payload is served from the response cache until a source model changes.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         today = date.today()
-        thirty_days_ago = today - timedelta(days=30)
-
-        # ── Worker attendance today ─────────────────────────────────────
-        total_workers = Worker.objects.count()
-        present_today = Attendance.objects.filter(
-            date=today,
-            status__in=[AttendanceStatus.PRESENT, AttendanceStatus.LATE]
-        ).count()
+        data = cached_payload(
+            'dashboard.stats', request.user.role,
+            lambda: build_dashboard_stats(today),
+            scope={'date': today}, tags=DASHBOARD_CACHE_TAGS,
+        )
+        return Response({'success': True, 'data': data})
 
-        # ── Active projects ─────────────────────────────────────────────
-        active_projects = Project.objects.filter(
-            status=ProjectStatus.IN_PROGRESS
-        ).count()
 
-        # ── Monthly payroll total ───────────────────────────────────────
-        monthly_payroll = PayrollRecord.objects.filter(
-            month=today.month, year=today.year
-        ).aggregate(
-            t=Sum(F('base_salary') + F('bonus') - F('deductions'))
-        )['t'] or 0
+@async_api_view()
+async def dashboard_stats_concurrent(request):
+    """
+    GET /api/dashboard/stats/concurrent/ — same contract and cache entry as
+    DashboardStatsView, with the independent aggregates run concurrently.
+    Serve under ASGI.
+    """
+    today = date.today()
 
-        # ── Low stock items ─────────────────────────────────────────────
-        low_stock_count = InventoryItem.objects.filter(
-            quantity__lte=F('low_stock_threshold')
-        ).count()
+    async def build():
+        return assemble_dashboard_stats(await gather_tasks(dashboard_stat_tasks(today)))
 
-        # ── Project completion average ──────────────────────────────────
-        from django.db.models import Avg
-        avg_progress = Project.objects.aggregate(
-            avg=Avg('progress')
-        )['avg'] or 0
+    data = await acached_payload(
+        'dashboard.stats', request.user.role, build,
+        scope={'date': today}, tags=DASHBOARD_CACHE_TAGS,
+    )
+    return json_response({'success': True, 'data': data})
 
-        # ── Recent projects for list ────────────────────────────────────
-        recent_projects = Project.objects.select_related('site_manager').order_by(
-            '-updated_at'
-        )[:5]
 
-        # ── Weekly attendance trend (last 7 days) ──────────────────────
-        weekly = []
-        for i in range(6, -1, -1):
-            d = today - timedelta(days=i)
-            count = Attendance.objects.filter(
-                date=d,
-                status__in=[AttendanceStatus.PRESENT, AttendanceStatus.LATE]
-            ).count()
-            weekly.append({'day': d.strftime('%a'), 'count': count})
+class CacheStatsView(APIView):
+    """GET /api/dashboard/cache-stats/ — response cache hit/miss counters (admin only)."""
+    permission_classes = [IsAuthenticated]
 
-        return Response({
-            'success': True,
-            'data': {
-                'total_workers': total_workers,
-                'present_today': present_today,
-                'absent_today': total_workers - present_today,
-                'active_projects': active_projects,
-                'monthly_payroll': float(monthly_payroll),
-                'low_stock_count': low_stock_count,
-                'avg_project_progress': round(float(avg_progress), 1),
-                'weekly_attendance': weekly,
-                'recent_projects': ProjectSerializer(recent_projects, many=True).data,
-            }
-        })
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        return Response({'success': True, 'data': cache_stats(CACHED_ENDPOINTS)})
@@ -4,3 +4,8 @@ class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.inventory'
     label = 'inventory'
+
+    def ready(self):
+        from core.cache import invalidate_on
+        from .models import InventoryItem
+        invalidate_on(InventoryItem, 'inventory')
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.13 on 2026-10-18 12:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+def opening_balances(apps, schema_editor):
+    """One adjustment per existing item so the ledger sums to its current quantity."""
+    InventoryItem = apps.get_model('inventory', 'InventoryItem')
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    batch = uuid.uuid4()
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            item_id=pk, kind='adjustment', delta=quantity, batch=batch,
+            note='Opening balance', occurred_at=created_at,
+        )
+        for pk, quantity, created_at in InventoryItem.objects.exclude(quantity=0)
+        .values_list('id', 'quantity', 'created_at').iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0003_project_created_at_idx'),
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField()),
+                ('quantity', models.FloatField()),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='inventory.inventoryitem')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('receipt', 'Receipt'), ('issue', 'Issue to project'), ('transfer', 'Transfer'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('delta', models.FloatField()),
+                ('batch', models.UUIDField(db_index=True)),
+                ('note', models.CharField(blank=True, max_length=300)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to=settings.AUTH_USER_MODEL)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='inventory.inventoryitem')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stocksnapshot',
+            constraint=models.UniqueConstraint(fields=('item', 'taken_at'), name='stock_snapshot_key'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['item', 'occurred_at'], name='movement_item_time_idx'),
+        ),
+        migrations.RunPython(opening_balances, migrations.RunPython.noop),
+    ]
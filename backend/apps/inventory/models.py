@@ -1,8 +1,11 @@
 """
-Inventory app — Materials and stock items.
+Inventory app — Materials and stock items, the stock movement ledger and
+periodic balance snapshots.
 """
 from django.db import models
+from django.utils import timezone
 from core.models import BaseModel
+from apps.authentication.models import User
 from apps.projects.models import Project
 
 
@@ -47,3 +50,61 @@ class InventoryItem(BaseModel):
     @property
     def total_value(self):
         return round(self.quantity * float(self.unit_price), 2)
+
+
+class MovementKind(models.TextChoices):
+    RECEIPT = 'receipt', 'Receipt'
+    ISSUE = 'issue', 'Issue to project'
+    TRANSFER = 'transfer', 'Transfer'
+    ADJUSTMENT = 'adjustment', 'Adjustment'
+
+
+class StockMovement(models.Model):
+    """
+    Append-only stock ledger: one signed quantity change per item. The sum
+    of an item's deltas equals its quantity; rows are never edited. A
+    transfer is two rows (out of the source item, into the destination)
+    sharing a batch.
+    """
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='movements')
+    kind = models.CharField(max_length=20, choices=MovementKind.choices)
+    delta = models.FloatField()
+    project = models.ForeignKey(
+        Project, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='stock_movements'
+    )
+    batch = models.UUIDField(db_index=True)    # movements written by one request
+    note = models.CharField(max_length=300, blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_movements'
+    )
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-occurred_at', '-id']
+        indexes = [
+            models.Index(fields=['item', 'occurred_at'], name='movement_item_time_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.delta:+g} {self.item_id}'
+
+
+class StockSnapshot(models.Model):
+    """
+    An item's quantity as of `taken_at`, written by the snapshot_stock job.
+    Point-in-time stock starts from the latest snapshot and only replays the
+    ledger after it.
+    """
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='snapshots')
+    taken_at = models.DateTimeField()
+    quantity = models.FloatField()
+
+    class Meta:
+        ordering = ['-taken_at']
+        constraints = [
+            models.UniqueConstraint(fields=['item', 'taken_at'], name='stock_snapshot_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.item_id} @ {self.taken_at}: {self.quantity}'
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import InventoryItem
+from .models import InventoryItem, MovementKind, StockMovement
 
 
 class InventoryItemSerializer(serializers.ModelSerializer):
@@ -16,3 +16,51 @@ class InventoryItemSerializer(serializers.ModelSerializer):
             'notes', 'created_at', 'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def update(self, instance, validated_data):
+        # Only the given fields are written: quantity changes go through the
+        # stock ledger (services.set_counted_quantity), never a stale full save.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class StockMovementEntrySerializer(serializers.Serializer):
+    """One movement of a bulk request; item / project ids are checked by the service."""
+    kind = serializers.ChoiceField(choices=MovementKind.choices)
+    item = serializers.UUIDField()
+    quantity = serializers.FloatField()
+    project = serializers.UUIDField(required=False, allow_null=True, default=None)
+    to_item = serializers.UUIDField(required=False, allow_null=True, default=None)
+    note = serializers.CharField(required=False, allow_blank=True, max_length=300, default='')
+
+    def validate(self, attrs):
+        kind, quantity = attrs['kind'], attrs['quantity']
+        if kind == MovementKind.ADJUSTMENT:
+            if not quantity:
+                raise serializers.ValidationError({'quantity': 'Adjustment must not be zero.'})
+        elif quantity <= 0:
+            raise serializers.ValidationError({'quantity': 'Must be positive.'})
+        if kind == MovementKind.ISSUE and not attrs['project']:
+            raise serializers.ValidationError({'project': 'Required for an issue.'})
+        if kind == MovementKind.TRANSFER:
+            if not attrs['to_item']:
+                raise serializers.ValidationError({'to_item': 'Required for a transfer.'})
+            if attrs['to_item'] == attrs['item']:
+                raise serializers.ValidationError({'to_item': 'Must differ from item.'})
+        elif attrs['to_item']:
+            raise serializers.ValidationError({'to_item': 'Only valid for a transfer.'})
+        return attrs
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    project_name = serializers.CharField(source='project.name', read_only=True, default=None)
+    created_by_name = serializers.CharField(source='created_by.name', read_only=True, default=None)
+
+    class Meta:
+        model = StockMovement
+        fields = [
+            'id', 'kind', 'delta', 'project', 'project_name', 'batch', 'note',
+            'created_by', 'created_by_name', 'occurred_at',
+        ]
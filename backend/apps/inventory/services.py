@@ -0,0 +1,256 @@
+"""
+Inventory services — valuation in SQL, stock movements applied as atomic
+deltas, counted adjustments, and point-in-time stock from balance snapshots.
+"""
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DateTimeField, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from core.cache import invalidate_tags
+from apps.projects.models import Project
+from .models import InventoryItem, MovementKind, StockMovement, StockSnapshot
+
+MOVEMENTS_MAX = 500
+SNAPSHOT_BATCH_SIZE = 1000
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+SUMMARY_DIMENSIONS = ('category', 'project', 'location')
+SUMMARY_AMOUNTS = ('value', 'item_count', 'low_stock_count')
+
+
+def low_stock_q():
+    return Q(quantity__lte=F('low_stock_threshold'))
+
+
+def with_valuation(queryset):
+    """
+    Adds `stock_value` (quantity × unit_price) and `low_stock` as database
+    annotations, the SQL counterparts of InventoryItem.total_value /
+    is_low_stock, so they can be filtered, ordered and aggregated.
+    """
+    return queryset.annotate(
+        stock_value=F('quantity') * Cast('unit_price', FloatField()),
+        low_stock=Case(When(low_stock_q(), then=Value(True)), default=Value(False)),
+    )
+
+
+def _accumulate(entry, row):
+    for name in SUMMARY_AMOUNTS:
+        entry[name] += row[name] or 0
+
+
+def _by_value(entries):
+    for entry in entries:
+        entry['value'] = round(entry['value'], 2)
+    return sorted(entries, key=lambda e: -e['value'])
+
+
+def inventory_summary():
+    """
+    Stock value, item count and low-stock count in total and per category,
+    project and location. One GROUP BY (category, project, location) query;
+    the three rollups are summed from its (few) rows. Each list is sorted by
+    value, highest first.
+    """
+    rows = (
+        InventoryItem.objects.order_by()
+        .values('category', 'project', 'project__name', 'location')
+        .annotate(
+            value=Sum(F('quantity') * Cast('unit_price', FloatField())),
+            item_count=Count('id'),
+            low_stock_count=Count('id', filter=low_stock_q()),
+        )
+    )
+    totals = dict.fromkeys(SUMMARY_AMOUNTS, 0)
+    groups = {dimension: {} for dimension in SUMMARY_DIMENSIONS}
+    for row in rows:
+        _accumulate(totals, row)
+        labels = {
+            'category': row['category'],
+            'project': row['project__name'] or 'Unassigned',
+            'location': row['location'] or 'Unspecified',
+        }
+        for dimension in SUMMARY_DIMENSIONS:
+            key = row[dimension]
+            entry = groups[dimension].setdefault(
+                key, {'key': key, 'label': labels[dimension], **dict.fromkeys(SUMMARY_AMOUNTS, 0)}
+            )
+            _accumulate(entry, row)
+    return {
+        'totals': _by_value([totals])[0],
+        **{f'by_{d}': _by_value(list(groups[d].values())) for d in SUMMARY_DIMENSIONS},
+    }
+
+
+class MovementError(Exception):
+    """Raised when a movement references unknown items or projects; nothing is written."""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} movement(s) are invalid.')
+        self.errors = errors
+
+
+class InsufficientStock(Exception):
+    """Raised when a batch would take items below zero; nothing is written."""
+
+    def __init__(self, ids):
+        super().__init__(f'{len(ids)} item(s) do not have enough stock.')
+        self.ids = ids
+
+
+def _legs(entry):
+    """(item id, signed delta) pairs a validated movement entry writes to the ledger."""
+    kind, quantity = entry['kind'], entry['quantity']
+    if kind == MovementKind.RECEIPT:
+        return [(entry['item'], quantity)]
+    if kind == MovementKind.TRANSFER:
+        return [(entry['item'], -quantity), (entry['to_item'], quantity)]
+    if kind == MovementKind.ISSUE:
+        return [(entry['item'], -quantity)]
+    return [(entry['item'], quantity)]    # adjustment: already signed
+
+
+def _check_references(entries):
+    item_ids = {e['item'] for e in entries} | {e['to_item'] for e in entries if e.get('to_item')}
+    items = set(
+        InventoryItem.objects.filter(id__in=item_ids).order_by().values_list('id', flat=True)
+    )
+    projects = set(
+        Project.objects.filter(id__in={e['project'] for e in entries if e.get('project')})
+        .order_by().values_list('id', flat=True)
+    )
+    errors = {}
+    for index, entry in enumerate(entries):
+        for field, known in (('item', items), ('to_item', items), ('project', projects)):
+            if entry.get(field) and entry[field] not in known:
+                errors.setdefault(index, {})[field] = [f'Unknown {field.replace("_", " ")}.']
+    if errors:
+        raise MovementError(errors)
+
+
+def apply_movements(entries, user=None):
+    """
+    Applies validated movements ({kind, item, quantity, project, to_item,
+    note}) as one all-or-nothing batch: the net delta per item is written
+    with a single UPDATE quantity = quantity + delta (guarded so stock never
+    goes negative), then the ledger rows are inserted with one bulk_create.
+    Raises MovementError / InsufficientStock. Returns the batch id, row count
+    and resulting quantities.
+    """
+    _check_references(entries)
+    batch, now = uuid.uuid4(), timezone.now()
+    rows, deltas = [], defaultdict(float)
+    for entry in entries:
+        for item_id, delta in _legs(entry):
+            deltas[item_id] += delta
+            rows.append(StockMovement(
+                item_id=item_id, kind=entry['kind'], delta=delta, project_id=entry.get('project'),
+                batch=batch, note=entry.get('note', ''), created_by=user, occurred_at=now,
+            ))
+
+    with transaction.atomic():
+        short = []
+        # Fixed lock order, so concurrent batches over the same items cannot deadlock.
+        for item_id in sorted(deltas, key=str):
+            delta = deltas[item_id]
+            qs = InventoryItem.objects.filter(pk=item_id)
+            if delta < 0:
+                qs = qs.filter(quantity__gte=-delta)
+            if not qs.update(quantity=F('quantity') + delta, updated_at=now):
+                short.append(item_id)
+        if short:
+            raise InsufficientStock(short)
+        StockMovement.objects.bulk_create(rows)
+    # QuerySet.update() bypasses the post_save hooks.
+    invalidate_tags('inventory')
+
+    balances = InventoryItem.objects.filter(pk__in=deltas).values_list('id', 'quantity')
+    return {
+        'batch': batch,
+        'movements': len(rows),
+        'items': [{'id': pk, 'quantity': quantity} for pk, quantity in balances],
+    }
+
+
+def set_counted_quantity(item, counted, user=None, note='Stock count'):
+    """
+    Sets an item's quantity to a physical count, recording the difference as
+    an adjustment. The row is locked for the read, so a concurrent movement
+    is never overwritten. Returns the adjustment delta.
+    """
+    with transaction.atomic():
+        current = (
+            InventoryItem.objects.select_for_update().filter(pk=item.pk)
+            .values_list('quantity', flat=True).get()
+        )
+        delta = counted - current
+        if delta:
+            InventoryItem.objects.filter(pk=item.pk).update(
+                quantity=F('quantity') + delta, updated_at=timezone.now()
+            )
+            StockMovement.objects.create(
+                item_id=item.pk, kind=MovementKind.ADJUSTMENT, delta=delta,
+                batch=uuid.uuid4(), note=note, created_by=user,
+            )
+    if delta:
+        invalidate_tags('inventory')
+    return delta
+
+
+def record_opening_balance(item, user=None):
+    """Ledger row for the quantity a new item is created with."""
+    if item.quantity:
+        StockMovement.objects.create(
+            item=item, kind=MovementKind.ADJUSTMENT, delta=item.quantity,
+            batch=uuid.uuid4(), note='Opening balance', created_by=user,
+        )
+
+
+def stock_at(moment, items=None):
+    """
+    `items` (all live items by default) annotated with `quantity_at`: the
+    latest snapshot at or before `moment` plus the ledger deltas after that
+    snapshot up to `moment`. Both lookups are index range scans, so the cost
+    is bounded by the movements since the last snapshot, not the full ledger.
+    """
+    items = InventoryItem.objects.all() if items is None else items
+    snapshot = StockSnapshot.objects.filter(
+        item=OuterRef('pk'), taken_at__lte=moment
+    ).order_by('-taken_at')
+    items = items.annotate(
+        snapshot_at=Subquery(snapshot.values('taken_at')[:1]),
+        snapshot_quantity=Subquery(snapshot.values('quantity')[:1]),
+    )
+    since = Coalesce(OuterRef('snapshot_at'), Value(EPOCH), output_field=DateTimeField())
+    moved = (
+        StockMovement.objects.filter(item=OuterRef('pk'), occurred_at__lte=moment)
+        .filter(occurred_at__gt=since)
+        .order_by().values('item').annotate(total=Sum('delta')).values('total')
+    )
+    return items.annotate(
+        quantity_at=Coalesce('snapshot_quantity', 0.0) + Coalesce(Subquery(moved), 0.0)
+    )
+
+
+def take_snapshots(taken_at):
+    """
+    Stores every item's quantity as of `taken_at` (items created after it
+    are skipped). Re-running for the same instant is a no-op. Returns the
+    number of items snapshotted.
+    """
+    rows = stock_at(taken_at, InventoryItem.all_objects.filter(created_at__lte=taken_at))
+    snapshots = [
+        StockSnapshot(item_id=pk, taken_at=taken_at, quantity=quantity)
+        for pk, quantity in rows.order_by().values_list('id', 'quantity_at')
+        .iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
+    ]
+    StockSnapshot.objects.bulk_create(
+        snapshots, batch_size=SNAPSHOT_BATCH_SIZE, ignore_conflicts=True
+    )
+    return len(snapshots)
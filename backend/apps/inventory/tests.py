@@ -1,3 +1,141 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Sum
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication.models import User, UserRole
+from apps.projects.models import Project
+from .models import InventoryItem, StockMovement, StockSnapshot
+from .services import stock_at, take_snapshots
+
+
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            email='sm@test.app', password='x', name='Manager', role=UserRole.SITE_MANAGER
+        )
+        self.project = Project.objects.create(name='Tower A', location='Dhaka')
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+        self.cement = self._create('Cement', 100)
+        self.site_cement = self._create('Cement (site)', 0)
+
+    def _create(self, name, quantity):
+        response = self.client.post('/api/inventory/', {'name': name, 'quantity': quantity})
+        return InventoryItem.objects.get(pk=response.data['data']['id'])
+
+    def _ledger_total(self, item):
+        return StockMovement.objects.filter(item=item).aggregate(t=Sum('delta'))['t'] or 0
+
+    def _move(self, *movements):
+        return self.client.post(
+            '/api/inventory/movements/', {'movements': list(movements)}, format='json'
+        )
+
+    def test_batch_applies_net_deltas_and_rejects_overdraw(self):
+        response = self._move(
+            {'kind': 'receipt', 'item': str(self.cement.id), 'quantity': 20},
+            {'kind': 'issue', 'item': str(self.cement.id), 'quantity': 30,
+             'project': str(self.project.id)},
+            {'kind': 'transfer', 'item': str(self.cement.id), 'quantity': 40,
+             'to_item': str(self.site_cement.id)},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['movements'], 4)
+        for item, expected in ((self.cement, 50), (self.site_cement, 40)):
+            item.refresh_from_db()
+            self.assertEqual((item.quantity, self._ledger_total(item)), (expected, expected))
+
+        before = StockMovement.objects.count()
+        response = self._move(
+            {'kind': 'receipt', 'item': str(self.site_cement.id), 'quantity': 5},
+            {'kind': 'issue', 'item': str(self.cement.id), 'quantity': 51,
+             'project': str(self.project.id)},
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['data']['ids'], [self.cement.id])
+        self.site_cement.refresh_from_db()
+        self.assertEqual((self.site_cement.quantity, StockMovement.objects.count()), (40, before))
+
+        response = self._move({'kind': 'issue', 'item': str(self.cement.id), 'quantity': 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('project', response.data['errors'][0])
+
+    def test_patch_quantity_is_recorded_as_adjustment(self):
+        response = self.client.patch(
+            f'/api/inventory/{self.cement.id}/', {'quantity': 92, 'location': 'Yard'}, format='json'
+        )
+        self.assertEqual(response.data['data']['quantity'], 92)
+        adjustment = StockMovement.objects.filter(item=self.cement).first()
+        self.assertEqual((adjustment.kind, adjustment.delta), ('adjustment', -8))
+        self.assertEqual(self._ledger_total(self.cement), 92)
+
+    def test_point_in_time_stock_from_snapshot_and_ledger(self):
+        now = timezone.now()
+        StockMovement.objects.update(occurred_at=now - timedelta(days=3))
+        InventoryItem.objects.update(created_at=now - timedelta(days=3))
+        self._move({'kind': 'receipt', 'item': str(self.cement.id), 'quantity': 10})
+        StockMovement.objects.filter(delta=10).update(occurred_at=now - timedelta(days=1))
+        self.assertEqual(take_snapshots(now - timedelta(days=2)), 2)
+        # Rewriting pre-snapshot history no longer changes later balances.
+        StockMovement.objects.filter(delta=100).update(delta=0)
+
+        balances = dict(stock_at(now).values_list('name', 'quantity_at'))
+        self.assertEqual(balances['Cement'], 110)
+        earlier = dict(stock_at(now - timedelta(days=2)).values_list('name', 'quantity_at'))
+        self.assertEqual(earlier['Cement'], 100)
+        self.assertEqual(StockSnapshot.objects.count(), 2)
+        response = self.client.get('/api/inventory/stock-at/', {'at': now.date().isoformat()})
+        self.assertEqual(
+            {row['name']: row['quantity_at'] for row in response.data['data']},
+            {'Cement': 110, 'Cement (site)': 0},
+        )
+        response = self.client.get(
+            '/api/inventory/stock-at/', {'at': now.date().isoformat(), 'project': 'tower-a'}
+        )
+        self.assertEqual((response.status_code, response.data['success']), (400, False))
+
+
+class InventoryValuationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email='a@test.app', password='x', name='Admin')
+        self.project = Project.objects.create(name='Tower A', location='Dhaka')
+        for name, category, quantity, price, location, project in [
+            ('Rebar', 'Steel', 10, '100.00', 'Yard', self.project),
+            ('Beams', 'Steel', 2, '1000.00', 'Yard', None),
+            ('Cement', 'Cement', 50, '10.00', '', self.project),
+        ]:
+            InventoryItem.objects.create(
+                name=name, category=category, quantity=quantity, unit_price=price,
+                location=location, project=project,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_summary_from_one_grouped_query(self):
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/inventory/summary/').data['data']
+        self.assertEqual(data['totals'], {'value': 3500.0, 'item_count': 3, 'low_stock_count': 2})
+        self.assertEqual(
+            [(e['label'], e['value'], e['low_stock_count']) for e in data['by_category']],
+            [('Steel', 3000.0, 2), ('Cement', 500.0, 0)],
+        )
+        self.assertEqual(
+            [(e['label'], e['item_count']) for e in data['by_project']],
+            [('Unassigned', 1), ('Tower A', 2)],
+        )
+        self.assertEqual([e['label'] for e in data['by_location']], ['Yard', 'Unspecified'])
 
-# Create your tests here.
+    def test_list_orders_and_filters_on_annotations(self):
+        response = self.client.get('/api/inventory/', {'ordering': '-total_value'})
+        self.assertEqual([i['name'] for i in response.data['data']], ['Beams', 'Rebar', 'Cement'])
+        response = self.client.get(
+            '/api/inventory/', {'low_stock': 'true', 'ordering': 'total_value', 'page_size': 1}
+        )
+        page = response.data
+        self.assertEqual((page['count'], page['results'][0]['name']), (2, 'Rebar'))
+        self.assertEqual(self.client.get('/api/inventory/', {'ordering': 'x'}).status_code, 400)
@@ -1,8 +1,15 @@
 from django.urls import path
-from .views import InventoryListCreateView, InventoryDetailView, LowStockView
+from .views import (
+    InventoryListCreateView, InventoryDetailView, LowStockView, StockMovementBulkView,
+    ItemMovementListView, StockAtView, InventorySummaryView,
+)
 
 urlpatterns = [
     path('', InventoryListCreateView.as_view(), name='inventory-list-create'),
     path('low-stock/', LowStockView.as_view(), name='inventory-low-stock'),
+    path('summary/', InventorySummaryView.as_view(), name='inventory-summary'),
+    path('movements/', StockMovementBulkView.as_view(), name='inventory-movements'),
+    path('stock-at/', StockAtView.as_view(), name='inventory-stock-at'),
     path('<uuid:pk>/', InventoryDetailView.as_view(), name='inventory-detail'),
+    path('<uuid:pk>/movements/', ItemMovementListView.as_view(), name='inventory-item-movements'),
 ]
@@ -1,20 +1,46 @@
 """
-Inventory views — CRUD and low-stock filter.
+Inventory views — CRUD, low-stock filter, valuation summary, stock movements
+and point-in-time stock.
 """
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
-from .models import InventoryItem
-from .serializers import InventoryItemSerializer
+from core.cache import cached_payload
+from core.pagination import KeysetPagination, StandardResultsPagination
+from .models import InventoryItem, StockMovement
+from .serializers import (
+    InventoryItemSerializer, StockMovementEntrySerializer, StockMovementSerializer,
+)
+from .services import (
+    MOVEMENTS_MAX, InsufficientStock, MovementError, apply_movements, inventory_summary,
+    low_stock_q, record_opening_balance, set_counted_quantity, stock_at, with_valuation,
+)
 
 
 class InventoryListCreateView(APIView):
+    """
+    GET /api/inventory/?project=&category=&low_stock=true&ordering=-total_value
+    Value and low-stock state are database annotations, so filtering and
+    sorting on them happen in SQL. Pass ?page= / ?page_size= for the
+    paginated envelope; without them the full list is returned as before.
+    """
     permission_classes = [IsAuthenticated]
+    # ?ordering= value → queryset ordering field
+    ORDERING_FIELDS = {
+        'name': 'name', 'quantity': 'quantity', 'unit_price': 'unit_price',
+        'total_value': 'stock_value', 'updated_at': 'updated_at',
+    }
 
     def get(self, request):
-        qs = InventoryItem.objects.select_related('project').all()
+        qs = with_valuation(InventoryItem.objects.select_related('project'))
         # Filter by project
         project_id = request.query_params.get('project')
         if project_id:
@@ -23,11 +49,24 @@ class InventoryListCreateView(APIView):
         category = request.query_params.get('category')
         if category:
             qs = qs.filter(category=category)
-        return Response({
-            'success': True,
-            'count': qs.count(),
-            'data': InventoryItemSerializer(qs, many=True).data,
-        })
+        low_stock = request.query_params.get('low_stock')
+        if low_stock in ('true', '1'):
+            qs = qs.filter(low_stock=True)
+        elif low_stock in ('false', '0'):
+            qs = qs.filter(low_stock=False)
+
+        ordering = request.query_params.get('ordering', 'name')
+        if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+            return Response({'success': False, 'message': 'Invalid ordering.'}, status=400)
+        field = self.ORDERING_FIELDS[ordering.lstrip('-')]
+        qs = qs.order_by(f'-{field}' if ordering.startswith('-') else field, 'id')
+
+        if {'page', 'page_size'} & request.query_params.keys():
+            paginator = StandardResultsPagination()
+            page = paginator.paginate_queryset(qs, request, view=self)
+            return paginator.get_paginated_response(InventoryItemSerializer(page, many=True).data)
+        data = InventoryItemSerializer(qs, many=True).data
+        return Response({'success': True, 'count': len(data), 'data': data})
 
     def post(self, request):
         if request.user.role not in ('admin', 'site_manager'):
@@ -37,7 +76,8 @@ class InventoryListCreateView(APIView):
             )
         serializer = InventoryItemSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            record_opening_balance(serializer.save(), request.user)
         return Response(
             {'success': True, 'data': serializer.data},
             status=status.HTTP_201_CREATED
@@ -67,8 +107,14 @@ class InventoryDetailView(APIView):
             return Response({'success': False, 'message': 'Not found.'}, status=404)
         serializer = InventoryItemSerializer(item, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response({'success': True, 'data': serializer.data})
+        # A new quantity is a stock count: recorded as an adjustment movement.
+        counted = serializer.validated_data.pop('quantity', None)
+        with transaction.atomic():
+            serializer.save()
+            if counted is not None:
+                set_counted_quantity(item, counted, request.user)
+                item.refresh_from_db(fields=['quantity', 'updated_at'])
+        return Response({'success': True, 'data': InventoryItemSerializer(item).data})
 
     def delete(self, request, pk):
         if request.user.role != 'admin':
@@ -85,12 +131,135 @@ class LowStockView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.db.models import F
-        qs = InventoryItem.objects.filter(
-            quantity__lte=F('low_stock_threshold')
-        )
+        qs = InventoryItem.objects.filter(low_stock_q())
         return Response({
             'success': True,
             'count': qs.count(),
             'data': InventoryItemSerializer(qs, many=True).data,
         })
+
+
+class InventorySummaryView(APIView):
+    """
+    GET /api/inventory/summary/
+    Total stock value, item count and low-stock count, overall and by
+    category / project / location, from one aggregate query (cached until
+    inventory or projects change).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        data = cached_payload(
+            'inventory.summary', 'any', inventory_summary, tags=('inventory', 'projects')
+        )
+        return Response({'success': True, 'data': data})
+
+
+class StockMovementBulkView(APIView):
+    """
+    POST /api/inventory/movements/
+    {"movements": [{"kind": "receipt" | "issue" | "transfer" | "adjustment",
+                    "item": <uuid>, "quantity": 10, "project": <uuid>,
+                    "to_item": <uuid>, "note": ""}, ...]}
+    Quantities are positive except for adjustments (signed). An issue names
+    the project; a transfer the destination item. The batch applies
+    atomically: any invalid entry (400) or item that would go below zero
+    (409) rejects the whole request.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role not in ('admin', 'site_manager'):
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        entries = request.data.get('movements') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response(
+                {'success': False, 'message': '"movements" must be a non-empty list.'}, status=400
+            )
+        if len(entries) > MOVEMENTS_MAX:
+            return Response(
+                {'success': False, 'message': f'At most {MOVEMENTS_MAX} movements per request.'},
+                status=400,
+            )
+
+        valid, errors = [], {}
+        for index, entry in enumerate(entries):
+            serializer = StockMovementEntrySerializer(data=entry)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                errors[index] = serializer.errors
+        try:
+            if errors:
+                raise MovementError(errors)
+            result = apply_movements(valid, request.user)
+        except MovementError as exc:
+            return Response(
+                {'success': False, 'message': str(exc), 'errors': exc.errors}, status=400
+            )
+        except InsufficientStock as exc:
+            return Response({
+                'success': False,
+                'message': str(exc),
+                'data': {'ids': exc.ids},
+            }, status=status.HTTP_409_CONFLICT)
+        return Response({'success': True, 'data': result}, status=status.HTTP_201_CREATED)
+
+
+class MovementPagination(KeysetPagination):
+    fields = ('-occurred_at', '-id')
+
+
+class ItemMovementListView(APIView):
+    """GET /api/inventory/<id>/movements/ — the item's ledger, newest first (keyset-paginated)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        qs = StockMovement.objects.filter(item_id=pk).select_related('project', 'created_by')
+        paginator = MovementPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return paginator.get_paginated_response(StockMovementSerializer(page, many=True).data)
+
+
+def _parse_moment(value):
+    """ISO datetime, or a date meaning the end of that day (local time)."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError
+        moment = datetime.combine(day + timedelta(days=1), time.min) - timedelta(microseconds=1)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+class StockAtView(APIView):
+    """
+    GET /api/inventory/stock-at/?at=YYYY-MM-DD[THH:MM][&project=][&category=]
+    Every item's quantity at a past moment: latest balance snapshot before it
+    plus the ledger movements since (see services.stock_at).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            moment = _parse_moment(request.query_params['at'])
+        except (KeyError, ValueError):
+            return Response({
+                'success': False,
+                'message': '"at" is required: YYYY-MM-DD or an ISO datetime.',
+            }, status=400)
+        qs = InventoryItem.objects.all()
+        if request.query_params.get('project'):
+            try:
+                project = uuid.UUID(request.query_params['project'])
+            except ValueError:
+                return Response(
+                    {'success': False, 'message': 'Invalid project id.'}, status=400
+                )
+            qs = qs.filter(project_id=project)
+        if request.query_params.get('category'):
+            qs = qs.filter(category=request.query_params['category'])
+        rows = stock_at(moment, qs.filter(created_at__lte=moment)).values(
+            'id', 'name', 'category', 'unit', 'quantity', 'quantity_at'
+        )
+        return Response({'success': True, 'at': moment, 'count': len(rows), 'data': list(rows)})
@@ -4,3 +4,8 @@ class PayrollConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.payroll'
     label = 'payroll'
+
+    def ready(self):
+        from core.cache import invalidate_on
+        from .models import PayrollRecord
+        invalidate_on(PayrollRecord, 'payroll')
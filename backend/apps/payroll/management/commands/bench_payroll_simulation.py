@@ -0,0 +1,75 @@
+"""
+management/commands/bench_payroll_simulation.py
+Run: python manage.py bench_payroll_simulation [--workers 50000] [--scenarios 100] [--projects 200]
+Times the vectorized payroll what-if engine on synthetic arrays (no DB).
+"""
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.payroll import simulation
+
+DESIGNATIONS = ['Mason', 'Electrician', 'Plumber', 'Carpenter', 'Welder', 'Helper', 'Foreman']
+
+
+def synthetic_workforce(workers, projects, seed=7):
+    rng = np.random.default_rng(seed)
+    # Each worker splits the month across one or two projects.
+    pair_worker = np.concatenate([np.arange(workers), np.arange(0, workers, 2)])
+    pair_days = rng.integers(1, 14, pair_worker.size).astype(float)
+    days = np.bincount(pair_worker, weights=pair_days, minlength=workers)
+    return {
+        'month': 1,
+        'year': 2026,
+        'rate': rng.uniform(400, 2500, workers).round(2),
+        'designation_idx': rng.integers(0, len(DESIGNATIONS), workers),
+        'designations': DESIGNATIONS,
+        'days': days,
+        'pair_worker': pair_worker,
+        'pair_project': rng.integers(0, projects, pair_worker.size),
+        'pair_share': pair_days / days[pair_worker],
+        'projects': [f'project-{i}' for i in range(projects)],
+    }
+
+
+def synthetic_scenarios(count, seed=11):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'raise_pct': float(rng.uniform(0, 10)),
+            'raises_by_designation': {DESIGNATIONS[i % len(DESIGNATIONS)]: 5.0},
+            'flat_bonus': float(rng.choice([0, 500, 1000])),
+            'deduction_pct': float(rng.uniform(0, 5)),
+            'deduction_flat': 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the vectorized payroll simulation engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=50000)
+        parser.add_argument('--scenarios', type=int, default=100)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--iterations', type=int, default=10)
+
+    def handle(self, *args, **options):
+        workforce = synthetic_workforce(options['workers'], options['projects'])
+        scenarios = synthetic_scenarios(options['scenarios'])
+
+        samples = []
+        for _ in range(options['iterations']):
+            started = time.perf_counter()
+            params = simulation.scenario_matrix(scenarios, workforce['designations'])
+            simulation.simulate(workforce, params)
+            samples.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(
+            f'{options["scenarios"]} scenarios × {options["workers"]} workers × '
+            f'{options["projects"]} projects · median of {options["iterations"]} runs'
+        )
+        self.stdout.write(self.style.SUCCESS(f'  simulate  {statistics.median(samples):8.2f} ms'))
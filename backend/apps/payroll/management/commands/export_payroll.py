@@ -0,0 +1,47 @@
+"""
+management/commands/export_payroll.py
+Run: python manage.py export_payroll [--from YYYY-MM] [--to YYYY-MM] [--format csv|ndjson]
+                                     [--status pending] [--output register.csv]
+Streams the payroll register to a file or stdout (current month by default).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.periods import month_window
+from core.streaming import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from apps.payroll.models import PayrollStatus
+from apps.payroll.services import REGISTER_COLUMNS, register_rows
+
+
+class Command(BaseCommand):
+    help = 'Exports the payroll register as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='from', help='First month (YYYY-MM)')
+        parser.add_argument('--to', dest='to', help='Last month (YYYY-MM)')
+        parser.add_argument('--format', dest='fmt', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--status', choices=PayrollStatus.values)
+        parser.add_argument('--output', help='File path (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            first, last = month_window(options, default_months=1, max_months=1200)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        rows = register_rows(first, last, options['status']).iterator(
+            chunk_size=options['chunk_size']
+        )
+        lines = export_lines(rows, REGISTER_COLUMNS, options['fmt'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        count = -1 if options['fmt'] == 'csv' else 0    # header line
+        with open(options['output'], 'w', newline='', encoding='utf-8') as fh:
+            for line in lines:
+                fh.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(
+            f'✅ Exported {count} payroll record(s) to {options["output"]}.'
+        ))
@@ -0,0 +1,40 @@
+"""
+management/commands/run_payroll.py
+Run: python manage.py run_payroll [--month M] [--year Y] [--chunk-size 2000]
+Generates the month's payroll records for every worker from attendance
+(daily_rate × present/late days). Defaults to the previous month.
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.periods import add_months
+from apps.payroll.services import RUN_CHUNK_SIZE, run_payroll
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generates monthly payroll records from attendance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=int)
+        parser.add_argument('--year', type=int)
+        parser.add_argument('--chunk-size', type=int, default=RUN_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        previous = add_months(date.today().replace(day=1), -1)
+        month = options['month'] or previous.month
+        year = options['year'] or previous.year
+        if not 1 <= month <= 12:
+            raise CommandError('--month must be between 1 and 12.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        started = time.perf_counter()
+        run = run_payroll(month, year, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Payroll {month}/{year}: {run.record_count} record(s) written, '
+            f'{run.skipped_count} already settled, total base {run.total_base_salary} '
+            f'({elapsed:.2f}s).'
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.13 on 2026-10-18 12:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_net_salary(apps, schema_editor):
+    PayrollRecord = apps.get_model('payroll', 'PayrollRecord')
+    PayrollRecord.objects.update(net_salary=F('base_salary') + F('bonus') - F('deductions'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0002_payrollrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payrollrecord',
+            name='net_salary',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.RunPython(backfill_net_salary, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='payrollrecord',
+            index=models.Index(fields=['year', 'month', 'net_salary'], name='payroll_period_net_idx'),
+        ),
+    ]
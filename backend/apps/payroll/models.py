@@ -1,8 +1,11 @@
 """
 Payroll app — Monthly payroll records per worker.
 """
+from decimal import Decimal
+
 from django.db import models
 from core.models import BaseModel
+from apps.authentication.models import User
 from apps.workforce.models import Worker
 
 
@@ -12,6 +15,38 @@ class PayrollStatus(models.TextChoices):
     CANCELLED = 'cancelled', 'Cancelled'
 
 
+class PayrollRunStatus(models.TextChoices):
+    RUNNING = 'running', 'Running'
+    COMPLETED = 'completed', 'Completed'
+    FAILED = 'failed', 'Failed'
+
+
+class PayrollRun(BaseModel):
+    """One bulk generation of a month's payroll records from attendance."""
+    month = models.PositiveSmallIntegerField()    # 1–12
+    year = models.PositiveSmallIntegerField()
+    status = models.CharField(
+        max_length=20, choices=PayrollRunStatus.choices, default=PayrollRunStatus.RUNNING
+    )
+    record_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    total_base_salary = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    started_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='payroll_runs'
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'Payroll run {self.month}/{self.year} ({self.status})'
+
+
+NET_SALARY_SOURCES = frozenset({'base_salary', 'bonus', 'deductions'})
+
+
 class PayrollRecord(BaseModel):
     """Monthly salary record for a worker."""
     worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name='payroll_records')
@@ -20,19 +55,37 @@ class PayrollRecord(BaseModel):
     base_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     bonus = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # base_salary + bonus - deductions, stored so it can be sorted, filtered and indexed.
+    # Kept in step by save(); bulk writes must set it or call
+    # services.refresh_net_salary().
+    net_salary = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
     status = models.CharField(
         max_length=20, choices=PayrollStatus.choices, default=PayrollStatus.PENDING
     )
     paid_at = models.DateTimeField(null=True, blank=True)
     notes = models.CharField(max_length=300, blank=True)
+    payroll_run = models.ForeignKey(
+        PayrollRun, on_delete=models.SET_NULL, null=True, blank=True, related_name='records'
+    )
 
     class Meta:
         unique_together = ('worker', 'month', 'year')
         ordering = ['-year', '-month']
+        indexes = [
+            models.Index(fields=['year', 'month', 'net_salary'], name='payroll_period_net_idx'),
+        ]
 
     def __str__(self):
         return f'{self.worker.name} — {self.month}/{self.year}'
 
-    @property
-    def net_salary(self):
-        return float(self.base_salary) + float(self.bonus) - float(self.deductions)
+    def save(self, *args, **kwargs):
+        self.net_salary = self.compute_net_salary()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and NET_SALARY_SOURCES.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'net_salary'}
+        super().save(*args, **kwargs)
+
+    def compute_net_salary(self):
+        return (
+            Decimal(self.base_salary or 0) + Decimal(self.bonus or 0) - Decimal(self.deductions or 0)
+        )
@@ -1,9 +1,9 @@
 from rest_framework import serializers
-from .models import PayrollRecord
+from .models import PayrollRecord, PayrollRun, PayrollStatus
 
 
 class PayrollRecordSerializer(serializers.ModelSerializer):
-    net_salary = serializers.ReadOnlyField()
+    net_salary = serializers.FloatField(read_only=True)
     worker_name = serializers.CharField(source='worker.name', read_only=True)
     worker_role = serializers.CharField(source='worker.designation', read_only=True)
     avatar_initial = serializers.SerializerMethodField()
@@ -13,9 +13,69 @@ class PayrollRecordSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'worker', 'worker_name', 'worker_role', 'avatar_initial',
             'month', 'year', 'base_salary', 'bonus', 'deductions',
-            'net_salary', 'status', 'paid_at', 'notes',
+            'net_salary', 'status', 'paid_at', 'notes', 'payroll_run',
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'payroll_run']
 
     def get_avatar_initial(self, obj):
         return obj.worker.name[0].upper() if obj.worker.name else 'W'
+
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    started_by_name = serializers.CharField(source='started_by.name', read_only=True, default=None)
+
+    class Meta:
+        model = PayrollRun
+        fields = [
+            'id', 'month', 'year', 'status', 'record_count', 'skipped_count',
+            'total_base_salary', 'started_by', 'started_by_name', 'created_at',
+            'finished_at', 'error',
+        ]
+        read_only_fields = fields
+
+
+class PayrollTransitionSerializer(serializers.Serializer):
+    """Target status plus either an explicit id list or a month/year filter."""
+    status = serializers.ChoiceField(choices=[PayrollStatus.PAID, PayrollStatus.CANCELLED])
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    project_id = serializers.UUIDField(required=False)
+    worker_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False
+    )
+
+    def validate(self, attrs):
+        if 'ids' not in attrs and not ('month' in attrs and 'year' in attrs):
+            raise serializers.ValidationError('Provide either ids or month and year.')
+        return attrs
+
+
+class ScenarioSerializer(serializers.Serializer):
+    """One what-if scenario; percentages are 0–100 based."""
+    name = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    raise_pct = serializers.FloatField(default=0, min_value=-100, max_value=1000)
+    raises_by_designation = serializers.DictField(
+        child=serializers.FloatField(min_value=-100, max_value=1000), default=dict
+    )
+    flat_bonus = serializers.FloatField(default=0, min_value=0)
+    deduction_pct = serializers.FloatField(default=0, min_value=0, max_value=100)
+    deduction_flat = serializers.FloatField(default=0, min_value=0)
+
+
+class PayrollSimulationSerializer(serializers.Serializer):
+    MAX_SCENARIOS = 200
+
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    scenarios = ScenarioSerializer(many=True, allow_empty=False)
+
+    def validate_scenarios(self, value):
+        if len(value) > self.MAX_SCENARIOS:
+            raise serializers.ValidationError(f'At most {self.MAX_SCENARIOS} scenarios.')
+        return value
+
+    def validate(self, attrs):
+        if ('month' in attrs) != ('year' in attrs):
+            raise serializers.ValidationError('Provide both month and year, or neither.')
+        return attrs
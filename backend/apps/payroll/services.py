@@ -0,0 +1,318 @@
+"""
+Payroll services — month totals, rankings and multi-month history computed in
+the database, bulk monthly payroll runs generated from attendance, and bulk
+status transitions.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.utils import timezone
+
+from core.cache import invalidate_tags
+from core.periods import add_months, iter_months
+from apps.workforce.models import Attendance, Worker
+from apps.workforce.services import PRESENT_STATUSES
+from .models import PayrollRecord, PayrollRun, PayrollRunStatus, PayrollStatus
+
+TOP_EARNERS = 5
+RUN_CHUNK_SIZE = 2000
+SETTLED_STATUSES = [PayrollStatus.PAID, PayrollStatus.CANCELLED]
+# Only these columns are overwritten when a worker already has a (pending) record for
+# the month; bonus / deductions / notes entered by hand are kept. Status is never
+# overwritten: settled records are filtered out before the upsert.
+RUN_UPDATE_FIELDS = ['base_salary', 'payroll_run', 'is_deleted', 'updated_at']
+
+HISTORY_GROUPS = {
+    'worker': ('worker', 'worker__user__name'),
+    'designation': ('worker__designation', 'worker__designation'),
+}
+HISTORY_AMOUNTS = ('base', 'bonus', 'deductions', 'net', 'paid', 'pending', 'cancelled')
+
+
+def _net_split():
+    return {
+        name: Sum('net_salary', filter=Q(status=value))
+        for name, value in (
+            ('paid', PayrollStatus.PAID),
+            ('pending', PayrollStatus.PENDING),
+            ('cancelled', PayrollStatus.CANCELLED),
+        )
+    }
+
+
+def month_totals(month, year):
+    """Total / paid / pending net payroll and distinct worker count in one query."""
+    agg = (
+        PayrollRecord.objects.filter(month=month, year=year)
+        .aggregate(
+            total=Sum('net_salary'),
+            paid=Sum('net_salary', filter=Q(status=PayrollStatus.PAID)),
+            worker_count=Count('worker', distinct=True),
+        )
+    )
+    total, paid = float(agg['total'] or 0), float(agg['paid'] or 0)
+    return {
+        'total_payroll': total,
+        'paid_amount': paid,
+        # The summary has always reported everything not yet paid as pending.
+        'pending_amount': total - paid,
+        'worker_count': agg['worker_count'],
+    }
+
+
+def top_earners(month, year, limit=TOP_EARNERS):
+    """Highest net salaries of the month (ORDER BY net DESC LIMIT n)."""
+    return (
+        PayrollRecord.objects.filter(month=month, year=year)
+        .select_related('worker__user')
+        .order_by('-net_salary', 'id')[:limit]
+    )
+
+
+def period_filter(first, last):
+    """Q selecting records whose (year, month) lies in the inclusive month range."""
+    after_first = Q(year__gt=first.year) | Q(year=first.year, month__gte=first.month)
+    before_last = Q(year__lt=last.year) | Q(year=last.year, month__lte=last.month)
+    return after_first & before_last
+
+
+def _empty_month(month_start):
+    return {'month': month_start.strftime('%Y-%m'), 'record_count': 0,
+            **{name: 0.0 for name in HISTORY_AMOUNTS}}
+
+
+def payroll_history(first, last, group_by=None):
+    """
+    Per-month base / bonus / deductions / net / paid / pending / cancelled for
+    the months [first, last] from one GROUP BY year, month query, gaps filled
+    with zeros.
+    Returns {'months': [...]}, or with `group_by` ('worker' | 'designation')
+    {'groups': [{'key', 'label', 'months': [...]}]} ordered by total net.
+    """
+    key_field, label_field = HISTORY_GROUPS[group_by] if group_by else (None, None)
+    columns = ['year', 'month'] + ([key_field, label_field] if group_by else [])
+    rows = (
+        PayrollRecord.objects.filter(period_filter(first, last))
+        .order_by().values(*dict.fromkeys(columns))
+        .annotate(
+            base=Sum('base_salary'), bonus=Sum('bonus'), deductions=Sum('deductions'),
+            net=Sum('net_salary'), **_net_split(), record_count=Count('id'),
+        )
+    )
+    months = list(iter_months(first, last))
+    index = {(m.year, m.month): i for i, m in enumerate(months)}
+    series, labels = {}, {}
+    for row in rows:
+        key = row[key_field] if group_by else None
+        if key not in series:
+            series[key] = [_empty_month(m) for m in months]
+            labels[key] = row[label_field] if group_by else None
+        entry = series[key][index[(row['year'], row['month'])]]
+        entry['record_count'] = row['record_count']
+        for name in HISTORY_AMOUNTS:
+            entry[name] = float(row[name] or 0)
+
+    if not group_by:
+        return {'months': series.get(None) or [_empty_month(m) for m in months]}
+    groups = [
+        {'key': str(key), 'label': labels[key], 'months': entries}
+        for key, entries in series.items()
+    ]
+    groups.sort(key=lambda g: -sum(m['net'] for m in g['months']))
+    return {'groups': groups}
+
+
+# Export header → values() key, in bank-upload column order.
+REGISTER_COLUMNS = {
+    'record_id': 'id',
+    'employee_id': 'worker__employee_id',
+    'worker_name': 'worker__user__name',
+    'designation': 'worker__designation',
+    'year': 'year',
+    'month': 'month',
+    'base_salary': 'base_salary',
+    'bonus': 'bonus',
+    'deductions': 'deductions',
+    'net_salary': 'net_salary',
+    'status': 'status',
+    'paid_at': 'paid_at',
+}
+
+
+def register_rows(first, last, status=None):
+    """
+    Flat payroll register rows for the months [first, last], as a values()
+    queryset ordered along payroll_period_net_idx so it streams without a sort.
+    Read it with .iterator(chunk_size=...).
+    """
+    qs = PayrollRecord.objects.filter(period_filter(first, last))
+    if status:
+        qs = qs.filter(status=status)
+    return qs.order_by('year', 'month', 'net_salary').values(*REGISTER_COLUMNS.values())
+
+
+def refresh_net_salary(queryset):
+    """Recomputes the stored net_salary in SQL for rows written by update() / bulk_create()."""
+    return queryset.update(net_salary=F('base_salary') + F('bonus') - F('deductions'))
+
+
+def worker_day_counts(month, year):
+    """(worker_id, daily_rate, present_days) for every active worker, one grouped query."""
+    first = date(year, month, 1)
+    present = Q(
+        attendances__date__gte=first,
+        attendances__date__lt=add_months(first, 1),
+        attendances__status__in=PRESENT_STATUSES,
+        attendances__is_deleted=False,
+    )
+    return (
+        Worker.objects.order_by()
+        .annotate(days=Count('attendances', filter=present))
+        .values_list('id', 'daily_rate', 'days')
+    )
+
+
+def _write_chunk(run, records):
+    """
+    Upserts one chunk atomically, leaving paid / cancelled records (soft-deleted
+    ones included) untouched. The month's existing rows for the chunk's workers
+    are locked first, so a status transition running alongside either commits
+    before the check or waits for this chunk. Returns (records written,
+    records skipped, total base salary written).
+    """
+    with transaction.atomic():
+        existing = (
+            PayrollRecord.all_objects.select_for_update()
+            .filter(month=run.month, year=run.year, worker_id__in=[r.worker_id for r in records])
+            .values_list('worker_id', 'status')
+        )
+        settled = {worker_id for worker_id, status in existing if status in SETTLED_STATUSES}
+        writable = [r for r in records if r.worker_id not in settled]
+        if writable:
+            PayrollRecord.objects.bulk_create(
+                writable,
+                update_conflicts=True,
+                unique_fields=['worker', 'month', 'year'],
+                update_fields=RUN_UPDATE_FIELDS,
+            )
+            # Updated rows keep their stored bonus / deductions, so net is derived in SQL.
+            refresh_net_salary(PayrollRecord.objects.filter(
+                payroll_run=run, worker_id__in=[r.worker_id for r in writable]
+            ))
+    return (
+        len(writable), len(records) - len(writable),
+        sum((r.base_salary for r in writable), Decimal('0')),
+    )
+
+
+def run_payroll(month, year, started_by=None, chunk_size=RUN_CHUNK_SIZE):
+    """
+    Generates (or regenerates) the month's records: base salary = daily_rate ×
+    present/late days. Records already paid or cancelled are left untouched;
+    that is checked per chunk at write time, so records settled while the run
+    is in progress are kept too. Each chunk is upserted in its own
+    transaction, so a failure keeps the chunks already written and marks the
+    run failed.
+    """
+    run = PayrollRun.objects.create(month=month, year=year, started_by=started_by)
+    outcomes, chunk = [], []
+    try:
+        for worker_id, daily_rate, days in worker_day_counts(month, year).iterator(chunk_size):
+            chunk.append(PayrollRecord(
+                worker_id=worker_id, month=month, year=year, base_salary=daily_rate * days,
+                status=PayrollStatus.PENDING, payroll_run=run, is_deleted=False,
+            ))
+            if len(chunk) >= chunk_size:
+                outcomes.append(_write_chunk(run, chunk))
+                chunk = []
+        if chunk:
+            outcomes.append(_write_chunk(run, chunk))
+    except Exception as exc:
+        run.status, run.error = PayrollRunStatus.FAILED, str(exc)
+        raise
+    else:
+        run.status = PayrollRunStatus.COMPLETED
+    finally:
+        run.record_count = sum(written for written, _, _ in outcomes)
+        run.skipped_count = sum(skipped for _, skipped, _ in outcomes)
+        run.total_base_salary = sum((amount for _, _, amount in outcomes), Decimal('0'))
+        run.finished_at = timezone.now()
+        run.save()
+        # bulk_create bypasses the post_save hooks.
+        if run.record_count:
+            invalidate_tags('payroll')
+    return run
+
+
+class TransitionConflict(Exception):
+    """Raised when explicitly listed records are missing or no longer pending."""
+
+    def __init__(self, ids):
+        super().__init__(f'{len(ids)} record(s) are not pending.')
+        self.ids = ids
+
+
+def transition_scope(ids=None, month=None, year=None, project_id=None, worker_ids=None):
+    """Records addressed by a transition request; every given criterion must match."""
+    qs = PayrollRecord.objects.all()
+    if ids:
+        qs = qs.filter(id__in=ids)
+    if month and year:
+        qs = qs.filter(month=month, year=year)
+    if worker_ids:
+        qs = qs.filter(worker_id__in=worker_ids)
+    if project_id:
+        # Workers who attended the project (in the month, when one is given).
+        attended = Attendance.objects.filter(worker=OuterRef('worker'), project_id=project_id)
+        if month and year:
+            first = date(year, month, 1)
+            attended = attended.filter(date__gte=first, date__lt=add_months(first, 1))
+        qs = qs.filter(Exists(attended))
+    return qs
+
+
+def transition_records(new_status, ids=None, **filters):
+    """
+    Moves pending records in scope to `new_status` with one UPDATE guarded by
+    status = 'pending', so concurrent calls never transition a record twice.
+    The rows this call changed are identified by the updated_at it wrote.
+    With an explicit id list the call is all-or-nothing: any id that is not
+    pending raises TransitionConflict and nothing is written.
+    """
+    scope = transition_scope(ids=ids, **filters)
+    marker = timezone.now()
+    changes = {'status': new_status, 'updated_at': marker}
+    if new_status == PayrollStatus.PAID:
+        changes['paid_at'] = marker
+
+    with transaction.atomic():
+        if ids:
+            pending = set(
+                scope.select_for_update().filter(status=PayrollStatus.PENDING)
+                .values_list('id', flat=True)
+            )
+            blocked = [pk for pk in dict.fromkeys(ids) if pk not in pending]
+            if blocked:
+                raise TransitionConflict(blocked)
+        updated = scope.filter(status=PayrollStatus.PENDING).update(**changes)
+        changed = scope.filter(status=new_status, updated_at=marker)
+        totals = changed.aggregate(
+            total=Sum('net_salary'), worker_count=Count('worker', distinct=True),
+        )
+        skipped = dict(
+            scope.exclude(pk__in=changed.values('pk'))
+            .order_by().values_list('status').annotate(n=Count('id'))
+        )
+
+    if updated:
+        # QuerySet.update() bypasses the post_save hooks.
+        invalidate_tags('payroll')
+    return {
+        'status': new_status,
+        'updated': updated,
+        'total_amount': float(totals['total'] or 0),
+        'worker_count': totals['worker_count'],
+        'skipped': skipped,
+    }
@@ -0,0 +1,183 @@
+"""
+Payroll simulation — vectorized what-if scenarios over the whole workforce.
+
+Worker rates, designations and the month's attendance-day counts are loaded
+once into NumPy arrays; every scenario (raises, bonuses, deduction rules) is
+then evaluated for all workers at once as a scenarios × workers matrix.
+Nothing is written: the output is totals and per-project labor cost, each
+with its delta against the unchanged baseline.
+"""
+from datetime import date
+
+import numpy as np
+from django.db.models import Count
+
+from core.periods import add_months
+from apps.projects.models import Project
+from apps.workforce.models import Attendance, Worker
+from apps.workforce.services import PRESENT_STATUSES
+
+UNASSIGNED = 'unassigned'
+# Scenario rows per block; bounds each scenarios × workers temporary (~10 MB at 50k workers).
+SCENARIO_BLOCK = 25
+
+
+def load_workforce(month, year):
+    """
+    Two queries → arrays: per-worker rate / designation code / paid days, and
+    per (worker, project) attendance days used to allocate labor cost.
+    """
+    workers = list(Worker.objects.order_by().values_list('id', 'designation', 'daily_rate'))
+    ids, designations, rates = zip(*workers) if workers else ((), (), ())
+    position = {pk: i for i, pk in enumerate(ids)}
+    labels, designation_idx = np.unique(np.array(designations, dtype=object), return_inverse=True)
+
+    first = date(year, month, 1)
+    pairs = [
+        (position[w], p, n) for w, p, n in Attendance.objects.filter(
+            date__gte=first, date__lt=add_months(first, 1), status__in=PRESENT_STATUSES,
+        ).order_by().values_list('worker', 'project').annotate(n=Count('id'))
+        if w in position
+    ]
+    pair_worker, pair_project, pair_days = zip(*pairs) if pairs else ((), (), ())
+    project_keys, pair_project_idx = np.unique(
+        np.array([str(p) if p else UNASSIGNED for p in pair_project], dtype=object),
+        return_inverse=True,
+    )
+    pair_worker = np.array(pair_worker, dtype=np.intp)
+    pair_days = np.array(pair_days, dtype=float)
+    days = np.bincount(pair_worker, weights=pair_days, minlength=len(ids))
+    return {
+        'month': month,
+        'year': year,
+        'rate': np.array(rates, dtype=float),
+        'designation_idx': designation_idx.astype(np.intp),
+        'designations': [str(d) for d in labels],
+        'days': days,
+        'pair_worker': pair_worker,
+        'pair_project': pair_project_idx.astype(np.intp),
+        # Fraction of each worker's paid days spent on the project.
+        'pair_share': pair_days / days[pair_worker] if pairs else pair_days,
+        'projects': list(project_keys),
+    }
+
+
+def scenario_matrix(scenarios, designations):
+    """Scenario parameters as arrays; row 0 is the unchanged baseline."""
+    n = len(scenarios) + 1
+    column = {d: i for i, d in enumerate(designations)}
+    raises = np.zeros((n, max(len(designations), 1)))
+    bonus, deduction_pct, deduction_flat = np.zeros(n), np.zeros(n), np.zeros(n)
+    for row, spec in enumerate(scenarios, start=1):
+        raises[row, :] = spec.get('raise_pct', 0)
+        for designation, pct in spec.get('raises_by_designation', {}).items():
+            if designation in column:
+                raises[row, column[designation]] += pct
+        bonus[row] = spec.get('flat_bonus', 0)
+        deduction_pct[row] = spec.get('deduction_pct', 0)
+        deduction_flat[row] = spec.get('deduction_flat', 0)
+    return {
+        'raises': raises, 'bonus': bonus,
+        'deduction_pct': deduction_pct, 'deduction_flat': deduction_flat,
+    }
+
+
+def _simulate_block(workforce, params, rows):
+    rate_days = workforce['rate'] * workforce['days']
+    paid = (workforce['days'] > 0).astype(float)
+
+    gross = 1.0 + params['raises'][rows][:, workforce['designation_idx']] / 100.0
+    gross *= rate_days
+    base = gross.sum(axis=1)
+    bonus = params['bonus'][rows, None] * paid
+    gross += bonus
+    deductions = gross * (params['deduction_pct'][rows, None] / 100.0)
+    deductions += params['deduction_flat'][rows, None] * paid
+    np.minimum(deductions, gross, out=deductions)
+    net = gross - deductions
+
+    # Labor per project: allocate each worker's net by attendance share, then
+    # sum per (scenario, project) with one bincount over flattened indices.
+    projects = len(workforce['projects'])
+    allocated = net[:, workforce['pair_worker']] * workforce['pair_share']
+    flat_index = np.arange(len(net))[:, None] * projects + workforce['pair_project']
+    labor = np.bincount(
+        flat_index.ravel(), weights=allocated.ravel(), minlength=len(net) * projects
+    ).reshape(len(net), projects)
+    return {
+        'base': base,
+        'bonus': bonus.sum(axis=1),
+        'deductions': deductions.sum(axis=1),
+        'net': net.sum(axis=1),
+        'labor': labor,
+    }
+
+
+def simulate(workforce, params):
+    """
+    Evaluates every scenario row for all workers. Raises are percentages on
+    the daily rate (global + per-designation, additive); bonus and flat
+    deduction apply to workers with at least one paid day; deduction_pct is
+    taken from gross pay. Net pay never goes below zero.
+    Returns per-scenario totals and a scenarios × projects labor matrix.
+    """
+    n = len(params['bonus'])
+    blocks = [
+        _simulate_block(workforce, params, slice(start, start + SCENARIO_BLOCK))
+        for start in range(0, n, SCENARIO_BLOCK)
+    ]
+    return {key: np.concatenate([b[key] for b in blocks]) for key in blocks[0]}
+
+
+def _money(value):
+    return round(float(value), 2)
+
+
+def simulation_report(workforce, scenarios, result):
+    """JSON payload: baseline, then each scenario with deltas against it."""
+    keys = workforce['projects']
+    names = {
+        str(pk): name for pk, name in
+        Project.all_objects.filter(id__in=[k for k in keys if k != UNASSIGNED])
+        .values_list('id', 'name')
+    }
+    names[UNASSIGNED] = 'Unassigned'
+
+    def totals(row):
+        return {name: _money(result[name][row]) for name in ('base', 'bonus', 'deductions', 'net')}
+
+    baseline_net = result['net'][0]
+    baseline_labor = result['labor'][0]
+    report = []
+    for row, spec in enumerate(scenarios, start=1):
+        delta = result['net'][row] - baseline_net
+        labor_delta = result['labor'][row] - baseline_labor
+        report.append({
+            'name': spec.get('name') or f'Scenario {row}',
+            **totals(row),
+            'delta_net': _money(delta),
+            'delta_pct': round(float(delta / baseline_net * 100), 2) if baseline_net else None,
+            'projects': [
+                {
+                    'project_id': key, 'project_name': names.get(key, ''),
+                    'labor_cost': _money(result['labor'][row][i]),
+                    'delta': _money(labor_delta[i]),
+                }
+                for i, key in enumerate(keys)
+            ],
+        })
+    return {
+        'month': workforce['month'],
+        'year': workforce['year'],
+        'worker_count': int(workforce['rate'].size),
+        'paid_worker_count': int((workforce['days'] > 0).sum()),
+        'baseline': {
+            **totals(0),
+            'projects': [
+                {'project_id': key, 'project_name': names.get(key, ''),
+                 'labor_cost': _money(baseline_labor[i])}
+                for i, key in enumerate(keys)
+            ],
+        },
+        'scenarios': report,
+    }
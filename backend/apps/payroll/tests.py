@@ -1,3 +1,268 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.authentication.models import User, UserRole
+from apps.projects.models import Project
+from apps.workforce.models import Attendance, AttendanceStatus, Worker
+from .models import PayrollRecord, PayrollRunStatus, PayrollStatus
+from .services import (
+    month_totals, payroll_history, run_payroll, top_earners, transition_records,
+    worker_day_counts,
+)
+
+
+class PayrollSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(7):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            worker = Worker.objects.create(user=user, employee_id=f'E{i}', designation='Mason')
+            PayrollRecord.objects.create(
+                worker=worker, month=3, year=2026, base_salary=1000 * (i + 1), bonus=100,
+                deductions=50, status=PayrollStatus.PAID if i % 2 else PayrollStatus.PENDING,
+            )
+
+    def test_totals_and_top_earners_in_sql(self):
+        with self.assertNumQueries(1):
+            totals = month_totals(3, 2026)
+        self.assertEqual(totals['total_payroll'], 28000 + 7 * 50)
+        self.assertEqual(totals['paid_amount'], 2050 + 4050 + 6050)
+        self.assertEqual(totals['pending_amount'], 28350 - 12150)
+        self.assertEqual(totals['worker_count'], 7)
+
+        with self.assertNumQueries(1):
+            top = [r.net_salary for r in top_earners(3, 2026)]
+        self.assertEqual(top, [7050.0, 6050.0, 5050.0, 4050.0, 3050.0])
+
+    def test_summary_endpoint(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        data = client.get('/api/payroll/summary/?month=3&year=2026').data['data']
+        self.assertEqual(data['total_payroll'], 28350.0)
+        self.assertEqual(len(data['top_earners']), 5)
+        self.assertEqual(data['top_earners'][0]['worker_name'], 'W6')
+        self.assertEqual(data['monthly_trend'], [0.0] * 6)
+        for query in ('month=13', 'month=0', 'month=march', 'year=20x6'):
+            response = client.get(f'/api/payroll/summary/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertFalse(response.data['success'])
+
+        history = client.get('/api/payroll/history/?from=2026-01&to=2026-03&group_by=designation')
+        self.assertEqual(history.data['data']['groups'][0]['label'], 'Mason')
+        self.assertEqual(client.get('/api/payroll/history/?group_by=site').status_code, 400)
+
+    def test_history_is_one_grouped_query(self):
+        worker = Worker.objects.get(employee_id='E0')
+        PayrollRecord.objects.create(worker=worker, month=1, year=2026, base_salary=300, bonus=20)
+        PayrollRecord.objects.filter(worker=worker, month=3).update(status=PayrollStatus.CANCELLED)
+        with self.assertNumQueries(1):
+            months = payroll_history(date(2025, 12, 1), date(2026, 3, 1))['months']
+        self.assertEqual([m['month'] for m in months], ['2025-12', '2026-01', '2026-02', '2026-03'])
+        self.assertEqual([m['net'] for m in months], [0.0, 320.0, 0.0, 28350.0])
+        # W0's cancelled record (1050) is reported on its own, not as pending.
+        self.assertEqual(
+            (months[3]['paid'], months[3]['pending'], months[3]['cancelled']),
+            (12150.0, 28350.0 - 12150 - 1050, 1050.0),
+        )
+        self.assertEqual(months[3]['deductions'], 350.0)
+
+        with self.assertNumQueries(1):
+            groups = payroll_history(date(2026, 1, 1), date(2026, 3, 1), 'worker')['groups']
+        self.assertEqual(len(groups), 7)
+        self.assertEqual(groups[0]['label'], 'W6')
+        self.assertEqual(groups[-1]['months'][0]['net'], 320.0)
+
+    def test_register_export_streams_csv_and_ndjson(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get('/api/payroll/export/?from=2026-03&to=2026-03')
+        self.assertTrue(response.streaming)
+        self.assertIn('payroll-2026-03.csv', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 8)
+        self.assertTrue(lines[0].startswith('record_id,employee_id,worker_name'))
+        self.assertIn(',E0,W0,Mason,2026,3,1000.00,100.00,50.00,1050.00,pending,', lines[1])
+
+        response = client.get('/api/payroll/export/?from=2026-03&output=ndjson&status=paid')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([r['net_salary'] for r in rows], [2050.0, 4050.0, 6050.0])
+        self.assertEqual(client.get('/api/payroll/export/?output=xml').status_code, 400)
+
+    def test_net_salary_column_sorting_and_range(self):
+        record = PayrollRecord.objects.get(worker__employee_id='E0')
+        record.deductions = 1050
+        record.save(update_fields=['deductions'])
+        record.refresh_from_db()
+        self.assertEqual(float(record.net_salary), 50.0)
+
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        rows = client.get(
+            '/api/payroll/workers/?month=3&year=2026&ordering=net_salary&min_net=40&max_net=4050'
+        ).data['data']
+        self.assertEqual([r['net_salary'] for r in rows], [50.0, 2050.0, 3050.0, 4050.0])
+        self.assertEqual(
+            client.get('/api/payroll/workers/?month=3&year=2026&min_net=abc').status_code, 400
+        )
+
+
+class PayrollRunTests(TestCase):
+    def setUp(self):
+        self.workers = []
+        for i in range(3):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            worker = Worker.objects.create(
+                user=user, employee_id=f'E{i}', designation='Mason', daily_rate=100
+            )
+            self.workers.append(worker)
+            for day, att_status in ((1, AttendanceStatus.PRESENT), (2, AttendanceStatus.LATE),
+                                    (3, AttendanceStatus.ABSENT)):
+                Attendance.objects.create(worker=worker, date=date(2026, 3, day), status=att_status)
+
+    def test_run_upserts_and_keeps_settled_records(self):
+        PayrollRecord.objects.create(
+            worker=self.workers[0], month=3, year=2026, base_salary=1, status=PayrollStatus.PAID
+        )
+        PayrollRecord.objects.create(worker=self.workers[1], month=3, year=2026, bonus=50)
+
+        run = run_payroll(3, 2026, chunk_size=1)
+        self.assertEqual(run.status, PayrollRunStatus.COMPLETED)
+        self.assertEqual((run.record_count, run.skipped_count), (2, 1))
+        self.assertEqual(float(run.total_base_salary), 400.0)
+
+        records = {r.worker_id: r for r in PayrollRecord.objects.filter(month=3, year=2026)}
+        self.assertEqual(len(records), 3)
+        self.assertEqual(float(records[self.workers[0].id].base_salary), 1.0)
+        self.assertEqual(records[self.workers[1].id].net_salary, 250.0)
+        self.assertEqual(records[self.workers[2].id].payroll_run_id, run.id)
+
+        # Re-running is idempotent.
+        self.assertEqual(run_payroll(3, 2026).record_count, 2)
+        self.assertEqual(PayrollRecord.objects.filter(month=3, year=2026).count(), 3)
+
+    def test_records_settled_during_the_run_or_soft_deleted_are_kept(self):
+        pending = PayrollRecord.objects.create(worker=self.workers[1], month=3, year=2026)
+        cancelled = PayrollRecord.objects.create(
+            worker=self.workers[2], month=3, year=2026, base_salary=7,
+            status=PayrollStatus.CANCELLED,
+        )
+        cancelled.soft_delete()
+        rows = list(worker_day_counts(3, 2026).order_by('employee_id'))
+
+        class Rows:
+            def iterator(self, chunk_size):
+                yield rows[0]
+                # Paid through the transition endpoint while the run is in progress.
+                transition_records(PayrollStatus.PAID, ids=[pending.id])
+                yield from rows[1:]
+
+        with patch('apps.payroll.services.worker_day_counts', return_value=Rows()):
+            run = run_payroll(3, 2026, chunk_size=1)
+        self.assertEqual((run.record_count, run.skipped_count), (1, 2))
+        pending.refresh_from_db()
+        self.assertEqual((pending.status, float(pending.base_salary)), ('paid', 0.0))
+        cancelled = PayrollRecord.all_objects.get(pk=cancelled.pk)
+        self.assertEqual((cancelled.is_deleted, cancelled.status), (True, 'cancelled'))
+
+
+class PayrollTransitionTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.records = []
+        for i in range(4):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            worker = Worker.objects.create(user=user, employee_id=f'E{i}', designation='Mason')
+            self.records.append(PayrollRecord.objects.create(
+                worker=worker, month=3, year=2026, base_salary=100 * (i + 1),
+            ))
+        self.records[3].status = PayrollStatus.CANCELLED
+        self.records[3].save()
+
+    def post(self, **body):
+        return self.client.post('/api/payroll/transition/', body, format='json')
+
+    def test_filter_mode_marks_pending_paid_and_reports_skipped(self):
+        response = self.post(status='paid', month=3, year=2026)
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual((data['updated'], data['total_amount']), (3, 600.0))
+        self.assertEqual(data['skipped'], {'cancelled': 1})
+        self.assertFalse(PayrollRecord.objects.filter(status='paid', paid_at__isnull=True).exists())
+
+        again = self.post(status='paid', month=3, year=2026).data['data']
+        self.assertEqual(again['updated'], 0)
+        self.assertEqual(again['skipped'], {'paid': 3, 'cancelled': 1})
+
+    def test_id_mode_is_all_or_nothing(self):
+        ids = [str(r.id) for r in self.records[2:]]
+        response = self.post(status='paid', ids=ids)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([str(pk) for pk in response.data['data']['ids']], ids[1:])
+        self.assertEqual(PayrollRecord.objects.filter(status='paid').count(), 0)
+
+        response = self.post(status='cancelled', ids=ids[:1])
+        self.assertEqual(response.data['data']['updated'], 1)
+        self.assertEqual(self.post(status='pending', ids=ids[:1]).status_code, 400)
+        self.assertEqual(self.post(status='paid').status_code, 400)
+
+
+class PayrollSimulationTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.project = Project.objects.create(name='Tower', location='Dhaka')
+        for i, (designation, rate) in enumerate((('Mason', 100), ('Helper', 50))):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            worker = Worker.objects.create(
+                user=user, employee_id=f'E{i}', designation=designation, daily_rate=rate
+            )
+            for day in range(1, 5):
+                Attendance.objects.create(
+                    worker=worker, date=date(2026, 3, day),
+                    project=self.project if day <= 2 or i == 0 else None,
+                )
+
+    def test_scenarios_are_evaluated_without_writes(self):
+        body = {'month': 3, 'year': 2026, 'scenarios': [
+            {'name': 'Masons +10%', 'raises_by_designation': {'Mason': 10}},
+            {'flat_bonus': 100, 'deduction_pct': 50},
+        ]}
+        with self.assertNumQueries(3):
+            response = self.client.post('/api/payroll/simulate/', body, format='json')
+        data = response.data['data']
+        self.assertEqual(data['baseline']['net'], 600.0)
+        masons, bonus = data['scenarios']
+        self.assertEqual((masons['net'], masons['delta_net']), (640.0, 40.0))
+        self.assertEqual(bonus['name'], 'Scenario 2')
+        self.assertEqual((bonus['bonus'], bonus['net']), (200.0, 400.0))
+
+        projects = {p['project_name']: p for p in masons['projects']}
+        self.assertEqual(projects['Tower']['labor_cost'], 540.0)
+        self.assertEqual(projects['Unassigned']['delta'], 0.0)
+        self.assertFalse(PayrollRecord.objects.exists())
 
-# Create your tests here.
+        self.assertEqual(
+            self.client.post('/api/payroll/simulate/', {'scenarios': []}, format='json').status_code,
+            400,
+        )
@@ -1,9 +1,17 @@
 from django.urls import path
-from .views import PayrollSummaryView, PayrollWorkerListView, PayrollCreateUpdateView
+from .views import (
+    PayrollSummaryView, PayrollWorkerListView, PayrollCreateUpdateView, PayrollRunView,
+    PayrollTransitionView, PayrollHistoryView, PayrollExportView, PayrollSimulationView,
+)
 
 urlpatterns = [
     path('summary/', PayrollSummaryView.as_view(), name='payroll-summary'),
+    path('history/', PayrollHistoryView.as_view(), name='payroll-history'),
+    path('export/', PayrollExportView.as_view(), name='payroll-export'),
     path('workers/', PayrollWorkerListView.as_view(), name='payroll-workers'),
+    path('simulate/', PayrollSimulationView.as_view(), name='payroll-simulate'),
+    path('transition/', PayrollTransitionView.as_view(), name='payroll-transition'),
+    path('runs/', PayrollRunView.as_view(), name='payroll-runs'),
     path('', PayrollCreateUpdateView.as_view(), name='payroll-create'),
     path('<uuid:pk>/', PayrollCreateUpdateView.as_view(), name='payroll-update'),
 ]
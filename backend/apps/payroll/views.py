@@ -1,16 +1,30 @@
 """
-Payroll views — monthly summary and per-worker records.
+Payroll views — monthly summary and history, per-worker records, register
+export, what-if simulation, bulk payroll runs and bulk status transitions.
 """
 from datetime import date
+from decimal import Decimal, InvalidOperation
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from django.db.models import Sum, Count
 
-from .models import PayrollRecord, PayrollStatus
-from .serializers import PayrollRecordSerializer
-from apps.workforce.models import Worker
+from core.cache import cached_payload
+from core.periods import add_months, month_window, parse_month_year
+from core.streaming import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, streaming_export
+from .models import PayrollRecord, PayrollRun, PayrollStatus
+from .serializers import (
+    PayrollRecordSerializer, PayrollRunSerializer, PayrollSimulationSerializer,
+    PayrollTransitionSerializer,
+)
+from . import simulation
+from .services import (
+    HISTORY_GROUPS, REGISTER_COLUMNS, TransitionConflict, month_totals, payroll_history,
+    register_rows, run_payroll, top_earners, transition_records,
+)
+
+TREND_MONTHS = 6
+MAX_HISTORY_MONTHS = 120
 
 
 class PayrollSummaryView(APIView):
@@ -21,67 +35,132 @@ class PayrollSummaryView(APIView):
         if request.user.role not in ('admin', 'site_manager'):
             return Response({'success': False, 'message': 'Permission denied.'}, status=403)
 
-        today = date.today()
-        month = int(request.query_params.get('month', today.month))
-        year = int(request.query_params.get('year', today.year))
+        try:
+            month, year = parse_month_year(request.query_params, date.today())
+        except ValueError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=400)
 
-        qs = PayrollRecord.objects.filter(month=month, year=year)
-        agg = qs.aggregate(
-            total_payroll=Sum('base_salary') + Sum('bonus') - Sum('deductions'),
-            paid=Sum('base_salary', filter=qs.filter(status='paid').query),
-        )
+        totals = month_totals(month, year)
 
-        # Totals
-        records = list(qs.select_related('worker__user'))
-        total = sum(r.net_salary for r in records)
-        paid = sum(r.net_salary for r in records if r.status == PayrollStatus.PAID)
-        pending = total - paid
-        worker_count = qs.values('worker').count()
-
-        # Monthly trend (last 6 months)
-        monthly_trend = []
-        m, y = month, year
-        for _ in range(6):
-            m -= 1
-            if m == 0:
-                m = 12
-                y -= 1
-            s = PayrollRecord.objects.filter(month=m, year=y).aggregate(
-                t=Sum('base_salary')
-            )['t'] or 0
-            monthly_trend.insert(0, float(s))
-
-        # Top earners
-        top = sorted(records, key=lambda r: r.net_salary, reverse=True)[:5]
+        # Net payroll of the 6 months before the requested one
+        current = date(year, month, 1)
+        history = payroll_history(add_months(current, -TREND_MONTHS), add_months(current, -1))
+        monthly_trend = [entry['net'] for entry in history['months']]
 
         return Response({
             'success': True,
             'data': {
                 'month': month,
                 'year': year,
-                'total_payroll': total,
-                'paid_amount': paid,
-                'pending_amount': pending,
-                'worker_count': worker_count,
+                **totals,
                 'monthly_trend': monthly_trend,
-                'top_earners': PayrollRecordSerializer(top, many=True).data,
+                'top_earners': PayrollRecordSerializer(top_earners(month, year), many=True).data,
             }
         })
 
 
+class PayrollHistoryView(APIView):
+    """
+    GET /api/payroll/history/?from=YYYY-MM&to=YYYY-MM[&group_by=worker|designation]
+    Monthly base / bonus / deductions / net / paid / pending / cancelled
+    (last 12 months by default).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role not in ('admin', 'site_manager'):
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        try:
+            first, last = month_window(
+                request.query_params, default_months=12, max_months=MAX_HISTORY_MONTHS
+            )
+        except ValueError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=400)
+        group_by = request.query_params.get('group_by') or None
+        if group_by and group_by not in HISTORY_GROUPS:
+            return Response(
+                {'success': False, 'message': 'group_by must be "worker" or "designation".'},
+                status=400,
+            )
+
+        data = cached_payload(
+            'payroll.history', request.user.role,
+            lambda: {
+                'from': first.strftime('%Y-%m'), 'to': last.strftime('%Y-%m'),
+                'group_by': group_by, **payroll_history(first, last, group_by),
+            },
+            scope={'from': first, 'to': last, 'group_by': group_by},
+            tags=('payroll', 'workers'),
+        )
+        return Response({'success': True, 'data': data})
+
+
+class PayrollExportView(APIView):
+    """
+    GET /api/payroll/export/?from=YYYY-MM&to=YYYY-MM[&output=csv|ndjson][&status=pending]
+    Streams the payroll register (current month by default). `output` rather
+    than `format`, which DRF reserves for renderer selection. Admin only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        try:
+            first, last = month_window(
+                request.query_params, default_months=1, max_months=MAX_HISTORY_MONTHS
+            )
+        except ValueError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=400)
+        fmt = request.query_params.get('output', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return Response(
+                {'success': False, 'message': 'output must be "csv" or "ndjson".'}, status=400
+            )
+        record_status = request.query_params.get('status')
+        if record_status and record_status not in PayrollStatus.values:
+            return Response({'success': False, 'message': 'Invalid status.'}, status=400)
+
+        rows = register_rows(first, last, record_status).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        filename = f'payroll-{first:%Y-%m}' + (f'-to-{last:%Y-%m}' if last != first else '')
+        return streaming_export(rows, REGISTER_COLUMNS, fmt, filename)
+
+
 class PayrollWorkerListView(APIView):
-    """GET /api/payroll/workers/?month=M&year=Y"""
+    """
+    GET /api/payroll/workers/?month=M&year=Y&ordering=-net_salary&min_net=&max_net=
+    Sorting and net-pay range filters run on the indexed net_salary column.
+    """
     permission_classes = [IsAuthenticated]
+    ORDERING_FIELDS = ('net_salary', 'base_salary', 'bonus', 'deductions')
 
     def get(self, request):
         if request.user.role not in ('admin', 'site_manager'):
             return Response({'success': False, 'message': 'Permission denied.'}, status=403)
-        today = date.today()
-        month = int(request.query_params.get('month', today.month))
-        year = int(request.query_params.get('year', today.year))
+        try:
+            month, year = parse_month_year(request.query_params, date.today())
+        except ValueError as exc:
+            return Response({'success': False, 'message': str(exc)}, status=400)
+
+        ordering = request.query_params.get('ordering', '-net_salary')
+        if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+            return Response({'success': False, 'message': 'Invalid ordering.'}, status=400)
+        try:
+            bounds = {
+                lookup: Decimal(request.query_params[param])
+                for param, lookup in (('min_net', 'net_salary__gte'), ('max_net', 'net_salary__lte'))
+                if request.query_params.get(param)
+            }
+            if not all(value.is_finite() for value in bounds.values()):
+                raise InvalidOperation
+        except InvalidOperation:
+            return Response(
+                {'success': False, 'message': 'min_net / max_net must be numbers.'}, status=400
+            )
+
         qs = PayrollRecord.objects.filter(
-            month=month, year=year
-        ).select_related('worker__user').order_by('-base_salary')
+            month=month, year=year, **bounds
+        ).select_related('worker__user').order_by(ordering, 'id')
         return Response({
             'success': True,
             'data': PayrollRecordSerializer(qs, many=True).data,
@@ -114,3 +193,94 @@ class PayrollCreateUpdateView(APIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response({'success': True, 'data': serializer.data})
+
+
+class PayrollRunView(APIView):
+    """
+    GET  /api/payroll/runs/ — recent runs
+    POST /api/payroll/runs/ {"month": M, "year": Y} — generate the month's records
+    from attendance (daily_rate × present/late days). Admin only.
+    """
+    permission_classes = [IsAuthenticated]
+    RECENT_RUNS = 20
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        runs = PayrollRun.objects.select_related('started_by')[:self.RECENT_RUNS]
+        return Response({'success': True, 'data': PayrollRunSerializer(runs, many=True).data})
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        try:
+            month = int(request.data.get('month'))
+            year = int(request.data.get('year'))
+        except (TypeError, ValueError):
+            return Response(
+                {'success': False, 'message': 'month and year are required integers.'}, status=400
+            )
+        if not 1 <= month <= 12 or not 2000 <= year <= 2100:
+            return Response({'success': False, 'message': 'Invalid month or year.'}, status=400)
+
+        run = run_payroll(month, year, started_by=request.user)
+        return Response(
+            {'success': True, 'data': PayrollRunSerializer(run).data},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class PayrollTransitionView(APIView):
+    """
+    POST /api/payroll/transition/
+    {"status": "paid" | "cancelled", "ids": [...]}  — all listed records must be pending (else 409)
+    {"status": "paid", "month": M, "year": Y, "project_id": ..., "worker_ids": [...]}
+        — every pending record in scope; the others are reported under "skipped"
+    Admin only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        serializer = PayrollTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        try:
+            result = transition_records(params.pop('status'), **params)
+        except TransitionConflict as exc:
+            return Response({
+                'success': False,
+                'message': str(exc),
+                'data': {'ids': exc.ids},
+            }, status=status.HTTP_409_CONFLICT)
+        return Response({'success': True, 'data': result})
+
+
+class PayrollSimulationView(APIView):
+    """
+    POST /api/payroll/simulate/
+    {"month": M, "year": Y, "scenarios": [{"name": "...", "raise_pct": 5,
+      "raises_by_designation": {"Mason": 10}, "flat_bonus": 500,
+      "deduction_pct": 2, "deduction_flat": 0}, ...]}
+    Projects the month's payroll (previous month by default) under each
+    scenario from attendance; nothing is written. Admin only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'success': False, 'message': 'Permission denied.'}, status=403)
+        serializer = PayrollSimulationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        previous = add_months(date.today().replace(day=1), -1)
+        month, year = params.get('month', previous.month), params.get('year', previous.year)
+
+        workforce = simulation.load_workforce(month, year)
+        matrix = simulation.scenario_matrix(params['scenarios'], workforce['designations'])
+        result = simulation.simulate(workforce, matrix)
+        return Response({
+            'success': True,
+            'data': simulation.simulation_report(workforce, params['scenarios'], result),
+        })
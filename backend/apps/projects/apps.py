@@ -4,3 +4,8 @@ class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.projects'
     label = 'projects'
+
+    def ready(self):
+        from core.cache import invalidate_on
+        from .models import Project
+        invalidate_on(Project, 'projects')
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.13 on 2026-10-18 11:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_sitemanagerprofile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_at'], name='project_created_at_idx'),
+        ),
+    ]
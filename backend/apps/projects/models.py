@@ -51,6 +51,9 @@ class Project(BaseModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='project_created_at_idx'),
+        ]
 
     def __str__(self):
         return self.name
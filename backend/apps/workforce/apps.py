@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, pre_delete
 
 class WorkforceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.workforce'
     label = 'workforce'
+
+    def ready(self):
+        from core.cache import invalidate_on
+        from apps.projects.models import Project
+        from .models import Worker, Attendance
+        from .services import (
+            attendance_calendar_tags, rebuild_project_rollup_dates, remember_project_rollup_dates,
+        )
+        invalidate_on(Worker, 'workers')
+        invalidate_on(Attendance, 'attendance', attendance_calendar_tags)
+        # Attendance.project is SET_NULL; the rollup follows its rows to the NULL project.
+        uid = 'attendance-rollup:project-delete'
+        pre_delete.connect(remember_project_rollup_dates, sender=Project, dispatch_uid=uid)
+        post_delete.connect(rebuild_project_rollup_dates, sender=Project, dispatch_uid=uid)
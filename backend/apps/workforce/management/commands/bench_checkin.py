@@ -0,0 +1,98 @@
+"""
+management/commands/bench_checkin.py
+Run: python manage.py bench_checkin [--workers 2000] [--clients 16] [--keep]
+Simulates the morning rush: --clients threads POST to the check-in endpoint
+(full DRF stack, forced auth) for --workers synthetic workers, each checking
+in once, and reports sustained check-ins/sec with latency percentiles.
+Synthetic users are removed afterwards unless --keep. Use Postgres for real
+numbers; SQLite serialises every writer.
+"""
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from apps.authentication.models import User
+from apps.workforce.models import Worker
+from apps.workforce.services import rebuild_attendance_rollup
+
+EMAIL_DOMAIN = '@bench-checkin.invalid'
+URL = '/api/workforce/attendance/checkin/'
+
+
+def _create_workers(count):
+    tag = uuid.uuid4().hex[:6]
+    users = [
+        User(email=f'w{i}-{tag}{EMAIL_DOMAIN}', name=f'Bench Worker {i}', password='!')
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=1000)
+    Worker.objects.bulk_create([
+        Worker(user=user, employee_id=f'B{tag}{i}', designation='Helper')
+        for i, user in enumerate(users)
+    ], batch_size=1000)
+    return users
+
+
+class Command(BaseCommand):
+    help = 'Load-tests concurrent worker check-ins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2000)
+        parser.add_argument('--clients', type=int, default=16)
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic workers')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['clients'] < 1:
+            raise CommandError('--workers and --clients must be positive.')
+        users = _create_workers(options['workers'])
+        local = threading.local()
+
+        def check_in(user):
+            if not hasattr(local, 'client'):
+                local.client = APIClient()
+            local.client.force_authenticate(user)
+            started = time.perf_counter()
+            response = local.client.post(URL, {}, format='json')
+            return response.status_code, (time.perf_counter() - started) * 1000
+
+        def worker_thread(chunk):
+            try:
+                return [check_in(user) for user in chunk]
+            finally:
+                connections.close_all()
+
+        clients = options['clients']
+        chunks = [users[i::clients] for i in range(clients)]
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                results = [r for chunk in pool.map(worker_thread, chunks) for r in chunk]
+            elapsed = time.perf_counter() - started
+        finally:
+            if not options['keep']:
+                User.objects.filter(email__endswith=EMAIL_DOMAIN).delete()
+                rebuild_attendance_rollup(date.today(), date.today())
+
+        latencies = sorted(ms for _, ms in results)
+        statuses = {}
+        for code, _ in results:
+            statuses[code] = statuses.get(code, 0) + 1
+        self.stdout.write(
+            f'DB vendor: {connection.vendor} · {len(results)} check-ins · {clients} clients'
+        )
+        self.stdout.write(
+            f'  latency   p50 {statistics.median(latencies):7.2f} ms · '
+            f'p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms · '
+            f'max {latencies[-1]:7.2f} ms'
+        )
+        self.stdout.write(f'  statuses  {statuses}')
+        self.stdout.write(self.style.SUCCESS(
+            f'  sustained {len(results) / elapsed:8.1f} check-ins/sec'
+        ))
@@ -0,0 +1,62 @@
+"""
+management/commands/close_out_attendance.py
+Run: python manage.py close_out_attendance [--date YYYY-MM-DD | --from YYYY-MM-DD --to YYYY-MM-DD]
+                                           [--checkout-at HH:MM]
+Nightly job: records ABSENT for every worker with no attendance that day and
+closes open check-ins at ATTENDANCE_AUTO_CHECKOUT_TIME. Defaults to yesterday.
+"""
+import time
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from apps.workforce.services import close_out_attendance
+
+
+def _parse(value, fmt, label):
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        raise CommandError(f'Invalid {label} "{value}".')
+
+
+class Command(BaseCommand):
+    help = 'Records absences and closes open check-ins for a finished day or date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Single date (YYYY-MM-DD)')
+        parser.add_argument('--from', dest='start', help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', help='Last date (YYYY-MM-DD)')
+        parser.add_argument('--checkout-at', default=settings.ATTENDANCE_AUTO_CHECKOUT_TIME,
+                            help='Check-out time stamped on open check-ins (HH:MM)')
+
+    def handle(self, *args, **options):
+        yesterday = date.today() - timedelta(days=1)
+        if options['date']:
+            start = end = _parse(options['date'], '%Y-%m-%d', 'date').date()
+        else:
+            start, end = (
+                _parse(options[key], '%Y-%m-%d', label).date() if options[key] else None
+                for key, label in (('start', '--from'), ('end', '--to'))
+            )
+            start, end = start or end or yesterday, end or start or yesterday
+        if start > end:
+            raise CommandError('--from must not be after --to.')
+        if end >= date.today():
+            self.stderr.write(self.style.WARNING(
+                'Closing out today or later: workers who have not checked in yet become absent.'
+            ))
+        checkout_at = _parse(options['checkout_at'], '%H:%M', '--checkout-at').time()
+
+        started = time.perf_counter()
+        try:
+            result = close_out_attendance(start, end, checkout_at)
+        except NotSupportedError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {start} → {end}: {result["absent"]} absence(s) recorded, '
+            f'{result["closed"]} check-in(s) closed at {checkout_at:%H:%M} '
+            f'({time.perf_counter() - started:.2f}s).'
+        ))
@@ -0,0 +1,33 @@
+"""
+management/commands/rebuild_attendance_rollup.py
+Run: python manage.py rebuild_attendance_rollup [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+Recomputes AttendanceDailyRollup from raw attendance (all dates by default).
+"""
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workforce.services import rebuild_attendance_rollup
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date "{value}". Use YYYY-MM-DD.')
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily attendance rollup from scratch or for a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', help='Last date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        start = _parse_date(options['start']) if options['start'] else None
+        end = _parse_date(options['end']) if options['end'] else None
+        if start and end and start > end:
+            raise CommandError('--from must not be after --to.')
+        written = rebuild_attendance_rollup(start, end)
+        scope = f'{start or "beginning"} → {end or "latest"}'
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {written} rollup rows ({scope}).'))
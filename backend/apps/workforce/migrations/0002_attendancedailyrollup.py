@@ -0,0 +1,58 @@
+# Generated by Django 4.2.13 on 2026-10-18 11:51
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def backfill_rollup(apps, schema_editor):
+    """Groups the existing live attendance rows into the new rollup."""
+    Attendance = apps.get_model('workforce', 'Attendance')
+    AttendanceDailyRollup = apps.get_model('workforce', 'AttendanceDailyRollup')
+    grouped = (
+        Attendance.objects.filter(is_deleted=False).order_by()
+        .values('date', 'project', 'status')
+        .annotate(total=Count('id'), closed=Count('id', filter=Q(check_out__isnull=False)))
+    )
+    AttendanceDailyRollup.objects.bulk_create([
+        AttendanceDailyRollup(
+            date=g['date'], project_id=g['project'], status=g['status'],
+            count=g['total'], checked_out=g['closed'],
+        )
+        for g in grouped.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_sitemanagerprofile'),
+        ('workforce', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('present', 'Present'), ('absent', 'Absent'), ('late_arrival', 'Late Arrival'), ('on_leave', 'On Leave')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('checked_out', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='attendancedailyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', False)), fields=('date', 'project', 'status'), name='attendance_rollup_project_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendancedailyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('date', 'status'), name='attendance_rollup_unassigned_key'),
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
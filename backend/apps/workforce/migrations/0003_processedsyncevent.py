@@ -0,0 +1,29 @@
+# Generated by Django 4.2.13 on 2026-10-18 12:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0002_attendancedailyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessedSyncEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(choices=[('check_in', 'Check-in'), ('check_out', 'Check-out')], max_length=20)),
+                ('occurred_at', models.DateTimeField()),
+                ('applied', models.BooleanField(default=True)),
+                ('processed_at', models.DateTimeField(auto_now_add=True)),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_events', to='workforce.worker')),
+            ],
+            options={
+                'ordering': ['-processed_at'],
+            },
+        ),
+    ]
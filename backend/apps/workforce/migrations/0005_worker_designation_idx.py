@@ -0,0 +1,17 @@
+# Generated by Django 4.2.13 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0004_attendance_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['designation'], name='worker_designation_idx'),
+        ),
+    ]
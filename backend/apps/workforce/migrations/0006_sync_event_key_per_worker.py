@@ -0,0 +1,33 @@
+# Generated by Django 4.2.13 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+def forget_rejected_events(apps, schema_editor):
+    # Rejected keys are no longer recorded; drop the old ones so devices can resend them.
+    ProcessedSyncEvent = apps.get_model('workforce', 'ProcessedSyncEvent')
+    ProcessedSyncEvent.objects.filter(applied=False).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workforce', '0005_worker_designation_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(forget_rejected_events, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='processedsyncevent',
+            name='applied',
+        ),
+        migrations.AlterField(
+            model_name='processedsyncevent',
+            name='key',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='processedsyncevent',
+            constraint=models.UniqueConstraint(fields=('worker', 'key'), name='sync_event_worker_key'),
+        ),
+    ]
@@ -15,6 +15,11 @@ class Worker(BaseModel):
     daily_rate = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     joining_date = models.DateField(null=True, blank=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['designation'], name='worker_designation_idx'),
+        ]
+
     def __str__(self):
         return f'{self.user.name} — {self.designation}'
 
@@ -48,6 +53,88 @@ class Attendance(BaseModel):
     class Meta:
         unique_together = ('worker', 'date')
         ordering = ['-date']
+        indexes = [
+            # Keyset pagination on (date, id), optionally narrowed by project / status.
+            models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+            models.Index(fields=['project', 'date', 'id'], name='attendance_project_date_idx'),
+            models.Index(fields=['status', 'date', 'id'], name='attendance_status_date_idx'),
+        ]
 
     def __str__(self):
         return f'{self.worker.name} — {self.date} ({self.status})'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The worker-year the row was loaded in, so an edit that moves it can
+        # invalidate the old year's cached calendar too (see apps.py).
+        if 'worker_id' in field_names and 'date' in field_names:
+            instance._calendar_key = (instance.worker_id, instance.date)
+        return instance
+
+
+class AttendanceDailyRollup(models.Model):
+    """
+    Per-day attendance counts by project and status.
+    Maintained incrementally on every attendance write (see services.py) so
+    trend reads cost O(days) instead of O(attendance rows).
+    """
+    date = models.DateField()
+    # Deleting a project rebuilds its days so the counts follow the SET_NULL
+    # attendance rows to the NULL project (see WorkforceConfig.ready).
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='attendance_rollups'
+    )
+    status = models.CharField(max_length=20, choices=AttendanceStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+    checked_out = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'project', 'status'],
+                condition=models.Q(project__isnull=False),
+                name='attendance_rollup_project_key',
+            ),
+            # NULL never collides in a unique index, so unassigned rows need their own key.
+            models.UniqueConstraint(
+                fields=['date', 'status'],
+                condition=models.Q(project__isnull=True),
+                name='attendance_rollup_unassigned_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.project_id or "—"} {self.status}: {self.count}'
+
+
+class SyncEventKind(models.TextChoices):
+    CHECK_IN = 'check_in', 'Check-in'
+    CHECK_OUT = 'check_out', 'Check-out'
+
+
+class ProcessedSyncEvent(models.Model):
+    """
+    Idempotency log for offline attendance events replayed by devices.
+    Keys are generated on the device, so they are unique per worker. A key is
+    recorded in the same transaction that applies the event, so a replayed
+    batch is acknowledged without being applied twice. Rejected events are
+    not recorded: resent later, they are evaluated again.
+    """
+    key = models.CharField(max_length=64)
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name='sync_events')
+    kind = models.CharField(max_length=20, choices=SyncEventKind.choices)
+    occurred_at = models.DateTimeField()    # device timestamp
+    processed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-processed_at']
+        constraints = [
+            models.UniqueConstraint(fields=['worker', 'key'], name='sync_event_worker_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.key} ({self.kind})'
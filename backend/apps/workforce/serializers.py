@@ -1,6 +1,8 @@
+from django.utils import timezone
 from rest_framework import serializers
 from apps.authentication.serializers import UserSerializer
-from .models import Worker, Attendance
+from .models import Worker, Attendance, AttendanceStatus, SyncEventKind
+from .services import SYNC_CLOCK_SKEW
 
 
 class WorkerSerializer(serializers.ModelSerializer):
@@ -38,3 +40,35 @@ class AttendanceSerializer(serializers.ModelSerializer):
 class CheckInSerializer(serializers.Serializer):
     project_id = serializers.UUIDField(required=False, allow_null=True)
     notes = serializers.CharField(required=False, allow_blank=True)
+
+
+class BulkAttendanceEntrySerializer(serializers.Serializer):
+    """One row of a bulk attendance write; worker / project ids are checked by the service."""
+    worker = serializers.UUIDField()
+    date = serializers.DateField()
+    status = serializers.ChoiceField(
+        choices=AttendanceStatus.choices, default=AttendanceStatus.PRESENT
+    )
+    project = serializers.UUIDField(required=False, allow_null=True, default=None)
+    check_in = serializers.TimeField(required=False, allow_null=True, default=None)
+    check_out = serializers.TimeField(required=False, allow_null=True, default=None)
+    notes = serializers.CharField(required=False, allow_blank=True, max_length=300, default='')
+
+    def validate(self, attrs):
+        if attrs['check_in'] and attrs['check_out'] and attrs['check_out'] < attrs['check_in']:
+            raise serializers.ValidationError('check_out must not be before check_in.')
+        return attrs
+
+
+class SyncEventSerializer(serializers.Serializer):
+    """A check-in / check-out recorded offline; `key` is generated once by the device."""
+    key = serializers.CharField(max_length=64)
+    kind = serializers.ChoiceField(choices=SyncEventKind.choices)
+    at = serializers.DateTimeField()
+    project = serializers.UUIDField(required=False, allow_null=True, default=None)
+    notes = serializers.CharField(required=False, allow_blank=True, max_length=300, default='')
+
+    def validate_at(self, value):
+        if value > timezone.now() + SYNC_CLOCK_SKEW:
+            raise serializers.ValidationError('Event time is in the future.')
+        return value
@@ -0,0 +1,650 @@
+"""
+Workforce services — attendance rollup maintenance, trend reads, check-in,
+bulk attendance writes, offline event sync, nightly close-out, worked-hours
+reports and packed attendance calendars.
+"""
+import base64
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from django.db import IntegrityError, NotSupportedError, connection, transaction
+from django.db.models import (
+    Count, DateField, DateTimeField, DurationField, Exists, ExpressionWrapper, F, OuterRef, Q,
+    Sum, TimeField, UUIDField, Value,
+)
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Greatest, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from core.cache import cached_payload, invalidate_tags
+from core.models import RandomUUID
+from apps.authentication.models import User
+from apps.projects.models import Project
+from .models import (
+    Attendance, AttendanceDailyRollup, AttendanceStatus, ProcessedSyncEvent, SyncEventKind,
+    Worker,
+)
+
+PRESENT_STATUSES = [AttendanceStatus.PRESENT, AttendanceStatus.LATE]
+ROLLUP_BATCH_SIZE = 1000
+LATE_AFTER = time(9, 0)    # check-ins after this are late arrivals
+SYNC_MAX_EVENTS = 1000
+SYNC_CLOCK_SKEW = timedelta(minutes=5)
+# 2-bit day codes of the packed calendar; 0 = no record.
+CALENDAR_CODES = {
+    AttendanceStatus.PRESENT: 1,
+    AttendanceStatus.LATE: 2,
+    AttendanceStatus.ABSENT: 3,
+    AttendanceStatus.ON_LEAVE: 3,
+}
+SYNC_UPDATE_FIELDS = [
+    'check_in', 'check_out', 'is_deleted', 'project', 'status', 'notes', 'updated_at',
+]
+BULK_ATTENDANCE_MAX = 1000
+AUTO_ABSENT_NOTE = 'Auto: no check-in'
+SHIFT_LENGTH = timedelta(hours=8)    # worked time beyond this per day is overtime
+HOURS_PERIODS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+# group_by → (values() keys identifying a row, extra label keys)
+HOURS_GROUPS = {
+    'worker': (['worker'], ['worker__employee_id', 'worker__user__name']),
+    'project': (['project'], ['project__name']),
+    'worker_project': (
+        ['worker', 'project'], ['worker__employee_id', 'worker__user__name', 'project__name']
+    ),
+}
+# Export header → hours_report_rows() key.
+HOURS_COLUMNS = {
+    'period': 'period',
+    'worker_id': 'worker',
+    'employee_id': 'worker__employee_id',
+    'worker_name': 'worker__user__name',
+    'project_id': 'project',
+    'project_name': 'project__name',
+    'days_worked': 'days_worked',
+    'hours': 'hours',
+    'overtime_hours': 'overtime_hours',
+    'late_days': 'late_days',
+    'late_minutes': 'late_minutes',
+}
+# Columns overwritten when the worker already has a row for the date.
+ATTENDANCE_UPSERT_FIELDS = [
+    'project', 'status', 'check_in', 'check_out', 'notes', 'is_deleted', 'updated_at',
+]
+
+
+def arrival_status(check_in):
+    """PRESENT, or LATE for a check-in after LATE_AFTER."""
+    return AttendanceStatus.LATE if check_in > LATE_AFTER else AttendanceStatus.PRESENT
+
+
+def _rollup_key(attendance):
+    return (attendance.date, attendance.project_id, attendance.status)
+
+
+def _bump_rollup(key, count, checked_out):
+    day, project_id, att_status = key
+    qs = AttendanceDailyRollup.objects.filter(
+        date=day, project_id=project_id, status=att_status
+    )
+    delta = {'count': F('count') + count, 'checked_out': F('checked_out') + checked_out}
+    if qs.update(**delta):
+        return
+    try:
+        with transaction.atomic():
+            AttendanceDailyRollup.objects.create(
+                date=day, project_id=project_id, status=att_status,
+                count=max(count, 0), checked_out=max(checked_out, 0),
+            )
+    except IntegrityError:
+        # A concurrent writer created the row first; fall back to the increment.
+        qs.update(**delta)
+
+
+def apply_attendance_change(before=None, after=None):
+    """
+    Moves one attendance row's contribution in the rollup.
+    `before` / `after` are the Attendance states around the write (None for
+    create / delete). Call inside the same transaction as the write.
+    """
+    deltas = {}
+    for attendance, sign in ((before, -1), (after, 1)):
+        if attendance is None or attendance.is_deleted:
+            continue
+        count, checked_out = deltas.get(_rollup_key(attendance), (0, 0))
+        deltas[_rollup_key(attendance)] = (
+            count + sign, checked_out + (sign if attendance.check_out else 0)
+        )
+    for key, (count, checked_out) in deltas.items():
+        if count or checked_out:
+            _bump_rollup(key, count, checked_out)
+
+
+@transaction.atomic
+def rebuild_attendance_rollup(start=None, end=None, dates=None):
+    """
+    Recomputes the rollup from raw attendance, optionally for [start, end]
+    and / or only the given `dates` (bulk writes pass the days they touched,
+    however far apart). Used by bulk attendance writes and the
+    rebuild_attendance_rollup command. Returns the number of rollup rows written.
+    """
+    date_filter = Q()
+    if start:
+        date_filter &= Q(date__gte=start)
+    if end:
+        date_filter &= Q(date__lte=end)
+    if dates is not None:
+        date_filter &= Q(date__in=set(dates))
+
+    AttendanceDailyRollup.objects.filter(date_filter).delete()
+    grouped = Attendance.objects.filter(date_filter).order_by().values(
+        'date', 'project', 'status'
+    ).annotate(
+        total=Count('id'),
+        closed=Count('id', filter=Q(check_out__isnull=False)),
+    )
+    rows = [
+        AttendanceDailyRollup(
+            date=g['date'], project_id=g['project'], status=g['status'],
+            count=g['total'], checked_out=g['closed'],
+        )
+        for g in grouped.iterator(chunk_size=ROLLUP_BATCH_SIZE)
+    ]
+    AttendanceDailyRollup.objects.bulk_create(rows, batch_size=ROLLUP_BATCH_SIZE)
+    return len(rows)
+
+
+def remember_project_rollup_dates(sender, instance, **kwargs):
+    """pre_delete of Project: the days its rollup rows cover, before the cascade drops them."""
+    instance._rollup_dates = set(
+        AttendanceDailyRollup.objects.filter(project=instance).values_list('date', flat=True)
+    )
+
+
+def rebuild_project_rollup_dates(sender, instance, **kwargs):
+    """
+    post_delete of Project: its attendance rows are now unassigned (SET_NULL),
+    so those days are rebuilt to count them under the NULL project.
+    """
+    dates = getattr(instance, '_rollup_dates', None)
+    if dates:
+        rebuild_attendance_rollup(dates=dates)
+        # The SET_NULL update bypasses the Attendance post_save hooks.
+        invalidate_tags('attendance')
+
+
+def attendance_trend(start, end, project=None, statuses=PRESENT_STATUSES):
+    """Daily counts for [start, end] read from the rollup, as {date: count}."""
+    qs = AttendanceDailyRollup.objects.filter(date__range=(start, end), status__in=statuses)
+    if project:
+        qs = qs.filter(project=project)
+    return dict(
+        qs.order_by().values('date').annotate(total=Sum('count')).values_list('date', 'total')
+    )
+
+
+def attendance_status_totals(start, end=None, project=None):
+    """Total and present/late attendance counts over a date range, from the rollup."""
+    qs = AttendanceDailyRollup.objects.filter(date__gte=start)
+    if end:
+        qs = qs.filter(date__lte=end)
+    if project:
+        qs = qs.filter(project=project)
+    agg = qs.aggregate(
+        total=Sum('count'),
+        present=Sum('count', filter=Q(status__in=PRESENT_STATUSES)),
+    )
+    return {'total': agg['total'] or 0, 'present': agg['present'] or 0}
+
+
+def checkin_profile(user_id):
+    """
+    {'id', 'name', 'designation'} of the user's worker profile, or None.
+    Cached per user on the 'workers' tag, so the check-in path skips the lookup.
+    """
+    def build():
+        row = Worker.objects.filter(user_id=user_id).values(
+            'id', 'designation', name=F('user__name')
+        ).first()
+        return row and {**row, 'id': str(row['id'])}
+    return cached_payload('workforce.checkin_profile', 'any', build, scope=str(user_id),
+                          tags=('workers',))
+
+
+def project_names():
+    """{project id: name} for live projects, cached on the 'projects' tag."""
+    return cached_payload('workforce.project_names', 'any', lambda: {
+        str(pk): name for pk, name in Project.objects.order_by().values_list('id', 'name')
+    }, tags=('projects',))
+
+
+def _check_in_sql():
+    fields = [Attendance._meta.get_field(name) for name in (
+        'id', 'created_at', 'updated_at', 'is_deleted', 'worker', 'project',
+        'date', 'status', 'check_in', 'check_out', 'notes',
+    )]
+    qn = connection.ops.quote_name
+    table = qn(Attendance._meta.db_table)
+    columns = [qn(f.column) for f in fields]
+    # A soft-deleted row still holds the (worker, date) key: revive it in place.
+    revived = ', '.join(
+        f'{column} = excluded.{column}' for column in columns
+        if column not in (qn('id'), qn('created_at'), qn('worker_id'), qn('date'))
+    )
+    sql = (
+        f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join(["%s"] * len(fields))}) '
+        f'ON CONFLICT ({qn("worker_id")}, {qn("date")}) DO UPDATE SET {revived} '
+        f'WHERE {table}.{qn("is_deleted")} RETURNING {qn("id")}'
+    )
+    return sql, fields
+
+
+def insert_check_in(attendance):
+    """
+    Writes a new Attendance for its (worker, date) with one
+    INSERT ... ON CONFLICT ... RETURNING statement. Returns False when the
+    worker already has a live row for the day; otherwise sets attendance.id
+    (the revived row's id when a soft-deleted one held the key).
+    """
+    sql, fields = _check_in_sql()
+    now = timezone.now()
+    attendance.id = attendance.id or uuid.uuid4()
+    attendance.created_at = attendance.updated_at = now
+    attendance.is_deleted = False
+    params = [f.get_db_prep_save(getattr(attendance, f.attname), connection) for f in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    if row is None:
+        return False
+    attendance.id = Attendance._meta.pk.to_python(row[0])
+    return True
+
+
+def record_check_in(profile, project_id=None, notes='', now=None):
+    """
+    Checks a worker in for today: status from LATE_AFTER, one upsert and one
+    rollup increment in a single transaction. `profile` is checkin_profile();
+    an unknown project id is dropped, as before. Returns the unsaved-looking
+    Attendance (worker / project attached, no further queries needed to
+    serialize it), or None if the worker already checked in today.
+    """
+    now = now or datetime.now()
+    names = project_names() if project_id else {}
+    project_key = str(project_id) if project_id else None
+    attendance = Attendance(
+        worker=Worker(
+            id=profile['id'], designation=profile['designation'], user=User(name=profile['name'])
+        ),
+        date=now.date(), check_in=now.time(), notes=notes, status=arrival_status(now.time()),
+    )
+    if project_key in names:
+        attendance.project = Project(id=project_id, name=names[project_key])
+
+    with transaction.atomic():
+        if not insert_check_in(attendance):
+            return None
+        apply_attendance_change(after=attendance)
+    # Raw SQL bypasses the post_save hooks.
+    invalidate_tags('attendance', *calendar_tags_for([attendance]))
+    return attendance
+
+
+def _row_error(field, message):
+    return {'status': 'error', 'errors': {field: [message]}}
+
+
+def bulk_upsert_attendance(entries, projects=None):
+    """
+    Writes validated entries ({worker, date, status, project, check_in,
+    check_out, notes}) in one bulk_create(update_conflicts=True) on
+    (worker, date), then rebuilds the rollup for the affected dates.
+    Worker and project ids are checked against sets loaded up front.
+    `projects` scopes the write (e.g. a site manager's own projects): each
+    entry must name one of them, the worker must be on one of their crews,
+    and a live row recorded against any other project is not overwritten.
+    A constant number of queries regardless of batch size.
+    Returns one {'status': 'created' | 'updated' | 'error', ...} per entry.
+    """
+    workers = Worker.objects.filter(id__in={e['worker'] for e in entries})
+    if projects is not None:
+        workers = workers.filter(user__assigned_projects__in=projects)
+    worker_ids = set(workers.order_by().values_list('id', flat=True))
+    if projects is None:
+        project_ids = set(
+            Project.objects.filter(id__in={e['project'] for e in entries if e['project']})
+            .order_by().values_list('id', flat=True)
+        )
+    else:
+        project_ids = set(projects.order_by().values_list('id', flat=True))
+    existing = {
+        (worker_id, day): (project_id, is_deleted)
+        for worker_id, day, project_id, is_deleted in Attendance.all_objects.filter(
+            worker_id__in=worker_ids, date__in={e['date'] for e in entries}
+        ).order_by().values_list('worker_id', 'date', 'project', 'is_deleted')
+    }
+
+    results, rows, seen = [], [], set()
+    for entry in entries:
+        key = (entry['worker'], entry['date'])
+        current_project, deleted = existing.get(key, (None, True))
+        if entry['worker'] not in worker_ids:
+            results.append(_row_error('worker', 'Unknown or not allowed worker.'))
+        elif projects is not None and not entry['project']:
+            results.append(_row_error('project', 'A project is required.'))
+        elif entry['project'] and entry['project'] not in project_ids:
+            results.append(_row_error('project', 'Unknown or not allowed project.'))
+        elif projects is not None and not deleted and current_project not in (None, *project_ids):
+            results.append(_row_error('project', 'Already recorded on another project.'))
+        elif key in seen:
+            results.append(_row_error('date', 'Duplicate worker/date in this batch.'))
+        else:
+            seen.add(key)
+            results.append({'status': 'updated' if key in existing else 'created'})
+            rows.append(Attendance(
+                worker_id=entry['worker'], date=entry['date'], status=entry['status'],
+                project_id=entry['project'], check_in=entry['check_in'],
+                check_out=entry['check_out'], notes=entry['notes'], is_deleted=False,
+            ))
+
+    if rows:
+        with transaction.atomic():
+            Attendance.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=['worker', 'date'],
+                update_fields=ATTENDANCE_UPSERT_FIELDS,
+            )
+            rebuild_attendance_rollup(dates={row.date for row in rows})
+        # bulk_create bypasses the post_save hooks.
+        invalidate_tags('attendance', *calendar_tags_for(rows))
+    return results
+
+
+def _merge_sync_events(worker, events, existing, projects):
+    """
+    Folds new events into the worker's attendance rows per local day: the
+    earliest check-in and the latest check-out win, and status follows the
+    winning check-in. `existing` maps date → row, soft-deleted rows included
+    since they still hold the (worker, date) key; a check-in revives them,
+    and replaces an absence recorded before it arrived (e.g. by the nightly
+    close-out). Returns (new rows, changed existing rows, {key: rejection reason}).
+    """
+    live = {day: row for day, row in existing.items() if not row.is_deleted}
+    dirty, rejected = set(), {}
+    for event in sorted(events, key=lambda e: e['at']):
+        local = timezone.localtime(event['at'])
+        day, moment = local.date(), local.time().replace(microsecond=0)
+        row = live.get(day)
+        if event['kind'] == SyncEventKind.CHECK_IN:
+            if event['project'] and event['project'] not in projects:
+                rejected[event['key']] = 'Unknown project.'
+                continue
+            if row is None:
+                row = existing.get(day) or Attendance(worker=worker, date=day)
+                row.is_deleted, row.check_out = False, None
+                row.project_id, row.notes = event['project'], event['notes']
+                live[day] = row
+            elif row.check_in is None:
+                row.project_id = event['project'] or row.project_id
+                row.notes = event['notes']
+            elif moment >= row.check_in:
+                continue
+            row.check_in, row.status = moment, arrival_status(moment)
+            dirty.add(day)
+        elif row is None or row.check_in is None:
+            rejected[event['key']] = 'No check-in for that day.'
+        elif row.check_out is None or moment > row.check_out:
+            row.check_out = moment
+            dirty.add(day)
+
+    new_rows = [live[day] for day in dirty if day not in existing]
+    changed = [live[day] for day in dirty if day in existing]
+    return new_rows, changed, rejected
+
+
+def sync_attendance_events(worker, events):
+    """
+    Applies a device's queued check-in / check-out events ({key, kind, at,
+    project, notes}) for `worker`. Keys the worker's devices already had
+    applied are found with one query and acknowledged as duplicates; the rest
+    are merged into the day's attendance rows, written in bulk and recorded
+    in the same transaction. Rejected keys are not recorded, so a resent
+    event is evaluated again.
+    Returns {'applied': [...], 'duplicate': [...], 'rejected': {key: reason}}.
+    """
+    events = list({e['key']: e for e in events}.values())
+    try:
+        return _sync_once(worker, events)
+    except IntegrityError:
+        # A concurrent replay recorded some of these keys first; retry sees them as duplicates.
+        return _sync_once(worker, events)
+
+
+def _sync_once(worker, events):
+    seen = set(
+        ProcessedSyncEvent.objects.filter(worker=worker, key__in=[e['key'] for e in events])
+        .values_list('key', flat=True)
+    )
+    fresh = [e for e in events if e['key'] not in seen]
+    result = {'applied': [], 'duplicate': sorted(seen), 'rejected': {}}
+    if not fresh:
+        return result
+
+    days = {timezone.localtime(e['at']).date() for e in fresh}
+    existing = {
+        row.date: row for row in Attendance.all_objects.filter(worker=worker, date__in=days)
+    }
+    projects = set(
+        Project.objects.filter(id__in={e['project'] for e in fresh if e['project']})
+        .order_by().values_list('id', flat=True)
+    )
+    new_rows, changed, rejected = _merge_sync_events(worker, fresh, existing, projects)
+    result['applied'] = [e['key'] for e in fresh if e['key'] not in rejected]
+    result['rejected'] = rejected
+    if not result['applied']:
+        return result
+
+    touched = new_rows + changed
+    with transaction.atomic():
+        ProcessedSyncEvent.objects.bulk_create([
+            ProcessedSyncEvent(key=e['key'], worker=worker, kind=e['kind'], occurred_at=e['at'])
+            for e in fresh if e['key'] not in rejected
+        ])
+        Attendance.objects.bulk_create(new_rows)
+        now = timezone.now()
+        for row in changed:
+            row.updated_at = now
+        Attendance.all_objects.bulk_update(changed, SYNC_UPDATE_FIELDS)
+        if touched:
+            rebuild_attendance_rollup(dates={row.date for row in touched})
+    if touched:
+        # bulk_create / bulk_update bypass the post_save hooks.
+        invalidate_tags('attendance', *calendar_tags_for(touched))
+    return result
+
+
+def _on_roll(day, prefix=''):
+    """Filter for workers expected on site on `day`: active and already joined."""
+    return (
+        Q(**{f'{prefix}joining_date__isnull': True}) | Q(**{f'{prefix}joining_date__lte': day})
+    ) & Q(**{f'{prefix}user__is_active': True, f'{prefix}is_deleted': False})
+
+
+def _insert_absences(day, now):
+    """
+    One INSERT ... SELECT: an ABSENT row for every worker on roll with no
+    attendance row at all for `day` (anti-join). Returns the rows inserted.
+    """
+    values = {
+        'id': RandomUUID(),
+        'created_at': Value(now, output_field=DateTimeField()),
+        'updated_at': Value(now, output_field=DateTimeField()),
+        'is_deleted': Value(False),
+        'worker': F('id'),
+        'project': Value(None, output_field=UUIDField()),
+        'date': Value(day, output_field=DateField()),
+        'status': Value(AttendanceStatus.ABSENT),
+        'check_in': Value(None, output_field=TimeField()),
+        'check_out': Value(None, output_field=TimeField()),
+        'notes': Value(AUTO_ABSENT_NOTE),
+    }
+    select = Worker.objects.filter(
+        _on_roll(day),
+        ~Exists(Attendance.all_objects.filter(worker=OuterRef('pk'), date=day)),
+    ).order_by().values(**{f'new_{name}': expr for name, expr in values.items()})
+    select_sql, params = select.query.get_compiler(connection=connection).as_sql()
+
+    fields = [Attendance._meta.get_field(name) for name in values]
+    qn = connection.ops.quote_name
+    # A concurrent check-in that lands between the anti-join and the insert wins.
+    sql = '{} {} ({}) {} {}'.format(
+        connection.ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        qn(Attendance._meta.db_table), ', '.join(qn(f.column) for f in fields), select_sql,
+        connection.ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def close_out_attendance(start, end, checkout_at):
+    """
+    Finalises attendance for [start, end]: open check-ins get check_out =
+    `checkout_at` (or their check-in time if later), every active worker
+    without a live row gets an ABSENT row (soft-deleted rows are revived as
+    absent, the rest inserted set-based per day), then the rollup is rebuilt
+    for the range. Safe to re-run. Returns {'closed', 'absent'}. Raises
+    NotSupportedError before writing anything on a backend RandomUUID can't serve.
+    """
+    if connection.vendor not in RandomUUID.vendors:
+        raise NotSupportedError(f'Attendance close-out is not supported on {connection.vendor}.')
+    now = timezone.now()
+    closed = absent = 0
+    with transaction.atomic():
+        closed = Attendance.objects.filter(
+            date__range=(start, end), check_in__isnull=False, check_out__isnull=True,
+        ).update(
+            check_out=Greatest(F('check_in'), Value(checkout_at, output_field=TimeField())),
+            updated_at=now,
+        )
+        day = start
+        while day <= end:
+            absent += Attendance.all_objects.filter(
+                _on_roll(day, 'worker__'), date=day, is_deleted=True,
+            ).update(
+                is_deleted=False, status=AttendanceStatus.ABSENT, project=None,
+                check_in=None, check_out=None, notes=AUTO_ABSENT_NOTE, updated_at=now,
+            )
+            absent += _insert_absences(day, now)
+            day += timedelta(days=1)
+        rebuild_attendance_rollup(start, end)
+    # Set-based writes bypass the post_save hooks; every worker's calendar may change.
+    invalidate_tags('attendance', *map(calendar_year_tag, range(start.year, end.year + 1)))
+    return {'closed': closed, 'absent': absent}
+
+
+def _duration(expression):
+    return ExpressionWrapper(expression, output_field=DurationField())
+
+
+def worked_hours(filters, period='month', group_by='worker'):
+    """
+    Grouped values() queryset of worked time per `group_by` per period, all
+    computed in SQL: worked = check_out - check_in (closed rows only),
+    overtime = the part of each day beyond SHIFT_LENGTH, late = check_in past
+    LATE_AFTER. Durations come back as timedeltas; see hours_report_rows().
+    """
+    worked = _duration(F('check_out') - F('check_in'))
+    closed = Q(check_in__isnull=False, check_out__gt=F('check_in'))
+    late = Q(check_in__gt=LATE_AFTER)
+    keys, labels = HOURS_GROUPS[group_by]
+    return (
+        Attendance.objects.filter(**filters)
+        .annotate(period=HOURS_PERIODS[period]('date'))
+        .order_by()
+        .values('period', *keys, *labels)
+        .annotate(
+            days_worked=Count('id', filter=closed),
+            worked=Sum(worked, filter=closed),
+            overtime=Sum(
+                Greatest(_duration(worked - Value(SHIFT_LENGTH)), Value(timedelta(0))),
+                filter=closed,
+            ),
+            late_days=Count('id', filter=late),
+            late=Sum(_duration(F('check_in') - Value(LATE_AFTER, output_field=TimeField())),
+                     filter=late),
+        )
+        .order_by('period', *labels, *keys)
+    )
+
+
+def _hours(duration):
+    return round((duration or timedelta(0)).total_seconds() / 3600, 2)
+
+
+def hours_report_rows(queryset, chunk_size=2000):
+    """Rows of worked_hours() with durations in hours / minutes, streamed from the cursor."""
+    for row in queryset.iterator(chunk_size=chunk_size):
+        row['hours'] = _hours(row.pop('worked'))
+        row['overtime_hours'] = _hours(row.pop('overtime'))
+        row['late_minutes'] = round((row.pop('late') or timedelta(0)).total_seconds() / 60)
+        for key in HOURS_COLUMNS.values():
+            row.setdefault(key, None)
+        yield row
+
+
+def calendar_tag(worker_id, year):
+    return f'attendance_calendar:{worker_id}:{year}'
+
+
+def calendar_year_tag(year):
+    """Covers every worker's calendar for the year, for workforce-wide writes."""
+    return f'attendance_calendar:{year}'
+
+
+def calendar_tags_for(rows):
+    """Per worker-year calendar tags touched by attendance rows (objects or (worker_id, date))."""
+    pairs = (
+        (row.worker_id, row.date) if isinstance(row, Attendance) else row for row in rows
+    )
+    return {calendar_tag(worker_id, day.year) for worker_id, day in pairs}
+
+
+def attendance_calendar_tags(attendance):
+    """
+    Calendar tags for a saved or deleted row: its worker-year now and, if an
+    edit moved it, the worker-year it was loaded with.
+    """
+    current = (attendance.worker_id, attendance.date)
+    previous = getattr(attendance, '_calendar_key', current)
+    attendance._calendar_key = current    # a later save of this instance moves from here
+    return calendar_tags_for([current, previous])
+
+
+def pack_days(codes):
+    """2-bit codes → bytes, four days per byte, day 1 in the lowest bits."""
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def worker_calendars(worker_ids, year):
+    """
+    {worker_id: {'days': base64 2-bit codes, 'summary': {status: count}}} for
+    the year, from one query over (worker, date, status).
+    """
+    first = date(year, 1, 1)
+    length = (date(year + 1, 1, 1) - first).days
+    codes = {worker_id: [0] * length for worker_id in worker_ids}
+    summary = {worker_id: dict.fromkeys(AttendanceStatus.values, 0) for worker_id in worker_ids}
+    for worker_id, day, att_status in Attendance.objects.filter(
+        worker_id__in=worker_ids, date__gte=first, date__lt=date(year + 1, 1, 1),
+    ).order_by().values_list('worker_id', 'date', 'status'):
+        codes[worker_id][(day - first).days] = CALENDAR_CODES.get(att_status, 0)
+        summary[worker_id][att_status] += 1
+    return {
+        worker_id: {
+            'days': base64.b64encode(pack_days(codes[worker_id])).decode(),
+            'summary': summary[worker_id],
+        }
+        for worker_id in worker_ids
+    }
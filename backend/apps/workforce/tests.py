@@ -1,3 +1,494 @@
+import base64
+from datetime import date, time
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import NotSupportedError, connection
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.cache import STATS_PREFIX, cache_stats, flush_stats
+from apps.authentication.models import User, UserRole
+from apps.projects.models import Project
+from .models import Worker, Attendance, AttendanceDailyRollup, ProcessedSyncEvent
+from .services import close_out_attendance, pack_days, rebuild_attendance_rollup
+
+
+class AttendanceRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(
+            user=self.user, employee_id='E1', designation='Mason', daily_rate=100
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _rollup(self):
+        return list(AttendanceDailyRollup.objects.values_list(
+            'date', 'project', 'status', 'count', 'checked_out'
+        ))
+
+    def test_checkin_and_checkout_maintain_rollup(self):
+        self.assertEqual(self.client.post('/api/workforce/attendance/checkin/').status_code, 201)
+        self.assertEqual(self.client.post('/api/workforce/attendance/checkin/').status_code, 409)
+        att = Attendance.objects.get(worker=self.worker)
+        self.assertEqual(self._rollup(), [(date.today(), None, att.status, 1, 0)])
+
+        self.client.post('/api/workforce/attendance/checkout/')
+        self.client.post('/api/workforce/attendance/checkout/')
+        self.assertEqual(self._rollup(), [(date.today(), None, att.status, 1, 1)])
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.client.post('/api/workforce/attendance/checkin/')
+        self.client.post('/api/workforce/attendance/checkout/')
+        incremental = self._rollup()
+        rebuild_attendance_rollup()
+        self.assertEqual(self._rollup(), incremental)
+
+    def test_deleted_project_counts_move_to_unassigned(self):
+        day = date(2026, 3, 2)
+        project = Project.objects.create(name='Tower A', location='Dhaka')
+        other = Worker.objects.create(
+            user=User.objects.create_user(email='v@test.app', password='x', name='Other'),
+            employee_id='E2', designation='Mason',
+        )
+        for worker, site in ((self.worker, project), (other, None)):
+            Attendance.objects.create(worker=worker, project=site, date=day, check_in=time(8))
+        rebuild_attendance_rollup()
+
+        project.delete()
+        self.assertEqual(self._rollup(), [(day, None, 'present', 2, 0)])
+
+    def test_migration_backfills_existing_attendance(self):
+        backfill_rollup = import_module(
+            'apps.workforce.migrations.0002_attendancedailyrollup'
+        ).backfill_rollup
+        Attendance.objects.create(
+            worker=self.worker, date=date(2026, 3, 2), check_in=time(8), check_out=time(17)
+        )
+        AttendanceDailyRollup.objects.all().delete()
+        backfill_rollup(django_apps, None)
+        self.assertEqual(self._rollup(), [(date(2026, 3, 2), None, 'present', 1, 1)])
+
+
+class CheckInTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(
+            user=self.user, employee_id='E1', designation='Mason', daily_rate=100
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_checkin_is_one_upsert_and_revives_soft_deleted_row(self):
+        project = Project.objects.create(name='Tower A', location='Dhaka')
+        url = '/api/workforce/attendance/checkin/'
+        self.client.post(url, {'project_id': str(project.id)})    # warm the profile / project cache
+        Attendance.all_objects.update(is_deleted=True)
+        AttendanceDailyRollup.objects.all().delete()
+
+        # One upsert; the rest is the rollup's update-then-create and savepoints.
+        with self.assertNumQueries(7):
+            response = self.client.post(url, {'project_id': str(project.id), 'notes': 'gate 2'})
+        self.assertEqual(response.status_code, 201)
+        data = response.data['data']
+        self.assertEqual((data['worker_name'], data['project_name']), ('Worker', 'Tower A'))
+        att = Attendance.objects.get(worker=self.worker)
+        self.assertEqual((str(att.id), att.notes, att.check_out), (data['id'], 'gate 2', None))
+        self.assertEqual(
+            list(AttendanceDailyRollup.objects.values_list('date', 'project', 'status', 'count')),
+            [(date.today(), project.id, att.status, 1)],
+        )
+        self.assertEqual(self.client.post(url).status_code, 409)
+
+
+class BulkAttendanceTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            email='sm@test.app', password='x', name='Manager', role=UserRole.SITE_MANAGER
+        )
+        self.own = Project.objects.create(name='Own', location='Dhaka', site_manager=self.manager)
+        self.other = Project.objects.create(name='Other', location='Dhaka')
+        self.workers = []
+        for i in range(20):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            self.workers.append(Worker.objects.create(user=user, employee_id=f'E{i}', designation='Mason'))
+        self.own.workers.add(*[w.user for w in self.workers[:-1]])
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def post(self, entries):
+        return self.client.post('/api/workforce/attendance/bulk/', {'entries': entries}, format='json')
+
+    def test_constant_queries_and_per_row_results(self):
+        day = '2026-03-02'
+        Attendance.objects.create(worker=self.workers[0], date=date(2026, 3, 2), status='absent')
+        entries = [
+            {'worker': str(w.id), 'date': day, 'project': str(self.own.id), 'check_in': '08:00'}
+            for w in self.workers[:-1]
+        ]
+        with self.assertNumQueries(11):
+            data = self.post(entries).data['data']
+        self.assertEqual((data['created'], data['updated'], data['failed']), (18, 1, 0))
+        self.assertEqual(Attendance.objects.filter(status='present', project=self.own).count(), 19)
+        self.assertEqual(
+            list(AttendanceDailyRollup.objects.values_list('project', 'status', 'count')),
+            [(self.own.id, 'present', 19)],
+        )
+
+        data = self.post([
+            {'worker': str(self.workers[1].id), 'date': day, 'status': 'late_arrival',
+             'project': str(self.own.id)},
+            {'worker': str(self.workers[1].id), 'date': day, 'project': str(self.own.id)},
+            {'worker': str(self.workers[2].id), 'date': day, 'project': str(self.other.id)},
+            {'worker': str(self.own.id), 'date': day},
+            {'worker': str(self.workers[3].id), 'date': 'yesterday'},
+        ]).data['data']
+        self.assertEqual(
+            [r['status'] for r in data['results']], ['updated', 'error', 'error', 'error', 'error']
+        )
+        self.assertEqual(data['results'][2]['errors'], {'project': ['Unknown or not allowed project.']})
+        self.assertIn('date', data['results'][4]['errors'])
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_site_manager_is_limited_to_own_crews_and_rows(self):
+        day = date(2026, 3, 2)
+        theirs = Attendance.objects.create(
+            worker=self.workers[1], date=day, project=self.other, status='absent'
+        )
+        data = self.post([
+            {'worker': str(self.workers[-1].id), 'date': '2026-03-02', 'project': str(self.own.id)},
+            {'worker': str(self.workers[1].id), 'date': '2026-03-02', 'project': str(self.own.id)},
+            {'worker': str(self.workers[2].id), 'date': '2026-03-02'},
+        ]).data['data']
+        self.assertEqual([r['errors'] for r in data['results']], [
+            {'worker': ['Unknown or not allowed worker.']},
+            {'project': ['Already recorded on another project.']},
+            {'project': ['A project is required.']},
+        ])
+        theirs.refresh_from_db()
+        self.assertEqual((theirs.project, theirs.status), (self.other, 'absent'))
+        self.assertFalse(Attendance.objects.filter(worker__in=[self.workers[-1], self.workers[2]]))
+
+    def test_rollup_is_rebuilt_for_touched_dates_only(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.client.force_authenticate(admin)
+        Attendance.objects.create(worker=self.workers[0], date=date(2023, 6, 1))
+        AttendanceDailyRollup.objects.all().delete()
+        data = self.post([
+            {'worker': str(self.workers[0].id), 'date': '2020-01-01'},
+            {'worker': str(self.workers[0].id), 'date': '2026-01-01'},
+        ]).data['data']
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(
+            sorted(AttendanceDailyRollup.objects.values_list('date', flat=True)),
+            [date(2020, 1, 1), date(2026, 1, 1)],
+        )
+
+
+class AttendanceSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(user=self.user, employee_id='E1', designation='Mason')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, *events):
+        events = [{'key': k, 'kind': kind, 'at': f'2026-03-0{d}T{t}:00+06:00'}
+                  for k, kind, d, t in events]
+        return self.client.post(
+            '/api/workforce/attendance/sync/', {'events': events}, format='json'
+        ).data['data']
+
+    def test_replayed_week_is_applied_once(self):
+        week = [('in-2', 'check_in', 2, '09:30'), ('out-2', 'check_out', 2, '17:00'),
+                ('in-3', 'check_in', 3, '08:00'), ('out-4', 'check_out', 4, '17:00')]
+        data = self.sync(*week)
+        self.assertEqual(data['applied'], ['in-2', 'out-2', 'in-3'])
+        self.assertEqual([r['key'] for r in data['rejected']], ['out-4'])
+        rows = {a.date.day: a for a in Attendance.objects.all()}
+        self.assertEqual((rows[2].status, str(rows[2].check_out)), ('late_arrival', '17:00:00'))
+        self.assertEqual(rows[3].status, 'present')
+        self.assertEqual(AttendanceDailyRollup.objects.count(), 2)
+
+        # The rejected check-out is not remembered, so it is evaluated (and rejected) again.
+        with self.assertNumQueries(2):
+            replay = self.sync(*week)
+        self.assertEqual(replay['duplicate'], ['in-2', 'in-3', 'out-2'])
+        self.assertEqual((replay['applied'], replay['rejected'][0]['key']), ([], 'out-4'))
+
+        # A late-arriving earlier check-in from a second device wins, and is on time.
+        self.assertEqual(self.sync(('in-2b', 'check_in', 2, '08:45'))['applied'], ['in-2b'])
+        row = Attendance.objects.get(date__day=2)
+        self.assertEqual((str(row.check_in), row.status), ('08:45:00', 'present'))
+        self.assertEqual(
+            list(AttendanceDailyRollup.objects.filter(date__day=2).values_list('status', 'count')),
+            [('present', 1)],
+        )
+        self.assertEqual(ProcessedSyncEvent.objects.count(), 4)
+
+    def test_rejected_key_is_evaluated_again_when_resent(self):
+        self.assertEqual(
+            [r['key'] for r in self.sync(('out-2', 'check_out', 2, '17:00'))['rejected']], ['out-2']
+        )
+        self.assertEqual(self.sync(('in-2', 'check_in', 2, '08:00'))['applied'], ['in-2'])
+        self.assertEqual(self.sync(('out-2', 'check_out', 2, '17:00'))['applied'], ['out-2'])
+        self.assertEqual(str(Attendance.objects.get().check_out), '17:00:00')
+
+    def test_keys_are_unique_per_worker(self):
+        self.sync(('k1', 'check_in', 2, '08:00'))
+        other = User.objects.create_user(email='w2@test.app', password='x', name='Other')
+        Worker.objects.create(user=other, employee_id='E2', designation='Mason')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.sync(('k1', 'check_in', 2, '08:30'))['applied'], ['k1'])
+        self.assertEqual(Attendance.objects.count(), 2)
+
+    def test_check_in_after_close_out_replaces_the_absence(self):
+        close_out_attendance(date(2026, 3, 2), date(2026, 3, 2), time(18))
+        self.assertEqual(Attendance.objects.get().status, 'absent')
+        self.assertEqual(self.sync(('in-2', 'check_in', 2, '08:00'))['applied'], ['in-2'])
+        row = Attendance.objects.get()
+        self.assertEqual((row.status, row.check_in, row.notes), ('present', time(8), ''))
+        self.assertEqual(
+            list(AttendanceDailyRollup.objects.values_list('status', 'count')), [('present', 1)]
+        )
+
+
+class AttendanceListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.project = Project.objects.create(name='Tower', location='Dhaka')
+        self.workers = []
+        for i in range(3):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            worker = Worker.objects.create(user=user, employee_id=f'E{i}', designation='Mason')
+            self.workers.append(worker)
+            for day in range(1, 11):
+                Attendance.objects.create(
+                    worker=worker, date=date(2026, 3, day),
+                    project=self.project if i else None,
+                    status='absent' if day == 5 else 'present',
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_keyset_pages_cover_range_without_overlap(self):
+        url = '/api/workforce/attendance/?from=2026-03-02&to=2026-03-09&page_size=7'
+        seen, pages = [], 0
+        while url:
+            with self.assertNumQueries(1):
+                body = self.client.get(url).data
+            seen += [(r['date'], r['id']) for r in body['results']]
+            url, pages = body['next'], pages + 1
+        self.assertEqual(pages, 4)
+        self.assertEqual(len(seen), 24)
+        self.assertEqual(len(set(seen)), 24)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_filters_compact_mode_and_worker_scope(self):
+        rows = self.client.get(
+            f'/api/workforce/attendance/?from=2026-03-01&to=2026-03-31&project={self.project.id}'
+            '&status=absent&compact=1'
+        ).data['results']
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(set(rows[0]), {
+            'id', 'worker', 'project', 'date', 'status', 'check_in', 'check_out',
+            'worker_name', 'project_name',
+        })
+        self.assertEqual(rows[0]['project_name'], 'Tower')
+
+        self.client.force_authenticate(self.workers[0].user)
+        rows = self.client.get(
+            f'/api/workforce/attendance/?from=2026-03-01&worker={self.workers[1].id}'
+        ).data['results']
+        self.assertEqual(rows, [])
+        self.assertEqual(
+            len(self.client.get('/api/workforce/attendance/?from=2026-03-01').data['results']), 10
+        )
+        self.assertEqual(self.client.get('/api/workforce/attendance/?cursor=zzz').status_code, 400)
+        self.assertEqual(self.client.get('/api/workforce/attendance/?from=03-01').status_code, 400)
+
+    def test_plain_date_query_keeps_the_original_shape(self):
+        body = self.client.get('/api/workforce/attendance/?date=2026-03-05').data
+        self.assertEqual(set(body), {'success', 'date', 'data'})
+        self.assertEqual(body['date'], '2026-03-05')
+        self.assertEqual([r['status'] for r in body['data']], ['absent'] * 3)
+        self.assertEqual(self.client.get('/api/workforce/attendance/').data['data'], [])
+        response = self.client.get('/api/workforce/attendance/?date=5-3-2026')
+        self.assertEqual(response.data['message'], 'Invalid date format. Use YYYY-MM-DD.')
+
+
+class AttendanceCalendarTests(TestCase):
+    def setUp(self):
+        flush_stats()    # drop other tests' buffered counts with the cache
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        self.workers = []
+        for i in range(2):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            self.workers.append(
+                Worker.objects.create(user=user, employee_id=f'E{i}', designation='Mason')
+            )
+        Attendance.objects.create(worker=self.workers[0], date=date(2026, 1, 1))
+        Attendance.objects.create(worker=self.workers[0], date=date(2026, 1, 3), status='on_leave')
+        Attendance.objects.create(worker=self.workers[0], date=date(2026, 12, 31), status='late_arrival')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        ids = ','.join(str(w.id) for w in self.workers)
+        self.url = f'/api/workforce/attendance/calendar/?year=2026&worker={ids}'
+
+    def test_packed_year_is_cached_per_worker(self):
+        self.assertEqual(pack_days([1, 0, 3, 0, 2]), bytes([0b00110001, 0b00000010]))
+        with self.assertNumQueries(2):
+            data = self.client.get(self.url).data['data']
+        first = next(w for w in data['workers'] if w['worker'] == self.workers[0].id)
+        packed = base64.b64decode(first['days'])
+        self.assertEqual(len(packed), 92)
+        self.assertEqual((packed[0], packed[-1] & 3), (0b00110001, 2))
+        self.assertEqual(first['summary']['on_leave'], 1)
+
+        with self.assertNumQueries(1):    # worker id lookup only
+            self.client.get(self.url)
+        Attendance.objects.create(worker=self.workers[1], date=date(2026, 2, 1))
+        with self.assertNumQueries(2):    # only the second worker's year is rebuilt
+            data = self.client.get(self.url).data['data']
+        # Counters are buffered per process, so a hit writes nothing to the cache.
+        self.assertIsNone(cache.get(f'{STATS_PREFIX}workforce.calendar:hit'))
+        self.assertEqual(
+            cache_stats(['workforce.calendar'])['workforce.calendar'], {'hits': 3, 'misses': 3}
+        )
+
+    def test_moving_a_row_to_another_year_refreshes_both_years(self):
+        url = f'/api/workforce/attendance/calendar/?worker={self.workers[0].id}'
+
+        def present(year):
+            workers = self.client.get(f'{url}&year={year}').data['data']['workers']
+            return workers[0]['summary']['present']
+
+        self.assertEqual((present(2025), present(2026)), (0, 1))
+        row = Attendance.objects.get(worker=self.workers[0], date=date(2026, 1, 1))
+        row.date = date(2025, 6, 1)
+        row.save()
+        self.assertEqual((present(2025), present(2026)), (1, 0))
+        self.assertEqual(self.client.get(f'{url}&year=abc').status_code, 400)
+
+
+class CloseOutAttendanceTests(TestCase):
+    def test_records_absences_and_closes_open_check_ins(self):
+        day = date(2026, 3, 2)
+        workers = []
+        for i, joined in enumerate([None] * 5 + [date(2026, 3, 3)]):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=f'W{i}')
+            workers.append(Worker.objects.create(
+                user=user, employee_id=f'E{i}', designation='Mason', joining_date=joined
+            ))
+        User.objects.filter(pk=workers[3].user_id).update(is_active=False)
+        early = Attendance.objects.create(worker=workers[0], date=day, check_in=time(8))
+        late = Attendance.objects.create(worker=workers[1], date=day, check_in=time(19))
+        deleted = Attendance.objects.create(worker=workers[2], date=day, check_in=time(8))
+        deleted.soft_delete()
+
+        self.assertEqual(close_out_attendance(day, day, time(18)), {'closed': 2, 'absent': 2})
+        self.assertEqual(close_out_attendance(day, day, time(18)), {'closed': 0, 'absent': 0})
+
+        rows = {a.worker_id: a for a in Attendance.objects.filter(date=day)}
+        self.assertEqual(set(rows), {w.id for w in workers[:3] + [workers[4]]})
+        self.assertEqual(rows[early.worker_id].check_out, time(18))
+        self.assertEqual(rows[late.worker_id].check_out, time(19))
+        self.assertEqual((rows[deleted.worker_id].id, rows[deleted.worker_id].status),
+                         (deleted.id, 'absent'))
+        self.assertEqual(rows[workers[4].id].notes, 'Auto: no check-in')
+        self.assertEqual(
+            AttendanceDailyRollup.objects.get(date=day, status='absent').count, 2
+        )
+
+    def test_unsupported_backend_refuses_without_writing(self):
+        day = date(2026, 3, 2)
+        user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        worker = Worker.objects.create(user=user, employee_id='E1', designation='Mason')
+        Attendance.objects.create(worker=worker, date=day, check_in=time(8))
+        other = User.objects.create_user(email='v@test.app', password='x', name='Other')
+        Worker.objects.create(user=other, employee_id='E2', designation='Mason')
+
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            with self.assertRaises(NotSupportedError):
+                close_out_attendance(day, day, time(18))
+        self.assertEqual(
+            list(Attendance.objects.values_list('worker', 'check_out')), [(worker.id, None)]
+        )
+
+
+class WorkedHoursTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        user = User.objects.create_user(email='w@test.app', password='x', name='Worker')
+        self.worker = Worker.objects.create(user=user, employee_id='E1', designation='Mason')
+        self.project = Project.objects.create(name='Tower A', location='Dhaka')
+        for day, check_in, check_out in [
+            (1, time(8), time(18, 30)),     # 10.5h, 2.5h overtime
+            (2, time(9, 45), time(17)),     # 7.25h, 45 min late
+            (3, time(8), None),             # still open: not counted as worked
+        ]:
+            Attendance.objects.create(
+                worker=self.worker, project=self.project, date=date(2026, 3, day),
+                check_in=check_in, check_out=check_out,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_hours_overtime_and_late_minutes_per_period(self):
+        url = '/api/workforce/hours/?from=2026-03-01&to=2026-03-31&group_by=worker_project'
+        [row] = self.client.get(url).data['data']['rows']
+        self.assertEqual(
+            (row['employee_id'], row['project_name'], row['days_worked'], row['hours'],
+             row['overtime_hours'], row['late_days'], row['late_minutes']),
+            ('E1', 'Tower A', 2, 17.75, 2.5, 1, 45),
+        )
+
+        by_project = url.replace('worker_project', 'project')
+        response = self.client.get(by_project + '&period=day&output=csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith('2026-03-01,,,,' + str(self.project.id)))
+        self.assertEqual(self.client.get(url + '&period=year').status_code, 400)
+
+
+class WorkerDirectoryTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(
+            email='admin@test.app', password='x', name='Admin', role=UserRole.ADMIN
+        )
+        for i, (name, designation) in enumerate(
+            [('Rahim', 'Mason'), ('Karim', 'Electrician'), ('Salma', 'Mason')]
+        ):
+            user = User.objects.create_user(email=f'w{i}@test.app', password='x', name=name)
+            Worker.objects.create(
+                user=user, employee_id=f'EMP-{i}', designation=designation, daily_rate=500
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
 
-# Create your tests here.
+    def test_flat_paginated_search(self):
+        url = '/api/workforce/workers/directory/'
+        with self.assertNumQueries(2):    # count + page
+            data = self.client.get(url, {'designation': 'Mason', 'page_size': 1}).data
+        self.assertEqual(data['count'], 2)
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(
+            {k: data['results'][0][k] for k in ('name', 'email', 'employee_id', 'daily_rate')},
+            {'name': 'Rahim', 'email': 'w0@test.app', 'employee_id': 'EMP-0', 'daily_rate': 500},
+        )
+        names = [r['name'] for r in self.client.get(url, {'search': 'emp-'}).data['results']]
+        self.assertEqual(names, ['Karim', 'Rahim', 'Salma'])
+        self.assertEqual(self.client.get(url, {'search': 'elec'}).data['count'], 1)
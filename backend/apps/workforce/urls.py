@@ -1,9 +1,17 @@
 from django.urls import path
-from .views import WorkerListView, AttendanceListView, CheckInView, CheckOutView
+from .views import (
+    WorkerListView, AttendanceListView, CheckInView, CheckOutView, BulkAttendanceView,
+    AttendanceSyncView, AttendanceCalendarView, WorkedHoursView, WorkerDirectoryView,
+)
 
 urlpatterns = [
     path('workers/', WorkerListView.as_view(), name='worker-list'),
+    path('workers/directory/', WorkerDirectoryView.as_view(), name='worker-directory'),
     path('attendance/', AttendanceListView.as_view(), name='attendance-list'),
     path('attendance/checkin/', CheckInView.as_view(), name='attendance-checkin'),
     path('attendance/checkout/', CheckOutView.as_view(), name='attendance-checkout'),
+    path('attendance/calendar/', AttendanceCalendarView.as_view(), name='attendance-calendar'),
+    path('attendance/sync/', AttendanceSyncView.as_view(), name='attendance-sync'),
+    path('attendance/bulk/', BulkAttendanceView.as_view(), name='attendance-bulk'),
+    path('hours/', WorkedHoursView.as_view(), name='worked-hours'),
 ]
@@ -1,14 +1,31 @@
 """
-Workforce views — Worker list, attendance by date, check-in.
+Workforce views — Worker list and directory, attendance listing and
+calendars, check-in, bulk marking, offline sync, worked-hours report.
 """
-from datetime import date, datetime, time
+import copy
+import uuid
+from datetime import date, datetime
+from django.db import transaction
+from django.db.models import F, Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
+from core.cache import cached_many
+from core.pagination import KeysetPagination, StandardResultsPagination
+from core.streaming import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, streaming_export
 from .models import Worker, Attendance, AttendanceStatus
-from .serializers import WorkerSerializer, AttendanceSerializer, CheckInSerializer
+from .serializers import (
+    WorkerSerializer, AttendanceSerializer, CheckInSerializer, BulkAttendanceEntrySerializer,
+    SyncEventSerializer,
+)
+from .services import (
+    BULK_ATTENDANCE_MAX, HOURS_COLUMNS, HOURS_GROUPS, HOURS_PERIODS, SYNC_MAX_EVENTS,
+    apply_attendance_change, bulk_upsert_attendance, calendar_tag, calendar_year_tag,
+    checkin_profile, hours_report_rows, record_check_in, sync_attendance_events, worked_hours,
+    worker_calendars,
+)
 from apps.projects.models import Project
 
 
@@ -28,49 +45,242 @@ class WorkerListView(APIView):
         })
 
 
-class AttendanceListView(APIView):
-    """GET /api/workforce/attendance/?date=YYYY-MM-DD"""
+class WorkerDirectoryView(APIView):
+    """
+    GET /api/workforce/workers/directory/?search=&designation=&page=&page_size=
+    Flat, paginated worker rows from a single values() query joined to the
+    user (no nested serializer); ordered by name. `search` matches name,
+    employee id or designation; `designation` is an exact, indexed filter.
+    """
     permission_classes = [IsAuthenticated]
+    FIELDS = {
+        'name': F('user__name'),
+        'email': F('user__email'),
+    }
 
     def get(self, request):
-        date_str = request.query_params.get('date')
-        if date_str:
+        if request.user.role not in ('admin', 'site_manager'):
+            return Response(
+                {'success': False, 'message': 'Permission denied.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        qs = Worker.objects.all()
+        designation = request.query_params.get('designation')
+        if designation:
+            qs = qs.filter(designation=designation)
+        search = request.query_params.get('search', '').strip()
+        if search:
+            qs = qs.filter(
+                Q(user__name__icontains=search)
+                | Q(employee_id__icontains=search)
+                | Q(designation__icontains=search)
+            )
+        qs = qs.order_by('user__name', 'id').values(
+            'id', 'employee_id', 'designation', 'daily_rate', **self.FIELDS
+        )
+
+        paginator = StandardResultsPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return paginator.get_paginated_response(page)
+
+
+class AttendancePagination(KeysetPagination):
+    fields = ('-date', '-id')
+
+
+def _parse_day(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'Invalid {name} format. Use YYYY-MM-DD.')
+
+
+def attendance_filters(params):
+    """
+    Validated ORM filters from ?date= or ?from=&to=, ?worker=, ?project=, ?status=.
+    Defaults to today. Raises ValueError with a user-facing message.
+    """
+    if params.get('date'):
+        start = end = _parse_day(params['date'], 'date')
+    else:
+        start = _parse_day(params['from'], 'from') if params.get('from') else None
+        end = _parse_day(params['to'], 'to') if params.get('to') else None
+        if not start and not end:
+            start = end = date.today()
+    if start and end and start > end:
+        raise ValueError('"from" must not be after "to".')
+
+    filters = {}
+    if start:
+        filters['date__gte'] = start
+    if end:
+        filters['date__lte'] = end
+    for param in ('worker', 'project'):
+        if params.get(param):
             try:
-                target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                filters[f'{param}_id'] = uuid.UUID(params[param])
             except ValueError:
-                return Response(
-                    {'success': False, 'message': 'Invalid date format. Use YYYY-MM-DD.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        else:
-            target_date = date.today()
+                raise ValueError(f'Invalid {param} id.')
+    if params.get('status'):
+        if params['status'] not in AttendanceStatus.values:
+            raise ValueError('Invalid status.')
+        filters['status'] = params['status']
+    return filters
 
-        qs = Attendance.objects.filter(date=target_date).select_related(
-            'worker__user', 'project'
-        )
+
+class AttendanceListView(APIView):
+    """
+    GET /api/workforce/attendance/?date=YYYY-MM-DD
+    GET /api/workforce/attendance/?from=YYYY-MM-DD&to=YYYY-MM-DD&worker=&project=&status=
+    With just ?date= (or nothing) the day's rows come back in the original
+    {success, date, data} shape. Any of LIST_PARAMS switches to the range
+    listing: newest first, keyset-paginated on (date, id), follow `next`
+    (?cursor=...). ?compact=1 returns flat rows straight from values(),
+    without the nested serializer fields.
+    """
+    permission_classes = [IsAuthenticated]
+    LIST_PARAMS = ('from', 'to', 'worker', 'project', 'status', 'cursor', 'page_size', 'compact')
+    COMPACT_FIELDS = {
+        'worker_name': F('worker__user__name'),
+        'project_name': F('project__name'),
+    }
+
+    def get(self, request):
+        try:
+            filters = attendance_filters(request.query_params)
+        except ValueError as exc:
+            return Response(
+                {'success': False, 'message': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        listing = any(param in request.query_params for param in self.LIST_PARAMS)
+        qs = Attendance.objects.filter(**filters)
         # Workers only see their own attendance
         if request.user.role == 'worker':
             try:
                 worker = request.user.worker_profile
                 qs = qs.filter(worker=worker)
             except Worker.DoesNotExist:
-                return Response({'success': True, 'data': []})
+                if not listing:
+                    return Response({'success': True, 'data': []})
+                return Response({'success': True, 'next': None, 'first': None, 'results': []})
+
+        if not listing:
+            return Response({
+                'success': True,
+                'date': str(filters['date__gte']),
+                'data': AttendanceSerializer(
+                    qs.select_related('worker__user', 'project'), many=True
+                ).data,
+            })
 
+        compact = request.query_params.get('compact') in ('1', 'true')
+        if compact:
+            qs = qs.values(
+                'id', 'worker', 'project', 'date', 'status', 'check_in', 'check_out',
+                **self.COMPACT_FIELDS,
+            )
+        else:
+            qs = qs.select_related('worker__user', 'project')
+
+        paginator = AttendancePagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        data = page if compact else AttendanceSerializer(page, many=True).data
+        return paginator.get_paginated_response(data)
+
+
+class AttendanceCalendarView(APIView):
+    """
+    GET /api/workforce/attendance/calendar/?year=2026[&worker=<uuid>,<uuid>][&project=<uuid>]
+    One year per worker as 2-bit day codes (see `encoding`), base64-packed,
+    plus per-status counts. Workers get their own calendar; admins / site
+    managers pass worker ids or a project (its assigned crew).
+    Cached per worker-year and invalidated by that worker's attendance writes.
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_WORKERS = 500
+    ENCODING = {
+        'bits_per_day': 2,
+        'order': 'day 1 of the year in the lowest two bits of byte 0',
+        'codes': {0: None, 1: 'present', 2: 'late_arrival', 3: 'absent_or_leave'},
+    }
+
+    def get(self, request):
+        try:
+            year = int(request.query_params.get('year', date.today().year))
+        except ValueError:
+            year = None
+        if year is None or not 2000 <= year <= 2100:
+            return Response(
+                {'success': False, 'message': 'Invalid year.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.user.role == 'worker':
+            try:
+                worker_ids = [request.user.worker_profile.id]
+            except Worker.DoesNotExist:
+                return Response(
+                    {'success': False, 'message': 'Worker profile not found.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        else:
+            params = request.query_params
+            try:
+                requested = [uuid.UUID(v) for v in params.get('worker', '').split(',') if v]
+                project = uuid.UUID(params['project']) if params.get('project') else None
+            except ValueError:
+                return Response(
+                    {'success': False, 'message': 'Invalid worker or project id.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not requested and not project:
+                return Response(
+                    {'success': False, 'message': 'Pass worker ids or a project.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            workers = Worker.objects.order_by('employee_id')
+            if requested:
+                workers = workers.filter(id__in=requested)
+            if project:
+                workers = workers.filter(user__assigned_projects=project)
+            worker_ids = list(workers.values_list('id', flat=True)[:self.MAX_WORKERS + 1])
+            if len(worker_ids) > self.MAX_WORKERS:
+                return Response({
+                    'success': False,
+                    'message': f'At most {self.MAX_WORKERS} workers per request.',
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        calendars = cached_many(
+            'workforce.calendar', 'any',
+            {
+                w: ({'worker': w, 'year': year}, [calendar_tag(w, year), calendar_year_tag(year)])
+                for w in worker_ids
+            },
+            lambda missing: worker_calendars(missing, year),
+        )
         return Response({
             'success': True,
-            'date': str(target_date),
-            'data': AttendanceSerializer(qs, many=True).data,
+            'data': {
+                'year': year,
+                'encoding': self.ENCODING,
+                'workers': [{'worker': w, **calendars[w]} for w in worker_ids],
+            },
         })
 
 
 class CheckInView(APIView):
-    """POST /api/workforce/attendance/checkin/"""
+    """
+    POST /api/workforce/attendance/checkin/
+    Hot path for the morning rush: the worker profile and project names come
+    from the response cache, the row is written with a single upsert.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        try:
-            worker = request.user.worker_profile
-        except Worker.DoesNotExist:
+        profile = checkin_profile(request.user.id)
+        if profile is None:
             return Response(
                 {'success': False, 'message': 'Worker profile not found.'},
                 status=status.HTTP_404_NOT_FOUND
@@ -79,33 +289,12 @@ class CheckInView(APIView):
         serializer = CheckInSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        today = date.today()
-        project = None
-        project_id = serializer.validated_data.get('project_id')
-        if project_id:
-            try:
-                project = Project.objects.get(pk=project_id)
-            except Project.DoesNotExist:
-                pass
-
-        now_time = datetime.now().time()
-
-        # Late if after 9:00 AM
-        is_late = now_time > time(9, 0)
-        att_status = AttendanceStatus.LATE if is_late else AttendanceStatus.PRESENT
-
-        attendance, created = Attendance.objects.get_or_create(
-            worker=worker,
-            date=today,
-            defaults={
-                'project': project,
-                'status': att_status,
-                'check_in': now_time,
-                'notes': serializer.validated_data.get('notes', ''),
-            }
+        attendance = record_check_in(
+            profile,
+            project_id=serializer.validated_data.get('project_id'),
+            notes=serializer.validated_data.get('notes', ''),
         )
-
-        if not created:
+        if attendance is None:
             return Response(
                 {'success': False, 'message': 'Already checked in today.'},
                 status=status.HTTP_409_CONFLICT
@@ -113,7 +302,7 @@ class CheckInView(APIView):
 
         return Response({
             'success': True,
-            'message': f'Checked in at {now_time.strftime("%H:%M")}.',
+            'message': f'Checked in at {attendance.check_in.strftime("%H:%M")}.',
             'data': AttendanceSerializer(attendance).data,
         }, status=status.HTTP_201_CREATED)
 
@@ -132,19 +321,199 @@ class CheckOutView(APIView):
             )
 
         today = date.today()
+        with transaction.atomic():
+            # Locked so concurrent check-outs of the same row count it once in the rollup.
+            attendance = (
+                Attendance.objects.select_for_update().filter(worker=worker, date=today).first()
+            )
+            if attendance is None:
+                return Response(
+                    {'success': False, 'message': 'No check-in found for today.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            before = copy.copy(attendance)
+            attendance.check_out = datetime.now().time()
+            attendance.save(update_fields=['check_out', 'updated_at'])
+            apply_attendance_change(before=before, after=attendance)
+
+        return Response({
+            'success': True,
+            'message': f'Checked out at {attendance.check_out.strftime("%H:%M")}.',
+            'data': AttendanceSerializer(attendance).data,
+        })
+
+
+class WorkedHoursView(APIView):
+    """
+    GET /api/workforce/hours/?from=YYYY-MM-DD&to=YYYY-MM-DD[&period=day|week|month]
+        [&group_by=worker|project|worker_project][&worker=][&project=][&output=csv|ndjson]
+    Days worked, hours, overtime and late minutes per group per period,
+    aggregated in SQL (current month to date by default). Workers only get
+    their own rows. With `output` the full report is streamed as a file;
+    the JSON form is capped at MAX_ROWS.
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_ROWS = 5000
+
+    def get(self, request):
+        params = request.query_params.copy()
+        if request.user.role == 'worker':
+            profile = checkin_profile(request.user.id)
+            if profile is None:
+                return Response({'success': False, 'message': 'Worker profile not found.'},
+                                status=status.HTTP_404_NOT_FOUND)
+            params['worker'] = profile['id']
+        if not any(params.get(key) for key in ('date', 'from', 'to')):
+            params['from'] = date.today().replace(day=1).isoformat()
+        period = params.get('period', 'month')
+        group_by = params.get('group_by', 'worker')
+        fmt = params.get('output')
+        try:
+            filters = attendance_filters(params)
+            if period not in HOURS_PERIODS:
+                raise ValueError('period must be "day", "week" or "month".')
+            if group_by not in HOURS_GROUPS:
+                raise ValueError('group_by must be "worker", "project" or "worker_project".')
+            if fmt and fmt not in EXPORT_FORMATS:
+                raise ValueError('output must be "csv" or "ndjson".')
+        except ValueError as exc:
+            return Response(
+                {'success': False, 'message': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        qs = worked_hours(filters, period, group_by)
+        if fmt:
+            rows = hours_report_rows(qs, chunk_size=EXPORT_CHUNK_SIZE)
+            return streaming_export(rows, HOURS_COLUMNS, fmt, f'hours-by-{group_by}-{period}')
+        rows = list(hours_report_rows(qs[:self.MAX_ROWS + 1]))
+        return Response({
+            'success': True,
+            'data': {
+                'period': period,
+                'group_by': group_by,
+                'truncated': len(rows) > self.MAX_ROWS,
+                'rows': [
+                    {name: row[key] for name, key in HOURS_COLUMNS.items()}
+                    for row in rows[:self.MAX_ROWS]
+                ],
+            },
+        })
+
+
+class BulkAttendanceView(APIView):
+    """
+    POST /api/workforce/attendance/bulk/
+    {"entries": [{"worker": <uuid>, "date": "YYYY-MM-DD", "status": "present",
+                  "project": <uuid>, "check_in": "08:00", "check_out": "17:00", "notes": ""}, ...]}
+    Creates or overwrites each worker's row for the date. Rows are validated
+    independently; the response carries one result per entry, in order.
+    Site managers must name one of their projects, may only mark workers on
+    their projects' crews and cannot overwrite rows recorded on other projects.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role not in ('admin', 'site_manager'):
+            return Response(
+                {'success': False, 'message': 'Permission denied.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        entries = request.data.get('entries') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response(
+                {'success': False, 'message': '"entries" must be a non-empty list.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(entries) > BULK_ATTENDANCE_MAX:
+            return Response(
+                {'success': False, 'message': f'At most {BULK_ATTENDANCE_MAX} entries per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results, valid, positions = [None] * len(entries), [], []
+        for index, entry in enumerate(entries):
+            serializer = BulkAttendanceEntrySerializer(data=entry)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+                positions.append(index)
+            else:
+                results[index] = {'status': 'error', 'errors': serializer.errors}
+
+        projects = None
+        if request.user.role == 'site_manager':
+            projects = Project.objects.filter(site_manager=request.user)
+        outcomes = bulk_upsert_attendance(valid, projects) if valid else []
+        for index, outcome in zip(positions, outcomes):
+            results[index] = outcome
+
+        counts = {'created': 0, 'updated': 0, 'error': 0}
+        for index, outcome in enumerate(results):
+            outcome['index'] = index
+            counts[outcome['status']] += 1
+        return Response({
+            'success': True,
+            'data': {
+                'created': counts['created'],
+                'updated': counts['updated'],
+                'failed': counts['error'],
+                'results': results,
+            },
+        })
+
+
+class AttendanceSyncView(APIView):
+    """
+    POST /api/workforce/attendance/sync/
+    {"events": [{"key": "<device-generated id>", "kind": "check_in" | "check_out",
+                 "at": "2026-03-02T08:05:00+06:00", "project": <uuid>, "notes": ""}, ...]}
+    Replays a device's offline queue for the signed-in worker in one round trip.
+    Every key comes back exactly once as applied, duplicate (already processed)
+    or rejected; the device can drop applied and duplicate keys from its queue.
+    Rejected keys are not remembered and may be resent, e.g. a check-out once
+    its check-in has synced.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
         try:
-            attendance = Attendance.objects.get(worker=worker, date=today)
-        except Attendance.DoesNotExist:
+            worker = request.user.worker_profile
+        except Worker.DoesNotExist:
             return Response(
-                {'success': False, 'message': 'No check-in found for today.'},
+                {'success': False, 'message': 'Worker profile not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        events = request.data.get('events') if isinstance(request.data, dict) else None
+        if not isinstance(events, list):
+            return Response(
+                {'success': False, 'message': '"events" must be a list.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(events) > SYNC_MAX_EVENTS:
+            return Response(
+                {'success': False, 'message': f'At most {SYNC_MAX_EVENTS} events per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        attendance.check_out = datetime.now().time()
-        attendance.save(update_fields=['check_out', 'updated_at'])
+        valid, rejected = [], []
+        for event in events:
+            serializer = SyncEventSerializer(data=event)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                key = event.get('key') if isinstance(event, dict) else None
+                rejected.append({'key': key, 'errors': serializer.errors})
 
+        result = sync_attendance_events(worker, valid) if valid else {
+            'applied': [], 'duplicate': [], 'rejected': {},
+        }
+        rejected += [{'key': key, 'errors': {'event': [reason]}}
+                     for key, reason in result['rejected'].items()]
         return Response({
             'success': True,
-            'message': f'Checked out at {attendance.check_out.strftime("%H:%M")}.',
-            'data': AttendanceSerializer(attendance).data,
+            'data': {
+                'applied': result['applied'],
+                'duplicate': result['duplicate'],
+                'rejected': rejected,
+            },
         })
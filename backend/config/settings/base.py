@@ -103,6 +103,24 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ── Cache ────────────────────────────────────────────────────────────
+# Local memory per process in dev; production overrides with a shared backend.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://construction-erp'),
+}
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+# Seconds each process buffers hit/miss counters before adding them to the cache.
+RESPONSE_CACHE_STATS_INTERVAL = env.int('RESPONSE_CACHE_STATS_INTERVAL', default=60)
+
+# ── Concurrent aggregates (ASGI) ─────────────────────────────────────
+# Pool threads each hold their own DB connection; size against max_connections.
+AGGREGATE_FANOUT_WORKERS = env.int('AGGREGATE_FANOUT_WORKERS', default=8)
+
+# ── Attendance ───────────────────────────────────────────────────────
+# Local time the nightly close_out_attendance job stamps on open check-ins.
+ATTENDANCE_AUTO_CHECKOUT_TIME = env('ATTENDANCE_AUTO_CHECKOUT_TIME', default='18:00')
+
 # ── Django REST Framework ────────────────────────────────────────────
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -10,11 +10,20 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST', default='db'),
         'PORT': env('DB_PORT', default='5432'),
+        # Per-request connections by default: under ASGI persistent connections are
+        # not reused across requests. WSGI deployments can raise it (docker-compose `web`).
+        'CONN_MAX_AGE': env.int('CONN_MAX_AGE', default=0),
     }
 }
 
 ALLOWED_HOSTS = env.list('ALLOWED_HOSTS')
 
+# Shared across gunicorn workers; run `manage.py createcachetable` once for dbcache://.
+# filecache:///var/tmp/erp-cache works too for a single host.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='dbcache://erp_response_cache'),
+}
+
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
@@ -0,0 +1,58 @@
+"""
+core/async_views.py — Minimal JWT-authenticated async JSON views.
+
+DRF's APIView is sync-only, and under ASGI every sync view shares one
+thread per worker. These helpers give async views the same auth, role
+checks and response envelope as the DRF views.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def json_response(payload, status=200):
+    # DRF's encoder keeps Decimal / UUID / date output identical to the DRF views.
+    return JsonResponse(
+        payload, status=status, encoder=JSONEncoder,
+        json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False},
+    )
+
+
+def _authenticate(request):
+    result = JWTAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+def async_api_view(roles=None, methods=('GET',)):
+    """
+    Decorates `async def view(request, ...)`: authenticates the Bearer token,
+    enforces `roles` and maps DRF exceptions to the uniform error shape.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return json_response(
+                    {'success': False, 'message': f'Method "{request.method}" not allowed.'},
+                    status=405,
+                )
+            try:
+                user = await sync_to_async(_authenticate)(request)
+            except APIException as exc:
+                detail = exc.detail.get('detail', exc.detail) if isinstance(exc.detail, dict) else exc.detail
+                return json_response({'success': False, 'message': str(detail)}, status=exc.status_code)
+            if user is None:
+                return json_response(
+                    {'success': False, 'message': 'Authentication credentials were not provided.'},
+                    status=401,
+                )
+            if roles and user.role not in roles:
+                return json_response({'success': False, 'message': 'Permission denied.'}, status=403)
+            request.user = user
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,198 @@
+"""
+core/cache.py — Tag-invalidated cache for computed response payloads.
+
+Payloads are keyed by endpoint + role + scope and by the current version
+token of every tag they depend on. Invalidating a tag swaps its token, so
+every key built from the old token simply stops being read (no key scans,
+works on any Django cache backend, shared across gunicorn workers when the
+backend is).
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+MISS = object()
+
+TAG_PREFIX = 'rc:tag:'
+KEY_PREFIX = 'rc:val:'
+STATS_PREFIX = 'rc:stats:'
+
+# Hit/miss counts not yet added to the shared counters, per process.
+_pending_stats = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _timeout(timeout):
+    return timeout if timeout is not None else getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def tag_versions(tags):
+    """Current token per tag; tags never seen before get a fresh token."""
+    cache = _cache()
+    names = {TAG_PREFIX + t: t for t in tags}
+    found = cache.get_many(list(names))
+    missing = {k: _new_token() for k in names if k not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {names[k]: v for k, v in found.items()}
+
+
+def _versioned_key(endpoint, role, scope, versions):
+    raw = json.dumps([endpoint, role, scope, versions], sort_keys=True, default=str)
+    return KEY_PREFIX + endpoint + ':' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def make_key(endpoint, role, scope=None, tags=()):
+    return _versioned_key(endpoint, role, scope, tag_versions(tags) if tags else {})
+
+
+def invalidate_tags(*tags):
+    """Swaps the token of each tag; safe to call for tags no payload uses yet."""
+    if tags:
+        _cache().set_many({TAG_PREFIX + t: _new_token() for t in tags}, timeout=None)
+
+
+def _count(endpoint, outcome, delta=1):
+    """Buffers a hit/miss count in memory, so a lookup stays a single cache read."""
+    if not delta:
+        return
+    interval = getattr(settings, 'RESPONSE_CACHE_STATS_INTERVAL', 60)
+    with _pending_lock:
+        _pending_stats[(endpoint, outcome)] += delta
+        due = time.monotonic() - _last_flush >= interval
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    """
+    Adds this process's buffered counts to the shared counters, one incr per
+    counter per interval. incr is a non-atomic get + set on the database
+    backend, so the counters are approximate there.
+    """
+    global _last_flush
+    with _pending_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _last_flush = time.monotonic()
+    cache = _cache()
+    for (endpoint, outcome), delta in pending.items():
+        key = f'{STATS_PREFIX}{endpoint}:{outcome}'
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # First event for this counter; add() keeps a concurrent first writer's value.
+            if not cache.add(key, delta, timeout=None):
+                cache.incr(key, delta)
+
+
+def lookup(endpoint, role, scope=None, tags=()):
+    """Returns (key, value); value is MISS when nothing valid is cached."""
+    key = make_key(endpoint, role, scope, tags)
+    value = _cache().get(key, MISS)
+    _count(endpoint, 'miss' if value is MISS else 'hit')
+    return key, value
+
+
+def store(key, value, timeout=None):
+    _cache().set(key, value, timeout=_timeout(timeout))
+
+
+def cached_payload(endpoint, role, builder, scope=None, tags=(), timeout=None):
+    """Returns the cached payload or builds, stores and returns it."""
+    key, value = lookup(endpoint, role, scope, tags)
+    if value is MISS:
+        value = builder()
+        store(key, value, timeout)
+    return value
+
+
+def cached_many(endpoint, role, items, builder, timeout=None):
+    """
+    Batch form of cached_payload for per-entity payloads (e.g. one per worker).
+    `items` maps id → (scope, tags). One get_many for every tag token, one for
+    every value; `builder(missing_ids)` returns {id: payload} for the misses,
+    which are stored with one set_many. Returns {id: payload}.
+    """
+    versions = tag_versions({tag for _, tags in items.values() for tag in tags})
+    keys = {
+        item_id: _versioned_key(endpoint, role, scope, {t: versions[t] for t in tags})
+        for item_id, (scope, tags) in items.items()
+    }
+
+    found = _cache().get_many(list(keys.values()))
+    values = {item_id: found[key] for item_id, key in keys.items() if key in found}
+    missing = [item_id for item_id in items if item_id not in values]
+    _count(endpoint, 'hit', len(values))
+    _count(endpoint, 'miss', len(missing))
+    if missing:
+        built = builder(missing)
+        _cache().set_many({keys[i]: built[i] for i in missing}, timeout=_timeout(timeout))
+        values.update(built)
+    return values
+
+
+async def acached_payload(endpoint, role, builder, scope=None, tags=(), timeout=None):
+    """Async counterpart of cached_payload; `builder` is a coroutine function."""
+    key, value = await sync_to_async(lookup)(endpoint, role, scope, tags)
+    if value is MISS:
+        value = await builder()
+        await sync_to_async(store)(key, value, timeout)
+    return value
+
+
+def cache_stats(endpoints):
+    """
+    Hit/miss counters per endpoint, e.g. {'dashboard.stats': {'hits': 9, 'misses': 1}}.
+    Includes this process's buffered counts; other workers' appear once they flush.
+    """
+    flush_stats()
+    keys = {
+        f'{STATS_PREFIX}{e}:{o}': (e, o) for e in endpoints for o in ('hit', 'miss')
+    }
+    found = _cache().get_many(list(keys))
+    stats = {e: {'hits': 0, 'misses': 0} for e in endpoints}
+    for key, value in found.items():
+        endpoint, outcome = keys[key]
+        stats[endpoint]['hits' if outcome == 'hit' else 'misses'] = value
+    return stats
+
+
+def invalidate_on(model, *tags):
+    """
+    Invalidates `tags` on post_save / post_delete of `model`.
+    A tag may be a callable taking the instance and returning more tags.
+    Bulk writes (update / bulk_create) bypass signals and must call
+    invalidate_tags() themselves.
+    """
+    def handler(sender, instance, **kwargs):
+        names = []
+        for tag in tags:
+            names.extend(tag(instance) if callable(tag) else [tag])
+        invalidate_tags(*names)
+        # Bump again after commit so a reader that cached pre-commit data is not kept.
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: invalidate_tags(*names))
+
+    uid = f'response-cache:{model._meta.label}'
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,54 @@
+"""
+core/concurrency.py — Fan out independent ORM aggregates across a bounded thread pool.
+
+Django connections are per-thread, so every task runs on its own DB
+connection and independent queries overlap instead of queueing behind each
+other. Used by the async dashboard/analytics views served under ASGI.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'AGGREGATE_FANOUT_WORKERS', 8),
+            thread_name_prefix='aggregate-fanout',
+        )
+    return _executor
+
+
+def _isolated(task):
+    def run():
+        # Honour CONN_MAX_AGE for the pool thread's own connection, before and after.
+        close_old_connections()
+        try:
+            return task()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def gather_tasks(tasks):
+    """
+    Runs a {name: callable} mapping concurrently and returns {name: result}.
+    Callables must be independent and may use the ORM freely.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    names = list(tasks)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, _isolated(tasks[name])) for name in names)
+    )
+    return dict(zip(names, results))
+
+
+def run_tasks(tasks):
+    """Sequential counterpart of gather_tasks for the WSGI views."""
+    return {name: task() for name, task in tasks.items()}
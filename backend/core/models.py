@@ -2,7 +2,7 @@
 core/models.py — Base model with timestamps and soft-delete.
 """
 import uuid
-from django.db import models
+from django.db import NotSupportedError, models
 
 
 class SoftDeleteManager(models.Manager):
@@ -38,3 +38,29 @@ class BaseModel(models.Model):
     def soft_delete(self):
         self.is_deleted = True
         self.save(update_fields=['is_deleted', 'updated_at'])
+
+
+class RandomUUID(models.Func):
+    """
+    Database-generated uuid4, for BaseModel ids in INSERT ... SELECT writes
+    that never build model instances. Matches UUIDField storage per vendor.
+    Only PostgreSQL and SQLite are supported; MySQL's UUID() is a version 1
+    (time-based) id, so other backends raise NotSupportedError.
+    """
+    output_field = models.UUIDField()
+    vendors = ('postgresql', 'sqlite')
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f'RandomUUID is not supported on {connection.vendor}.')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return 'gen_random_uuid()', []
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # UUIDField is stored as 32 hex chars; set the version / variant bits of a uuid4.
+        return (
+            "lower(hex(randomblob(6)) || '4' || substr(hex(randomblob(2)), 2) || "
+            "substr('89ab', 1 + (abs(random()) %% 4), 1) || substr(hex(randomblob(2)), 2) || "
+            "hex(randomblob(6)))"
+        ), []
+
@@ -1,8 +1,14 @@
 """
 core/pagination.py — Consistent pagination envelope.
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsPagination(PageNumberPagination):
@@ -30,3 +36,91 @@ class StandardResultsPagination(PageNumberPagination):
                 'results': schema,
             },
         }
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on an indexed column tuple ending in a unique one.
+    Each page continues with WHERE a <= x AND (a, id) < (x, last id); the
+    leading bound lets the composite index be range-scanned from the cursor,
+    so page N costs the same as page 1 — no OFFSET scan, no COUNT(*).
+    `fields` are all descending; subclasses set them to match an index.
+    """
+    fields = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+
+    def _names(self):
+        return [f.lstrip('-') for f in self.fields]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, row):
+        values = [str(self._value(row, name)) for name in self._names()]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, model, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self._names(), values, strict=True)
+            ]
+        except Exception:
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    def _after(self, values):
+        """
+        WHERE (a, b, c) < (x, y, z), expanded for databases without row
+        comparison, behind a leading a <= x the planner can use as the index
+        range start (the OR expansion alone is not sargable on Postgres).
+        """
+        names = self._names()
+        condition = Q()
+        for i, name in enumerate(names):
+            step = Q(**{f'{name}__lt': values[i]})
+            for prev, value in zip(names[:i], values[:i]):
+                step &= Q(**{prev: value})
+            condition |= step
+        return Q(**{f'{names[0]}__lte': values[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        queryset = queryset.order_by(*self.fields)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode_cursor(queryset.model, cursor)))
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'success': True,
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
@@ -0,0 +1,70 @@
+"""
+core/periods.py — Calendar-month helpers for ?from=YYYY-MM&to=YYYY-MM style ranges
+and ?month=M&year=Y params.
+"""
+from datetime import date, datetime
+
+from django.utils import timezone
+
+
+def parse_year_month(value):
+    """'2026-03' → date(2026, 3, 1); raises ValueError on bad input."""
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def parse_month_year(params, default):
+    """
+    (month, year) from ?month=M&year=Y, each defaulting to `default`'s.
+    Raises ValueError with a user-facing message on invalid input.
+    """
+    try:
+        month = int(params.get('month', default.month))
+        year = int(params.get('year', default.year))
+    except (TypeError, ValueError):
+        raise ValueError('month and year must be integers.')
+    if not 1 <= month <= 12 or not 2000 <= year <= 2100:
+        raise ValueError('Invalid month or year.')
+    return month, year
+
+
+def add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_span(first, last):
+    """Number of months in the inclusive range [first, last]."""
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+
+def iter_months(first, last):
+    for i in range(month_span(first, last)):
+        yield add_months(first, i)
+
+
+def month_window(params, default_months=6, max_months=120):
+    """
+    Resolves ?from= / ?to= query params into (first, last) month starts.
+    Defaults to the `default_months` months ending with the current one.
+    Raises ValueError with a user-facing message on invalid input.
+    """
+    try:
+        last = parse_year_month(params['to']) if params.get('to') else None
+        first = parse_year_month(params['from']) if params.get('from') else None
+    except ValueError:
+        raise ValueError('Invalid month format. Use YYYY-MM.')
+    last = last or date.today().replace(day=1)
+    first = first or add_months(last, -(default_months - 1))
+    if first > last:
+        raise ValueError('"from" must not be after "to".')
+    if month_span(first, last) > max_months:
+        raise ValueError(f'Range too large; at most {max_months} months.')
+    return first, last
+
+
+def aware_month_bounds(first, last):
+    """Half-open [start, end) datetimes covering the months in the current timezone."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first, datetime.min.time()), tz)
+    end = timezone.make_aware(datetime.combine(add_months(last, 1), datetime.min.time()), tz)
+    return start, end